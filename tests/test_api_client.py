@@ -0,0 +1,60 @@
+"""Tests for ygg_api_client"""
+
+import pytest
+
+pytest.importorskip('requests')
+
+from ygg_api_client import YGGAPIClient
+from ygg_login_jobs import JOB_FAILED, JOB_RUNNING, JOB_SUCCEEDED, LoginJob
+
+
+def job_response(status, result=None, error=None):
+    """``GET /auth/jobs/<id>`` payload for a job in ``status``."""
+    job = LoginJob('user')
+    job.status = status
+    job.result = result
+    job.error = error
+    return dict(job.to_dict(), success=True)
+
+
+def polling_client(responses):
+    client = YGGAPIClient()
+    responses = iter(responses)
+    client.get_login_job = lambda job_id: next(responses)
+    return client
+
+
+class TestWaitForLoginJob:
+    def test_returns_the_login_result(self):
+        result = {'success': True, 'cookie_string': 'a=1; b=2', 'cookies': {'a': '1', 'b': '2'}}
+        client = polling_client([job_response(JOB_RUNNING), job_response(JOB_SUCCEEDED, result)])
+
+        assert client.wait_for_login_job('job', poll_interval=0) == result
+
+    def test_failed_login(self):
+        result = {'success': False, 'message': 'Invalid credentials'}
+        client = polling_client([job_response(JOB_FAILED, result)])
+
+        assert client.wait_for_login_job('job', poll_interval=0) == result
+
+    def test_crashed_login(self):
+        client = polling_client([job_response(JOB_FAILED, error='browser crashed')])
+
+        assert client.wait_for_login_job('job', poll_interval=0) == \
+            {'success': False, 'message': 'browser crashed'}
+
+    @pytest.mark.parametrize('response', [
+        {'error': 'Connection refused'},
+        {'success': False, 'message': 'Unknown or expired job id'},
+    ])
+    def test_request_errors_are_returned(self, response):
+        client = polling_client([response])
+
+        assert client.wait_for_login_job('job', poll_interval=0) == response
+
+    def test_timeout(self):
+        client = polling_client([job_response(JOB_RUNNING)] * 100)
+
+        result = client.wait_for_login_job('job', timeout=0.05, poll_interval=0.01)
+        assert result['success'] is False
+        assert 'still running' in result['message']
@@ -0,0 +1,187 @@
+"""Tests for ygg_bencode"""
+
+import glob
+import hashlib
+import os
+
+import pytest
+
+from ygg_bencode import (
+    MAX_DEPTH, BencodeError, decode, parse_torrent, read_torrent_file,
+    verify_torrent_data, verify_torrent_file
+)
+
+
+SAMPLE_TORRENTS = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', 'data', '*.torrent')))
+
+
+def bencode(value) -> bytes:
+    """Canonical bencoding of ints, strings, bytes, lists and dicts (keys sorted)."""
+    if isinstance(value, int):
+        return b'i%de' % value
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return b'%d:%s' % (len(value), value)
+    if isinstance(value, list):
+        return b'l' + b''.join(bencode(item) for item in value) + b'e'
+    if isinstance(value, dict):
+        items = sorted((k.encode() if isinstance(k, str) else k, v) for k, v in value.items())
+        return b'd' + b''.join(bencode(k) + bencode(v) for k, v in items) + b'e'
+    raise TypeError(value)
+
+
+def make_info(length=100_000, piece_length=32_768, **extra):
+    info = {'name': 'Game.xci', 'piece length': piece_length, 'length': length,
+            'pieces': b'\x00' * 20 * -(-length // piece_length)}
+    info.update(extra)
+    return info
+
+
+def make_torrent(info=None, **extra):
+    torrent = {'announce': 'https://tracker.example/announce', 'info': info or make_info()}
+    torrent.update(extra)
+    return bencode(torrent)
+
+
+class TestDecode:
+    def test_values(self):
+        assert decode(b'i42e') == 42
+        assert decode(b'i-7e') == -7
+        assert decode(b'4:spam') == b'spam'
+        assert decode(b'0:') == b''
+        assert decode(b'l4:spami1ee') == [b'spam', 1]
+        assert decode(b'd3:bar4:spam3:fooi42ee') == {b'bar': b'spam', b'foo': 42}
+
+    def test_accepts_memoryview_and_bytearray(self):
+        assert decode(memoryview(b'li1ei2ee')) == [1, 2]
+        assert decode(bytearray(b'3:abc')) == b'abc'
+
+    @pytest.mark.parametrize('data', [
+        b'', b'i42', b'l', b'd3:foo', b'5:spam', b'li1e',
+    ])
+    def test_truncated(self, data):
+        with pytest.raises(BencodeError):
+            decode(data)
+
+    @pytest.mark.parametrize('data', [
+        b'i03e', b'i-0e', b'ie', b'x', b'e', b'di1ei2ee', b'-1:a',
+    ])
+    def test_malformed(self, data):
+        with pytest.raises(BencodeError):
+            decode(data)
+
+    def test_trailing_data(self):
+        with pytest.raises(BencodeError, match='trailing'):
+            decode(b'i1ei2e')
+
+    def test_nesting_limit(self):
+        assert decode(b'l' * MAX_DEPTH + b'e' * MAX_DEPTH)
+        with pytest.raises(BencodeError, match='nesting'):
+            decode(b'l' * (MAX_DEPTH + 2) + b'e' * (MAX_DEPTH + 2))
+
+    def test_bencode_error_is_value_error(self):
+        assert issubclass(BencodeError, ValueError)
+
+
+class TestParseTorrent:
+    def test_single_file(self):
+        info = make_info(private=1)
+        metadata = parse_torrent(make_torrent(info))
+
+        assert metadata.info_hash == hashlib.sha1(bencode(info)).hexdigest()
+        assert metadata.name == 'Game.xci'
+        assert metadata.total_size == 100_000
+        assert metadata.file_count == 1
+        assert metadata.piece_length == 32_768
+        assert metadata.piece_count == 4
+        assert metadata.private is True
+        assert metadata.announce == 'https://tracker.example/announce'
+        assert metadata.torrent_size == len(make_torrent(info))
+
+    def test_multi_file(self):
+        files = [{'length': 1_000, 'path': ['a.bin']}, {'length': 2_500, 'path': ['dir', 'b.bin']}]
+        info = {'name': 'Pack', 'piece length': 1_024, 'files': files, 'pieces': b'\x01' * 20 * 4}
+        metadata = parse_torrent(make_torrent(info))
+
+        assert metadata.total_size == 3_500
+        assert metadata.file_count == 2
+        assert metadata.piece_count == 4
+        assert metadata.private is False
+
+    def test_info_hash_uses_raw_span(self):
+        # Keys out of order: re-encoding would change the hash, the raw bytes must not
+        info = make_info()
+        raw_info = (b'd4:name8:Game.xci6:lengthi100000e12:piece lengthi32768e6:pieces80:'
+                    + info['pieces'] + b'e')
+        data = b'd4:info' + raw_info + b'e'
+
+        assert parse_torrent(data).info_hash == hashlib.sha1(raw_info).hexdigest()
+
+    def test_unknown_keys_are_skipped(self):
+        info = make_info(source={'nested': [1, [2, {'x': b'y'}]]})
+        metadata = parse_torrent(make_torrent(info, comment='hello', **{'url-list': ['a', 'b']}))
+
+        assert metadata.info_hash == hashlib.sha1(bencode(info)).hexdigest()
+
+    def test_to_dict(self):
+        metadata = parse_torrent(make_torrent())
+        assert metadata.to_dict()['total_size'] == 100_000
+        assert set(metadata.to_dict()) == set(metadata.__slots__)
+
+    @pytest.mark.parametrize('info, message', [
+        ({'name': 'x', 'piece length': 16, 'pieces': b'\x00' * 20}, "neither 'length' nor 'files'"),
+        (make_info(pieces=b'\x00' * 30), "'pieces'"),
+        (make_info(pieces=b'\x00' * 20), 'piece hashes'),
+        (make_info(**{'piece length': 0}), "'piece length'"),
+        ({'piece length': 16, 'length': 16, 'pieces': b'\x00' * 20}, "'name'"),
+        ({'name': 'x', 'piece length': 16, 'pieces': b'\x00' * 20, 'files': [{'path': ['a']}]},
+         'no valid length'),
+    ])
+    def test_invalid_info(self, info, message):
+        with pytest.raises(BencodeError, match=message):
+            parse_torrent(make_torrent(info))
+
+    @pytest.mark.parametrize('data', [
+        b'', b'<html>Just a moment...</html>', b'de', b'li1ee', make_torrent()[:-1],
+        make_torrent() + b'\n', b'd4:info' + b'l' * (MAX_DEPTH + 1),
+    ])
+    def test_invalid_data(self, data):
+        with pytest.raises(BencodeError):
+            parse_torrent(data)
+        assert verify_torrent_data(data) is None
+
+    def test_verify_torrent_data(self):
+        assert verify_torrent_data(make_torrent()).file_count == 1
+
+
+class TestTorrentFiles:
+    def test_read_torrent_file(self, tmp_path):
+        path = tmp_path / 'game.torrent'
+        path.write_bytes(make_torrent())
+
+        assert read_torrent_file(str(path)).total_size == 100_000
+        assert verify_torrent_file(str(path)).name == 'Game.xci'
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / 'empty.torrent'
+        path.write_bytes(b'')
+
+        with pytest.raises(BencodeError, match='empty'):
+            read_torrent_file(str(path))
+        assert verify_torrent_file(str(path)) is None
+
+    def test_missing_file(self, tmp_path):
+        assert verify_torrent_file(str(tmp_path / 'missing.torrent')) is None
+
+    @pytest.mark.skipif(not SAMPLE_TORRENTS, reason='no sample torrents in data/')
+    @pytest.mark.parametrize('path', SAMPLE_TORRENTS, ids=os.path.basename)
+    def test_sample_torrents(self, path):
+        metadata = read_torrent_file(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        assert parse_torrent(data).info_hash == metadata.info_hash
+        assert len(metadata.info_hash) == 40
+        assert metadata.total_size > 0
+        assert metadata.piece_count == -(-metadata.total_size // metadata.piece_length)
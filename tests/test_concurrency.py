@@ -0,0 +1,183 @@
+"""Tests for ygg_concurrency"""
+
+import threading
+
+import pytest
+
+from ygg_concurrency import ERROR, ERROR_WINDOW, OVERLOAD, SUCCESS, AIMDController
+
+
+def run_saturated(controller, requests, latency=0.1, outcome=SUCCESS):
+    """Keep every slot busy and complete ``requests`` requests one at a time."""
+    for _ in range(requests):
+        while controller.in_flight < controller.limit:
+            controller.acquire()
+        controller.release(latency, outcome)
+
+
+def drain(controller):
+    while controller.in_flight:
+        controller.release(None)
+
+
+class TestLimits:
+    def test_initial_limit_is_clamped(self):
+        assert AIMDController(initial=50, max_limit=8).limit == 8
+        assert AIMDController(initial=0, min_limit=2).limit == 2
+        assert AIMDController(min_limit=0).min_limit == 1
+
+    def test_additive_increase_when_saturated(self):
+        controller = AIMDController(initial=2, max_limit=16)
+
+        # Each completion adds 1 / limit: about one step per round of ``limit`` requests
+        run_saturated(controller, 2)
+        assert controller.limit == 2
+        run_saturated(controller, 1)
+        assert controller.limit == 3
+        run_saturated(controller, 3)
+        assert controller.limit == 4
+        assert controller.metrics()['increases'] == 2
+
+    def test_increase_stops_at_max(self):
+        controller = AIMDController(initial=2, max_limit=5)
+        run_saturated(controller, 100)
+
+        assert controller.limit == 5
+        assert controller.metrics()['peak_concurrency'] == 5
+
+    def test_no_increase_below_the_limit(self):
+        controller = AIMDController(initial=4)
+        for _ in range(20):
+            controller.acquire()
+            controller.release(0.1)
+
+        assert controller.limit == 4
+
+    def test_slow_successes_hold_the_limit(self):
+        controller = AIMDController(initial=4, latency_tolerance=2.0)
+        run_saturated(controller, 4, latency=0.1)
+        drain(controller)
+        limit = controller.limit
+
+        run_saturated(controller, 20, latency=1.0)
+        assert controller.limit == limit
+
+
+class TestDecrease:
+    def test_overload_halves_the_limit(self):
+        controller = AIMDController(initial=8, min_limit=1)
+        controller.acquire()
+        controller.release(0.0, OVERLOAD)
+
+        assert controller.limit == 4
+
+    def test_requests_sent_before_a_decrease_do_not_count(self):
+        controller = AIMDController(initial=8)
+        for _ in range(3):
+            controller.acquire()
+
+        controller.release(0.0, OVERLOAD)
+        # Started 10 seconds ago, i.e. before the decrease above
+        controller.release(10.0, OVERLOAD)
+        controller.release(10.0, OVERLOAD)
+        assert controller.limit == 4
+
+        controller.acquire()
+        controller.release(0.0, OVERLOAD)
+        assert controller.limit == 2
+
+    def test_min_limit(self):
+        controller = AIMDController(initial=2, min_limit=1)
+        for _ in range(5):
+            controller.acquire()
+            controller.release(0.0, OVERLOAD)
+
+        assert controller.limit == 1
+        assert controller.metrics()['decreases'] == 1
+
+    def test_error_rate(self):
+        controller = AIMDController(initial=8, error_rate_limit=0.2)
+        for _ in range(ERROR_WINDOW // 2 - 2):
+            controller.acquire()
+            controller.release(0.1)
+
+        # 1/9 and 2/10 errors are tolerated, 3/11 is not
+        for _ in range(2):
+            controller.acquire()
+            controller.release(0.1, ERROR)
+            assert controller.limit == 8
+        controller.acquire()
+        controller.release(0.1, ERROR)
+        assert controller.limit == 4
+
+    def test_occasional_errors_are_tolerated(self):
+        controller = AIMDController(initial=4)
+        for i in range(100):
+            controller.acquire()
+            controller.release(0.1, ERROR if i % 10 == 0 else SUCCESS)
+
+        assert controller.limit == 4
+
+
+class TestSlots:
+    def test_acquire_blocks_at_the_limit(self):
+        controller = AIMDController(initial=1, max_limit=1)
+        controller.acquire()
+        acquired = threading.Event()
+
+        def worker():
+            controller.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        assert not acquired.wait(0.1)
+
+        controller.release(0.1)
+        assert acquired.wait(2)
+        thread.join()
+        assert controller.in_flight == 1
+
+    def test_slot_reports_success(self):
+        controller = AIMDController(initial=2)
+        with controller.slot():
+            assert controller.in_flight == 1
+
+        assert controller.in_flight == 0
+        assert controller.metrics()['completed'] == 1
+
+    def test_slot_classifies_exceptions(self):
+        controller = AIMDController(initial=8)
+
+        with pytest.raises(TimeoutError):
+            with controller.slot(lambda e: OVERLOAD if isinstance(e, TimeoutError) else ERROR):
+                raise TimeoutError()
+        with pytest.raises(KeyError):
+            with controller.slot():
+                raise KeyError('x')
+
+        metrics = controller.metrics()
+        assert controller.limit == 4
+        assert metrics['overloads'] == 1
+        assert metrics['errors'] == 1
+        assert controller.in_flight == 0
+
+
+def test_metrics():
+    controller = AIMDController(initial=2)
+    assert controller.metrics()['latency_ms'] is None
+    assert controller.metrics()['throughput_per_second'] == 0.0
+
+    run_saturated(controller, 4, latency=0.05)
+    metrics = controller.metrics()
+
+    assert set(metrics) == {
+        'concurrency', 'in_flight', 'peak_concurrency', 'throughput_per_second', 'latency_ms',
+        'baseline_latency_ms', 'completed', 'errors', 'overloads', 'increases', 'decreases'
+    }
+    assert metrics['completed'] == 4
+    assert metrics['latency_ms'] == 50.0
+    assert metrics['baseline_latency_ms'] == 50.0
+    assert metrics['concurrency'] == controller.limit
+    assert metrics['in_flight'] == controller.in_flight
+    assert metrics['increases'] >= 1
@@ -0,0 +1,200 @@
+"""Tests for ygg_download_queue"""
+
+import time
+from email.utils import formatdate
+
+import pytest
+
+from ygg_download_queue import (
+    ACTIVE, DONE, FAILED, MAX_RETRY_DELAY, PENDING, POLL_INTERVAL,
+    DownloadQueue, GlobalSlowdown, backoff_delay, parse_retry_after
+)
+
+
+def torrent(torrent_id, title=None):
+    return {'id': torrent_id, 'title': title or f"Torrent {torrent_id}",
+            'torrent_link': f"https://www.yggtorrent.top/rss/download?id={torrent_id}&passkey=x"}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = DownloadQueue(str(tmp_path / 'queue.db'), max_retries=2, retry_delay=10, max_delay=60)
+    yield queue
+    queue.close()
+
+
+class TestBackoffDelay:
+    @pytest.mark.parametrize('attempt, ceiling', [(1, 2), (2, 4), (3, 8), (4, 16), (6, 30), (20, 30)])
+    def test_jittered_exponential(self, attempt, ceiling):
+        for _ in range(50):
+            assert ceiling / 2 <= backoff_delay(attempt, base=2, cap=30) <= ceiling
+
+    def test_attempt_zero_uses_base(self):
+        assert 1 <= backoff_delay(0, base=2, cap=30) <= 2
+
+
+class TestParseRetryAfter:
+    def test_seconds(self):
+        assert parse_retry_after('120') == 120.0
+        assert parse_retry_after(' 5 ') == 5.0
+
+    def test_capped(self):
+        assert parse_retry_after(str(int(MAX_RETRY_DELAY) * 10)) == MAX_RETRY_DELAY
+
+    def test_http_date(self):
+        assert 25 <= parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+        assert parse_retry_after(formatdate(time.time() - 30, usegmt=True)) == 0.0
+
+    @pytest.mark.parametrize('value', [None, '', 'soon', '-5'])
+    def test_invalid(self, value):
+        assert parse_retry_after(value) is None
+
+
+class TestGlobalSlowdown:
+    def test_penalty_grows_per_strike_and_resets(self):
+        slowdown = GlobalSlowdown(base_delay=0.02, max_delay=0.05)
+
+        assert slowdown.trip() == pytest.approx(0.02, abs=0.005)
+        assert slowdown.wait() > 0
+        assert slowdown.trip() == pytest.approx(0.04, abs=0.005)
+        slowdown.wait()
+        assert slowdown.trip() == pytest.approx(0.05, abs=0.005)
+
+        slowdown.wait()
+        slowdown.reset()
+        assert slowdown.trip() == pytest.approx(0.02, abs=0.005)
+
+    def test_trips_during_a_pause_only_extend_it(self):
+        slowdown = GlobalSlowdown(base_delay=10, max_delay=100)
+        slowdown.trip()
+        slowdown.trip()
+        slowdown.trip()
+
+        # Still the first strike: 10s, not 40s
+        assert 9 < slowdown.remaining <= 10
+
+    def test_retry_after_wins(self):
+        slowdown = GlobalSlowdown(base_delay=1, max_delay=100)
+
+        assert slowdown.trip(retry_after=30) == pytest.approx(30, abs=0.1)
+        assert slowdown.trip(retry_after=5) == pytest.approx(30, abs=0.1)
+
+    def test_wait_without_pause(self):
+        assert GlobalSlowdown().wait() == 0.0
+
+
+class TestDownloadQueue:
+    def test_enqueue(self, queue):
+        keys = queue.enqueue([torrent(1), torrent(2), {'id': 3, 'title': 'No link'}, {'title': 'No key'}])
+
+        assert keys == ['1', '2']
+        assert queue.stats() == {PENDING: 2, ACTIVE: 0, DONE: 0, FAILED: 0}
+
+    def test_claim_and_complete(self, queue):
+        queue.enqueue([torrent(1), torrent(2)])
+
+        item = queue.claim()
+        assert item['key'] == '1'
+        assert item['state'] == ACTIVE
+        assert item['attempts'] == 1
+        assert item['title'] == 'Torrent 1'
+
+        queue.complete('1', 'downloads/1.torrent', 'ab' * 20)
+        assert queue.results(['1', '2']) == {'1': 'downloads/1.torrent', '2': None}
+        assert queue.claim()['key'] == '2'
+        assert queue.claim() is None
+
+    def test_done_items_are_not_queued_again(self, queue):
+        queue.enqueue([torrent(1)])
+        queue.claim()
+        queue.complete('1', 'downloads/1.torrent')
+
+        assert queue.enqueue([torrent(1)]) == ['1']
+        assert queue.claim() is None
+        assert queue.stats()[DONE] == 1
+
+    def test_retryable_failure_is_scheduled(self, queue):
+        queue.enqueue([torrent(1)])
+        queue.claim()
+
+        delay = queue.fail('1', 'HTTP 502', status=502)
+        assert 5 <= delay <= 10
+        assert queue.stats()[PENDING] == 1
+        assert queue.claim() is None
+        assert queue.next_due_in() == pytest.approx(delay, abs=1)
+
+    def test_retry_after_is_a_minimum(self, queue):
+        queue.enqueue([torrent(1)])
+        queue.claim()
+
+        assert queue.fail('1', 'HTTP 429', status=429, retry_after=45) == 45
+
+    @pytest.mark.parametrize('status, retryable', [(404, True), (None, False)])
+    def test_permanent_failure(self, queue, status, retryable):
+        queue.enqueue([torrent(1)])
+        queue.claim()
+
+        assert queue.fail('1', 'gone', status=status, retryable=retryable) is None
+        assert queue.stats()[FAILED] == 1
+        assert queue.failures()[0]['key'] == '1'
+        assert queue.failures()[0]['last_error'] == 'gone'
+        assert queue.next_due_in() is None
+
+    def test_retries_run_out(self, tmp_path):
+        queue = DownloadQueue(str(tmp_path / 'queue.db'), max_retries=2, retry_delay=0)
+        queue.enqueue([torrent(1)])
+
+        for attempt in (1, 2):
+            assert queue.claim()['attempts'] == attempt
+            assert queue.fail('1', 'timeout') == 0
+        assert queue.claim()['attempts'] == 3
+        assert queue.fail('1', 'timeout') is None
+        assert queue.stats()[FAILED] == 1
+        queue.close()
+
+    def test_failed_items_are_reset(self, queue):
+        queue.enqueue([torrent(1), torrent(2)])
+        for _ in range(2):
+            item = queue.claim()
+            queue.fail(item['key'], 'gone', status=404)
+
+        assert queue.enqueue([torrent(1)]) == ['1']
+        assert queue.stats() == {PENDING: 1, ACTIVE: 0, DONE: 0, FAILED: 1}
+        assert queue.claim()['attempts'] == 1
+
+        assert queue.retry_failed() == 1
+        assert queue.claim()['key'] == '2'
+
+    def test_recover_after_restart(self, tmp_path):
+        path = str(tmp_path / 'queue.db')
+        queue = DownloadQueue(path)
+        queue.enqueue([torrent(1)])
+        queue.claim()
+        queue.close()
+
+        queue = DownloadQueue(path)
+        assert queue.stats()[ACTIVE] == 1
+        assert queue.recover() == 1
+        item = queue.claim()
+        assert item['key'] == '1'
+        assert item['attempts'] == 2
+        queue.close()
+
+    def test_next_due_in(self, queue):
+        assert queue.next_due_in() is None
+
+        queue.enqueue([torrent(1)])
+        assert queue.next_due_in() == 0.0
+
+        queue.claim()
+        assert queue.next_due_in() == POLL_INTERVAL
+
+        queue.complete('1', 'downloads/1.torrent')
+        assert queue.next_due_in() is None
+
+    def test_results_for_large_batches(self, queue):
+        keys = queue.enqueue([torrent(i) for i in range(1, 1201)])
+
+        results = queue.results(keys)
+        assert len(results) == 1200
+        assert not any(results.values())
@@ -0,0 +1,277 @@
+"""Tests for ygg_response_cache"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from ygg_response_cache import (
+    CACHE_COALESCED, CACHE_HIT, CACHE_MISS, ResponseCache, StreamAborted, UpstreamError
+)
+
+
+class Loader:
+    """Counts calls; optionally blocks until released so concurrent callers pile up."""
+
+    def __init__(self, value='feed', error=None, blocking=False):
+        self.value = value
+        self.error = error
+        self.calls = 0
+        self.release = threading.Event()
+        if not blocking:
+            self.release.set()
+
+    def __call__(self):
+        self.calls += 1
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def run_concurrently(count, target):
+    """Start ``count`` threads on ``target``; return them and the list their results go to."""
+    results = []
+
+    def worker():
+        try:
+            results.append(target())
+        except Exception as e:
+            results.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+class TestGetOrLoad:
+    def test_miss_then_hit(self):
+        cache = ResponseCache(ttl=60)
+        loader = Loader()
+
+        assert cache.get_or_load('a', loader) == ('feed', CACHE_MISS, 0.0)
+        value, status, age = cache.get_or_load('a', loader)
+
+        assert (value, status) == ('feed', CACHE_HIT)
+        assert 0 <= age < 1
+        assert loader.calls == 1
+
+    def test_expired_entries_are_loaded_again(self):
+        cache = ResponseCache(ttl=0.05)
+        loader = Loader()
+        cache.get_or_load('a', loader)
+        time.sleep(0.06)
+
+        assert cache.get_or_load('a', loader)[1] == CACHE_MISS
+        assert loader.calls == 2
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResponseCache(ttl=60, max_entries=2)
+        loaders = {key: Loader(key) for key in 'abc'}
+        cache.get_or_load('a', loaders['a'])
+        cache.get_or_load('b', loaders['b'])
+        cache.get_or_load('a', loaders['a'])
+        cache.get_or_load('c', loaders['c'])
+
+        assert cache.stats()['entries'] == 2
+        assert cache.get_or_load('a', loaders['a'])[1] == CACHE_HIT
+        assert cache.get_or_load('b', loaders['b'])[1] == CACHE_MISS
+
+    def test_none_is_not_cached(self):
+        cache = ResponseCache()
+        loader = Loader(value=None)
+
+        assert cache.get_or_load('a', loader) == (None, CACHE_MISS, 0.0)
+        assert cache.get_or_load('a', loader)[1] == CACHE_MISS
+        assert cache.stats()['entries'] == 0
+
+    def test_errors_are_raised_and_not_cached(self):
+        cache = ResponseCache()
+        loader = Loader(error=UpstreamError(503))
+
+        with pytest.raises(UpstreamError) as error:
+            cache.get_or_load('a', loader)
+        assert error.value.status_code == 503
+        assert str(error.value) == 'HTTP 503'
+
+        loader.error = None
+        assert cache.get_or_load('a', loader)[1] == CACHE_MISS
+
+    def test_concurrent_misses_are_coalesced(self):
+        cache = ResponseCache()
+        loader = Loader(blocking=True)
+
+        threads, results = run_concurrently(5, lambda: cache.get_or_load('a', loader))
+        time.sleep(0.1)
+        loader.release.set()
+        for thread in threads:
+            thread.join()
+
+        assert loader.calls == 1
+        assert sorted(status for _, status, _ in results) == [CACHE_COALESCED] * 4 + [CACHE_MISS]
+        assert {value for value, _, _ in results} == {'feed'}
+        assert cache.stats()['coalesced'] == 4
+
+    def test_coalesced_age_counts_from_the_load(self):
+        cache = ResponseCache()
+        loader = Loader(blocking=True)
+
+        threads, results = run_concurrently(2, lambda: cache.get_or_load('a', loader))
+        time.sleep(0.3)
+        loader.release.set()
+        for thread in threads:
+            thread.join()
+
+        # The waiter waited 0.3s but got a value that had only just been loaded
+        assert all(age < 0.2 for _, _, age in results)
+
+    def test_errors_reach_every_waiter(self):
+        cache = ResponseCache()
+        loader = Loader(error=UpstreamError(502, 'Bad gateway'), blocking=True)
+
+        threads, results = run_concurrently(3, lambda: cache.get_or_load('a', loader))
+        time.sleep(0.1)
+        loader.release.set()
+        for thread in threads:
+            thread.join()
+
+        assert loader.calls == 1
+        assert all(isinstance(result, UpstreamError) and result.status_code == 502 for result in results)
+        assert cache.stats()['entries'] == 0
+
+    def test_keys_load_independently(self):
+        cache = ResponseCache()
+        blocked = Loader('slow', blocking=True)
+        threads, _ = run_concurrently(1, lambda: cache.get_or_load(('2163', 'x'), blocked))
+        time.sleep(0.05)
+
+        assert cache.get_or_load(('2145', 'x'), Loader('fast'))[:2] == ('fast', CACHE_MISS)
+        blocked.release.set()
+        threads[0].join()
+
+
+class Producer:
+    """Streams items one at a time and returns them all as the value to cache."""
+
+    def __init__(self, items=(1, 2, 3), error=None):
+        self.items = list(items)
+        self.error = error
+        self.calls = 0
+        self.produced = []
+
+    def __call__(self):
+        self.calls += 1
+        return self._generate()
+
+    def _generate(self):
+        for item in self.items:
+            self.produced.append(item)
+            yield item
+        if self.error is not None:
+            raise self.error
+        return list(self.items)
+
+
+class TestGetOrStream:
+    def test_miss_streams_before_the_load_finishes(self):
+        cache = ResponseCache()
+        producer = Producer()
+        iterator, status, age = cache.get_or_stream('a', producer)
+
+        assert (status, age) == (CACHE_MISS, 0.0)
+        assert next(iterator) == 1
+        assert producer.produced == [1]
+        assert cache.stats()['entries'] == 0
+
+        assert list(iterator) == [2, 3]
+        assert cache.stats()['entries'] == 1
+
+    def test_streamed_value_is_cached(self):
+        cache = ResponseCache()
+        producer = Producer()
+        list(cache.get_or_stream('a', producer)[0])
+
+        iterator, status, _ = cache.get_or_stream('a', producer)
+        assert (list(iterator), status) == ([1, 2, 3], CACHE_HIT)
+        assert cache.get_or_load('a', Loader())[:2] == ([1, 2, 3], CACHE_HIT)
+        assert producer.calls == 1
+
+    def test_items_of_a_loaded_value(self):
+        cache = ResponseCache()
+        cache.get_or_load('a', Loader({'items': [4, 5]}))
+
+        iterator, status, _ = cache.get_or_stream('a', Producer(), items=lambda value: value['items'])
+        assert (list(iterator), status) == ([4, 5], CACHE_HIT)
+
+    def test_waiters_get_the_whole_value(self):
+        cache = ResponseCache()
+        stream, _, _ = cache.get_or_stream('a', Producer())
+        follower, status, _ = cache.get_or_stream('a', Producer())
+        assert status == CACHE_COALESCED
+
+        threads, results = run_concurrently(1, lambda: list(follower))
+        assert next(stream) == 1
+        assert not results
+        assert list(stream) == [2, 3]
+        threads[0].join()
+
+        assert results == [[1, 2, 3]]
+
+    def test_errors_are_raised_and_not_cached(self):
+        cache = ResponseCache()
+        iterator, _, _ = cache.get_or_stream('a', Producer(error=UpstreamError(500)))
+
+        assert next(iterator) == 1
+        with pytest.raises(UpstreamError):
+            list(iterator)
+        assert cache.get_or_stream('a', Producer())[1] == CACHE_MISS
+
+    @pytest.mark.parametrize('consumed', [0, 1])
+    def test_closing_early_aborts_waiters(self, consumed):
+        cache = ResponseCache()
+        stream, _, _ = cache.get_or_stream('a', Producer())
+        follower, _, _ = cache.get_or_stream('a', Producer())
+        for _ in range(consumed):
+            next(stream)
+
+        stream.close()
+
+        with pytest.raises(StreamAborted):
+            list(follower)
+        assert cache.stats()['entries'] == 0
+        assert cache.get_or_stream('a', Producer())[1] == CACHE_MISS
+
+
+class TestManagement:
+    def test_invalidate_and_clear(self):
+        cache = ResponseCache()
+        for key in 'abc':
+            cache.get_or_load(key, Loader())
+
+        cache.invalidate('a')
+        cache.invalidate('missing')
+        assert cache.stats()['entries'] == 2
+        cache.clear()
+        assert cache.stats()['entries'] == 0
+
+    def test_stats(self):
+        cache = ResponseCache(ttl=30, max_entries=10)
+        loader = Loader()
+        cache.get_or_load('a', loader)
+        cache.get_or_load('a', loader)
+
+        assert cache.stats() == {'entries': 1, 'ttl': 30, 'max_entries': 10,
+                                 'hits': 1, 'misses': 1, 'coalesced': 0}
+
+    def test_apply_headers(self):
+        cache = ResponseCache(ttl=60)
+        response = SimpleNamespace(headers={})
+
+        assert cache.apply_headers(response, CACHE_HIT, 12.7) is response
+        assert response.headers == {'X-Cache': 'HIT', 'X-Cache-Age': '12',
+                                    'Cache-Control': 'private, max-age=47'}
+
+        cache.apply_headers(response, CACHE_HIT, 90)
+        assert response.headers['Cache-Control'] == 'private, max-age=0'
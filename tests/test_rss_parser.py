@@ -0,0 +1,130 @@
+"""Tests for the incremental RSS parsing in ygg_parser"""
+
+import os
+
+import pytest
+
+pytest.importorskip('requests')
+pytest.importorskip('bs4')
+
+from ygg_parser import FeedParseError, RSSStreamParser, YGGParserWithDownloads, iter_parse_rss
+
+
+SAMPLE_FEED = os.path.join(os.path.dirname(__file__), '..', 'data', 'rss_debug_response.xml')
+
+FEED = (
+    b'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>YGG</title>'
+    b'<item><title>Game One (S:12/L:3)</title><link>https://www.yggtorrent.top/torrent/jeux/101-game-one</link>'
+    b'<enclosure url="https://www.yggtorrent.top/rss/download?id=101&amp;passkey=x" length="2048"/></item>'
+    b'<item><title>Game Two</title><link>https://www.yggtorrent.top/torrent/jeux/102-game-two</link></item>'
+    b'</channel></rss>'
+)
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestRSSStreamParser:
+    def test_items_complete_as_their_end_tag_arrives(self):
+        parser = RSSStreamParser()
+        end = FEED.index(b'</item>') + len(b'</item>')
+
+        assert parser.feed(FEED[:end - 1]) == []
+        first = parser.feed(FEED[end - 1:end])
+        assert [torrent['id'] for torrent in first] == [101]
+        assert first[0]['size_bytes'] == 2048
+        assert first[0]['seeders'] == 12
+
+        assert [torrent['id'] for torrent in parser.feed(FEED[end:]) + parser.close()] == [102]
+        assert parser.count == 2
+
+    @pytest.mark.parametrize('size', [1, 7, 64, len(FEED)])
+    def test_chunk_boundaries_do_not_matter(self, size):
+        assert [torrent['id'] for torrent in iter_parse_rss(chunked(FEED, size))] == [101, 102]
+
+    def test_rss_1_0(self):
+        feed = (b'<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" '
+                b'xmlns="http://purl.org/rss/1.0/"><item><title>T</title>'
+                b'<link>https://www.yggtorrent.top/torrent/x/7-t</link></item></rdf:RDF>')
+
+        assert [torrent['id'] for torrent in iter_parse_rss([feed], strict=True)] == [7]
+
+    @pytest.mark.skipif(not os.path.exists(SAMPLE_FEED), reason='no sample feed in data/')
+    def test_sample_feed(self):
+        with open(SAMPLE_FEED, 'rb') as f:
+            content = f.read()
+
+        torrents = list(iter_parse_rss(chunked(content, 16384), strict=True))
+        assert torrents
+        assert all(torrent['title'] for torrent in torrents)
+
+
+class TestInvalidFeeds:
+    @pytest.mark.parametrize('body', [
+        b'<!DOCTYPE html><html><head><title>Just a moment...</title></head><body class="cf-chl">',
+        b'<html><body><h1>502 Bad Gateway</h1></body></html>',
+        b'Service unavailable',
+        FEED[:FEED.index(b'</item>') + 20],
+        b'',
+    ])
+    def test_strict_mode_raises(self, body):
+        with pytest.raises(FeedParseError):
+            list(iter_parse_rss(chunked(body, 16), strict=True))
+
+    def test_html_is_rejected_at_its_first_tag(self):
+        parser = RSSStreamParser()
+
+        with pytest.raises(FeedParseError, match='root element <html>'):
+            parser.feed(b'<html><body>')
+
+    def test_lenient_mode_keeps_the_items_before_the_error(self):
+        truncated = FEED[:FEED.index(b'</item>') + 20]
+
+        assert [torrent['id'] for torrent in iter_parse_rss([truncated])] == [101]
+        assert list(iter_parse_rss([b'<html></html>'])) == []
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode()
+        self.headers = headers or {}
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(headers)
+        return self.responses.pop(0)
+
+
+class TestIterNewItems:
+    @pytest.fixture
+    def parser(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        parser = YGGParserWithDownloads()
+        parser.authenticated = True
+        parser.seen_index_path = str(tmp_path / 'seen.db')
+        return parser
+
+    def test_unchanged_feed_yields_items_left_unseen(self, parser):
+        parser.session = FakeSession(FakeResponse(200, FEED, {'ETag': '"v1"'}), FakeResponse(304))
+
+        items = parser.iter_new_items(2161, 'x')
+        assert next(items)['id'] == 101
+        assert next(items)['id'] == 102  # 101 is done, 102 fails
+        items.close()
+
+        assert [torrent['id'] for torrent in parser.iter_new_items(2161, 'x')] == [102]
+        assert parser.session.requests[1] == {'If-None-Match': '"v1"'}
+
+    def test_unchanged_feed_with_everything_seen_yields_nothing(self, parser):
+        parser.session = FakeSession(FakeResponse(200, FEED), FakeResponse(200, FEED))
+
+        assert [torrent['id'] for torrent in parser.iter_new_items(2161, 'x')] == [101, 102]
+        assert list(parser.iter_new_items(2161, 'x')) == []
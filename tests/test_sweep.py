@@ -0,0 +1,64 @@
+"""Tests for ygg_sweep"""
+
+import itertools
+import threading
+import time
+
+from ygg_sweep import RESULTS_PER_WORKER, SweepEngine
+
+
+def make_engine(max_workers=2):
+    return SweepEngine(lambda: object(), max_workers=max_workers, requests_per_second=1000, burst=1000)
+
+
+def test_collects_every_item():
+    engine = make_engine()
+    results = sorted(engine.run(range(5), lambda session, task: range(task)))
+    assert results == sorted((task, item) for task in range(5) for item in range(task))
+    assert engine.errors == {}
+
+
+def test_workers_wait_for_a_slow_consumer():
+    produced = itertools.count()
+
+    def fetch(session, task):
+        for item in range(1000):
+            next(produced)
+            yield item
+
+    engine = make_engine(max_workers=2)
+    results = engine.run(range(2), fetch)
+    next(results)
+    time.sleep(0.2)
+
+    # Queue capacity, one item held by each blocked worker, and the one consumed
+    assert next(produced) <= 2 * RESULTS_PER_WORKER + 2 + 1
+    results.close()
+
+
+def sweep_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith('sweep-')]
+
+
+def test_closing_early_releases_blocked_workers():
+    engine = make_engine(max_workers=3)
+    results = engine.run(range(3), lambda session, task: itertools.count())
+    next(results)
+    time.sleep(0.1)
+    results.close()
+
+    deadline = time.monotonic() + 2
+    while sweep_threads() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert sweep_threads() == []
+
+
+def test_records_failed_tasks():
+    def fetch(session, task):
+        if task == 1:
+            raise ValueError('boom')
+        return (task,)
+
+    engine = make_engine()
+    assert dict(engine.run(range(3), fetch)) == {0: 0, 2: 2}
+    assert isinstance(engine.errors[1], ValueError)
@@ -0,0 +1,44 @@
+"""Tests for ygg_torrent_store"""
+
+import os
+import stat
+
+import pytest
+
+from ygg_files import write_atomic
+from ygg_torrent_store import TorrentStore
+
+
+TORRENT = (b'd8:announce31:http://tracker.example/announce4:infod6:lengthi100000e'
+           b'4:name8:Game.xci12:piece lengthi32768e6:pieces80:' + b'\x00' * 80 + b'ee')
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TorrentStore(str(tmp_path / 'store'))
+    yield store
+    store.close()
+
+
+def test_adopt_copies_into_a_read_only_blob(store, tmp_path):
+    download = tmp_path / 'Game.torrent'
+    download.write_bytes(TORRENT)
+    inode = download.stat().st_ino
+
+    path, metadata = store.adopt(str(download), torrent_id=42)
+
+    assert os.stat(path).st_ino != inode
+    assert os.path.samefile(path, download)
+    assert not os.stat(path).st_mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+    assert store.lookup(42) == (path, metadata)
+
+
+def test_replacing_a_linked_name_keeps_the_blob(store, tmp_path):
+    path, _ = store.put(TORRENT, torrent_id=42)
+    name = store.link(path, str(tmp_path / 'names' / 'Game.torrent'))
+
+    write_atomic(name, b'something else')
+
+    with open(path, 'rb') as f:
+        assert f.read() == TORRENT
+    assert store.lookup(42)[0] == path
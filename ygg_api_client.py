@@ -24,18 +24,44 @@ class YGGAPIClient:
         except Exception as e:
             return {"error": str(e)}
     
-    def authenticate(self, username, password):
-        """Authenticate and get cookies."""
+    def authenticate(self, username, password, timeout=300, poll_interval=2):
+        """Authenticate and get cookies (queues a login job and polls it until it finished)."""
         try:
             data = {
                 "username": username,
                 "password": password
             }
             response = self.session.post(f"{self.base_url}/auth/login", json=data)
+            result = response.json()
+            
+            if response.status_code != 202:
+                return result
+            
+            return self.wait_for_login_job(result["job_id"], timeout, poll_interval)
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def get_login_job(self, job_id):
+        """Get the state of a login job."""
+        try:
+            response = self.session.get(f"{self.base_url}/auth/jobs/{job_id}")
             return response.json()
         except Exception as e:
             return {"error": str(e)}
     
+    def wait_for_login_job(self, job_id, timeout=300, poll_interval=2):
+        """Poll a login job until it finished and return its login result."""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            job = self.get_login_job(job_id)
+            # No job state: the request failed or the job id is unknown
+            if "status" not in job:
+                return job
+            if job["status"] in ("succeeded", "failed"):
+                return job.get("result") or {"success": False, "message": job.get("error")}
+            time.sleep(poll_interval)
+        return {"success": False, "message": f"Login job {job_id} still running after {timeout}s"}
+    
     def check_auth_status(self, cookie_string):
         """Check authentication status."""
         try:
@@ -65,6 +91,56 @@ class YGGAPIClient:
         except Exception as e:
             return {"error": str(e)}
 
+    def iter_rss_feed(self, category_id, cookie_string=None, passkey=None):
+        """
+        Iterate over a category's torrents as the API streams them (NDJSON).
+
+        The first torrent is available before the whole feed was fetched or
+        parsed. Unlike the other methods this raises ``RuntimeError`` on
+        errors instead of returning an error dict.
+        """
+        params = {"stream": 1}
+        if cookie_string:
+            params["cookies"] = cookie_string
+        if passkey:
+            params["passkey"] = passkey
+
+        with self.session.get(f"{self.base_url}/rss/{category_id}", params=params,
+                              headers={"Accept": "application/x-ndjson"}, stream=True) as response:
+            if response.status_code != 200:
+                try:
+                    message = response.json().get("message")
+                except ValueError:
+                    message = None
+                raise RuntimeError(message or f"HTTP {response.status_code}")
+
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                item = json.loads(line)
+                if "error" in item:
+                    raise RuntimeError(item["error"])
+                yield item
+
+    def get_rss_feeds(self, category_ids, cookie_string=None, passkey=None):
+        """
+        Get the merged feeds of several categories in one request.
+
+        Torrents are deduplicated by id and tagged with ``category_id``;
+        ``categories`` holds the outcome per category. Without
+        ``cookie_string`` the API uses its own cookie jar.
+        """
+        try:
+            params = {"ids": ",".join(str(category_id) for category_id in category_ids)}
+            if cookie_string:
+                params["cookies"] = cookie_string
+            if passkey:
+                params["passkey"] = passkey
+            response = self.session.get(f"{self.base_url}/rss/batch", params=params)
+            return response.json()
+        except Exception as e:
+            return {"error": str(e)}
+
 
 def main():
     """Test the API client."""
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Asynchronous YGG Torrent client
+Fetches RSS feeds and .torrent files with aiohttp, many requests in flight on one thread
+"""
+
+import os
+import re
+import sys
+import time
+import json
+import asyncio
+import logging
+import argparse
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+from ygg_parser import FeedParseError, RSSStreamParser, RSS_STREAM_CHUNK_SIZE
+from ygg_torrent_record import TorrentRecord, extract_torrent_id
+from ygg_bencode import BencodeError, parse_torrent, verify_torrent_file
+from ygg_files import write_atomic
+from ygg_torrent_store import TorrentStore, get_torrent_store
+from ygg_sweep import DEFAULT_BURST, DEFAULT_REQUESTS_PER_SECOND
+from ygg_session_pool import BROWSER_HEADERS, parse_cookie_string
+
+try:
+    import aiohttp
+    from yarl import URL
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+
+DEFAULT_BASE_URL = "https://www.yggtorrent.top"
+
+# Upper bound on open connections; requests beyond it wait for a free slot
+DEFAULT_MAX_CONNECTIONS = 100
+
+# Hop-by-hop headers aiohttp manages itself
+_SKIPPED_HEADERS = frozenset({'connection', 'accept-encoding', 'content-length', 'host'})
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTokenBucket:
+    """asyncio counterpart of ``ygg_sweep.TokenBucket``."""
+
+    def __init__(self, rate: float, burst: int = DEFAULT_BURST):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Take one token; waiters are served in arrival order."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncYGGClient:
+    """
+    RSS / download client running on a single event loop.
+
+    Usage::
+
+        async with AsyncYGGClient.from_session(scraper, passkey) as client:
+            torrents = await client.fetch_feed(2163)
+            async for subcat_id, torrent in client.sweep([2163, 2145]):
+                ...
+
+    Cookies and headers are copied from an authenticated requests/cloudscraper
+    session, so the Cloudflare clearance obtained there is reused as-is.
+    Items are extracted by the same ``RSSStreamParser`` as
+    ``YGGParserWithDownloads`` and returned as ``TorrentRecord`` objects.
+    """
+
+    def __init__(self, passkey: str = None, cookies: Dict[str, str] = None,
+                 headers: Dict[str, str] = None, base_url: str = DEFAULT_BASE_URL,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 requests_per_second: Optional[float] = DEFAULT_REQUESTS_PER_SECOND,
+                 download_dir: str = "downloads", parser=None, torrent_store: TorrentStore = None):
+        """
+        Args:
+            passkey: User passkey used in RSS URLs
+            cookies: Authentication cookies (name -> value)
+            headers: Request headers, defaults to the pooled sessions' ``BROWSER_HEADERS``
+            base_url: Tracker base URL
+            max_connections: Maximum number of simultaneous connections
+            requests_per_second: Request rate ceiling, None to disable
+            download_dir: Directory .torrent files are written to
+            parser: ``YGGParserWithDownloads`` the client was built from, if any
+            torrent_store: Store downloads are deduplicated in, defaults to ``get_torrent_store()``
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is required for AsyncYGGClient (pip install aiohttp)")
+
+        self.passkey = passkey
+        self.cookies = dict(cookies or {})
+        self.headers = {
+            name: value for name, value in (headers or BROWSER_HEADERS).items()
+            if name.lower() not in _SKIPPED_HEADERS
+        }
+        self.base_url = base_url.rstrip('/')
+        self.max_connections = max_connections
+        self.download_dir = download_dir
+        self.parser = parser
+        self._torrent_store = torrent_store
+        self.rate_limiter = AsyncTokenBucket(requests_per_second) if requests_per_second else None
+        self.session = None
+
+    @classmethod
+    def from_session(cls, session, passkey: str = None, **kwargs) -> 'AsyncYGGClient':
+        """Build a client sharing the cookies and headers of a requests/cloudscraper session."""
+        cookies = {cookie.name: cookie.value for cookie in session.cookies}
+        return cls(passkey, cookies=cookies, headers=dict(session.headers), **kwargs)
+
+    @classmethod
+    def from_parser(cls, parser, passkey: str = None, **kwargs) -> 'AsyncYGGClient':
+        """Build a client from an authenticated ``YGGParserWithDownloads``."""
+        kwargs.setdefault('base_url', parser.base_url)
+        kwargs.setdefault('download_dir', parser.download_dir)
+        kwargs.setdefault('torrent_store', parser.torrent_store)
+        return cls.from_session(parser.session, passkey, parser=parser, **kwargs)
+
+    @property
+    def torrent_store(self) -> TorrentStore:
+        """Content-addressed store of downloaded torrents (the process-wide one unless given)."""
+        if self._torrent_store is None:
+            self._torrent_store = get_torrent_store()
+        return self._torrent_store
+
+    async def __aenter__(self) -> 'AsyncYGGClient':
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        """Create the underlying aiohttp session and connection pool."""
+        if self.session is not None:
+            return
+
+        # unsafe=True keeps cookies for IP-address base URLs (local mirrors, proxies)
+        cookie_jar = aiohttp.CookieJar(unsafe=True)
+        cookie_jar.update_cookies(self.cookies, response_url=URL(self.base_url))
+
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.max_connections),
+            cookie_jar=cookie_jar,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+
+    async def close(self):
+        """Close the connection pool."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _throttle(self):
+        if self.rate_limiter:
+            await self.rate_limiter.acquire()
+
+    def _build_rss_url(self, subcat_id: int) -> str:
+        return f"{self.base_url}/rss?action=generate&type=subcat&id={subcat_id}&passkey={self.passkey}"
+
+    async def iter_feed(self, subcat_id: int) -> AsyncIterator[TorrentRecord]:
+        """
+        Stream one RSS feed and yield torrents as each ``</item>`` arrives.
+
+        Args:
+            subcat_id: Subcategory ID
+
+        Yields:
+            Torrent records in feed order
+        """
+        await self.open()
+        await self._throttle()
+
+        rss_url = self._build_rss_url(subcat_id)
+        logger.info(f"📡 Fetching RSS feed for subcategory {subcat_id}")
+
+        async with self.session.get(rss_url) as response:
+            if response.status == 403:
+                logger.error("❌ 403 Forbidden - authentication may have expired")
+                return
+            if response.status != 200:
+                logger.error(f"❌ Unexpected status code for {subcat_id}: {response.status}")
+                return
+
+            parser = RSSStreamParser()
+            try:
+                async for chunk in response.content.iter_chunked(RSS_STREAM_CHUNK_SIZE):
+                    for torrent_info in parser.feed(chunk):
+                        yield torrent_info
+
+                for torrent_info in parser.close():
+                    yield torrent_info
+            except FeedParseError as e:
+                logger.error(f"⚠ XML parsing error in subcategory {subcat_id}: {e}")
+
+    async def fetch_feed(self, subcat_id: int) -> List[TorrentRecord]:
+        """Fetch and parse one RSS feed, returning its torrents (empty on failure)."""
+        try:
+            return [torrent async for torrent in self.iter_feed(subcat_id)]
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"❌ Request error for subcategory {subcat_id}: {e}")
+            return []
+
+    async def fetch_feeds(self, categories: Iterable[int]) -> Dict[int, List[TorrentRecord]]:
+        """Fetch several feeds concurrently and return ``{subcat_id: torrents}``."""
+        categories = list(categories)
+        results = await asyncio.gather(*(self.fetch_feed(subcat_id) for subcat_id in categories))
+        return dict(zip(categories, results))
+
+    async def sweep(self, categories: Iterable[int]) -> AsyncIterator[Tuple[int, TorrentRecord]]:
+        """
+        Stream every feed in ``categories`` concurrently.
+
+        Args:
+            categories: Subcategory IDs
+
+        Yields:
+            ``(subcat_id, torrent)`` pairs as soon as any feed produces them
+        """
+        results = asyncio.Queue()
+        done_marker = object()
+
+        async def pump(subcat_id):
+            try:
+                async for torrent in self.iter_feed(subcat_id):
+                    await results.put((subcat_id, torrent))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"❌ Request error for subcategory {subcat_id}: {e}")
+            finally:
+                await results.put(done_marker)
+
+        tasks = [asyncio.ensure_future(pump(subcat_id)) for subcat_id in categories]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                result = await results.get()
+                if result is done_marker:
+                    remaining -= 1
+                    continue
+                yield result
+        finally:
+            # Consumer stopped early - cancel the feeds still downloading
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _resolve_download_url(self, torrent: Union[int, str, TorrentRecord, Dict]) -> Tuple[str, Optional[int]]:
+        """Return the download URL and torrent ID for an ID, URL or torrent record."""
+        if isinstance(torrent, int) or (isinstance(torrent, str) and torrent.isdigit()):
+            torrent_id = int(torrent)
+            return f"{self.base_url}/engine/download_torrent?id={torrent_id}", torrent_id
+
+        if isinstance(torrent, str):
+            return torrent, extract_torrent_id(torrent)
+
+        torrent_id = torrent.get('id') or extract_torrent_id(torrent.get('torrent_link'), torrent.get('link'))
+        url = torrent.get('torrent_link') or f"{self.base_url}/engine/download_torrent?id={torrent_id}"
+        return url, torrent_id
+
+    async def download_torrent(self, torrent: Union[int, str, TorrentRecord, Dict],
+                               filename: str = None) -> Optional[str]:
+        """
+        Download and validate a .torrent file.
+
+        The body must parse as a complete torrent; a torrent record passed
+        in gets the ``info_hash`` and ``size_bytes`` read from the file.
+        Torrents already in ``torrent_store`` are linked instead of
+        downloaded, and new downloads are added to it.
+
+        Args:
+            torrent: Torrent ID, download URL or torrent record
+            filename: Optional file name inside ``download_dir``
+
+        Returns:
+            Path to the downloaded file or None if failed
+        """
+        await self.open()
+
+        url, torrent_id = self._resolve_download_url(torrent)
+        title = category = None
+        if isinstance(torrent, (dict, TorrentRecord)):
+            title, category = torrent.get('title'), torrent.get('category')
+        filename = re.sub(r'[<>:"/\\|?*]', '_', filename or f"{torrent_id or int(time.time())}.torrent")
+        if not filename.endswith('.torrent'):
+            filename += '.torrent'
+
+        filepath = os.path.join(self.download_dir, filename)
+        if os.path.exists(filepath):
+            metadata = verify_torrent_file(filepath)
+            if metadata:
+                logger.info(f"📁 File already exists: {filepath}")
+                self.torrent_store.adopt(filepath, metadata, torrent_id, url, title, category)
+                self._record_download(torrent, filepath, metadata)
+                return filepath
+            logger.warning(f"⚠ Existing file is not a valid torrent, downloading again: {filepath}")
+
+        # Same torrent fetched before (any file name, any download URL)
+        stored = self.torrent_store.lookup(torrent_id, url)
+        if stored:
+            stored_path, metadata = stored
+            self.torrent_store.link(stored_path, filepath)
+            logger.info(f"♻️ Already in torrent store: {filepath} (info hash {metadata.info_hash})")
+            self._record_download(torrent, filepath, metadata)
+            return filepath
+
+        await self._throttle()
+        logger.info(f"⬇️ Downloading: {filename}")
+
+        try:
+            async with self.session.get(url) as response:
+                if response.status != 200:
+                    logger.error(f"❌ Download failed for {url}: {response.status}")
+                    return None
+                content = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"❌ Download error for {url}: {e}")
+            return None
+
+        # A 200 can still carry a login/challenge page or a cut-off transfer
+        try:
+            metadata = parse_torrent(content)
+        except BencodeError as e:
+            logger.error(f"❌ Invalid torrent file from {url}: {e}")
+            return None
+
+        # Written under a temporary name, so an interrupted run never leaves a partial .torrent behind
+        os.makedirs(self.download_dir, exist_ok=True)
+        write_atomic(filepath, content)
+
+        # Keep one copy per info-hash; filepath becomes a link to it
+        self.torrent_store.adopt(filepath, metadata, torrent_id, url, title, category)
+
+        self._record_download(torrent, filepath, metadata)
+        logger.info(f"✅ Downloaded: {filepath} (info hash {metadata.info_hash})")
+        return filepath
+
+    @staticmethod
+    def _record_download(torrent, filepath: str, metadata):
+        """Store the download result on a torrent record (IDs and URLs have nowhere to keep it)."""
+        if isinstance(torrent, (dict, TorrentRecord)):
+            torrent['downloaded'] = True
+            torrent['download_path'] = filepath
+            # The file is ground truth; feeds may omit or round these
+            torrent['info_hash'] = metadata.info_hash
+            torrent['size_bytes'] = metadata.total_size
+
+    async def download_torrents(self, torrents: Iterable) -> List[Optional[str]]:
+        """Download several torrents concurrently; paths are returned in input order."""
+        return await asyncio.gather(*(self.download_torrent(torrent) for torrent in torrents))
+
+
+async def _run_sweep(args):
+    async with AsyncYGGClient(args.passkey, cookies=parse_cookie_string(args.cookies),
+                              max_connections=args.max_connections,
+                              requests_per_second=args.rate or None) as client:
+        counts = {}
+        async for subcat_id, torrent in client.sweep(args.categories):
+            counts[subcat_id] = counts.get(subcat_id, 0) + 1
+            print(f"  [{subcat_id}] {torrent['title']}")
+
+    print(f"\n📊 {sum(counts.values())} torrents from {len(counts)} subcategories")
+    print(json.dumps(counts, indent=2))
+
+
+def main():
+    """Sweep subcategories from the command line."""
+    parser = argparse.ArgumentParser(description="Async YGG Torrent RSS sweep")
+    parser.add_argument('categories', nargs='+', type=int, help='Subcategory IDs')
+    parser.add_argument('--cookies', default=os.getenv('YGG_COOKIES'), help='Cookie string (default: $YGG_COOKIES)')
+    parser.add_argument('--passkey', default=os.getenv('YGG_PASSKEY'), help='Passkey (default: $YGG_PASSKEY)')
+    parser.add_argument('--max-connections', type=int, default=DEFAULT_MAX_CONNECTIONS)
+    parser.add_argument('--rate', type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+                        help='Requests per second, 0 to disable')
+    args = parser.parse_args()
+
+    if not AIOHTTP_AVAILABLE:
+        print("❌ aiohttp not available. Install with: pip install aiohttp")
+        sys.exit(1)
+
+    if not args.cookies or not args.passkey:
+        print("❌ Cookies and passkey are required (--cookies/--passkey or YGG_COOKIES/YGG_PASSKEY)")
+        sys.exit(1)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    asyncio.run(_run_sweep(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,645 @@
+#!/usr/bin/env python3
+"""
+Authentication backends for the YGG Torrent API service
+A backend only turns a username/password into cookies; routes, sessions, caches and parsing live in ygg_service
+"""
+
+import os
+import atexit
+import inspect
+import logging
+import threading
+import subprocess
+import importlib.util
+from typing import Dict, List, Optional
+
+from ygg_cookie_store import normalize_cookies
+from ygg_login_jobs import EventLoopThread
+from ygg_browser_pool import (BrowserPool, BASE_DEBUG_PORT, reset_webdriver,
+                              webdriver_is_healthy, quit_webdriver)
+from ygg_readiness import (PhaseTimer, CLOUDFLARE_TIMEOUT, LOGIN_FORM_SELECTOR, LOGOUT_LINK_SELECTOR,
+                           has_element, wait_for_login_page, wait_for_login_result,
+                           is_cloudflare_challenge_async, wait_for_element_async,
+                           wait_for_login_page_async, wait_for_login_result_async)
+
+
+# Backend used when none is passed explicitly: undetected, selenium, zendriver or manual
+DEFAULT_AUTH_BACKEND = os.getenv('YGG_AUTH_BACKEND', 'undetected')
+
+BASE_URL = "https://www.yggtorrent.top"
+LOGIN_URL = f"{BASE_URL}/auth/login"
+
+# Seconds a login waits for a pooled browser before giving up
+BROWSER_LEASE_TIMEOUT = 120
+
+# Seconds one zendriver login may run on the event loop
+ZENDRIVER_LOGIN_TIMEOUT = 180
+
+USER_AGENT = ('Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+CHROME_PATHS = (
+    # Linux paths
+    '/usr/bin/google-chrome',
+    '/usr/bin/google-chrome-stable',
+    '/usr/bin/chromium',
+    '/usr/bin/chromium-browser',
+    '/usr/bin/chromium-browser-stable',
+    '/usr/bin/chrome',
+    '/snap/bin/chromium',
+    '/opt/google/chrome/chrome',
+    '/usr/local/bin/chromium',
+    '/usr/local/bin/google-chrome',
+    # macOS paths
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+    '/Applications/Chromium.app/Contents/MacOS/Chromium',
+    # Windows paths
+    'C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe',
+    'C:\\Program Files (x86)\\Google\\Chrome\\Application\\chrome.exe',
+    'C:\\Program Files\\Chromium\\Application\\chrome.exe'
+)
+
+# Extra Chrome switches for servers without a display
+HEADLESS_CHROME_ARGS = (
+    '--headless',
+    '--disable-extensions',
+    '--disable-plugins',
+    '--disable-images',
+    '--disable-javascript',
+    '--disable-web-security',
+    '--disable-features=VizDisplayCompositor',
+    '--virtual-time-budget=5000',
+    '--run-all-compositor-stages-before-draw',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--disable-software-rasterizer',
+    '--disable-background-networking',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-translate',
+    '--hide-scrollbars',
+    '--mute-audio',
+    '--no-first-run',
+    '--disable-logging',
+    '--disable-permissions-api',
+    '--disable-presentation-api',
+    '--disable-print-preview',
+    '--disable-speech-api',
+    '--disable-file-system',
+    '--disable-notifications',
+    '--disable-geolocation',
+    '--disable-media-stream',
+    '--disable-client-side-phishing-detection',
+    '--disable-component-extensions-with-background-pages',
+    '--disable-ipc-flooding-protection',
+    '--single-process'  # Use single process for better stability
+)
+
+USERNAME_SELECTORS = (
+    "input[name='id']",
+    "input[name='username']",
+    "input[name='user']",
+    "input[type='text']",
+    "#id",
+    "#username"
+)
+
+PASSWORD_SELECTORS = (
+    "input[name='pass']",
+    "input[name='password']",
+    "input[type='password']",
+    "#pass",
+    "#password"
+)
+
+SUBMIT_SELECTORS = (
+    "input[type='submit']",
+    "button[type='submit']",
+    "input[value='Connexion']",
+    "input[value='Login']",
+    ".submit",
+    "#submit"
+)
+
+# Page text that only shows up for logged-in users
+SUCCESS_INDICATORS = ('logout', 'déconnexion', 'profile', 'profil', 'account', 'compte')
+
+logger = logging.getLogger(__name__)
+
+
+def login_succeeded(browser_cookies, message: str = 'Authentication successful') -> Dict:
+    """Login result for cookies read from a browser (Selenium or zendriver format)."""
+    cookies, expires = normalize_cookies(list(browser_cookies))
+    logger.info(f"Extracted {len(cookies)} cookies")
+    return {
+        'success': True,
+        'cookies': cookies,
+        'expires': expires,
+        'cookie_string': '; '.join(f"{name}={value}" for name, value in cookies.items()),
+        'message': message
+    }
+
+
+def login_failed(message: str) -> Dict:
+    return {
+        'success': False,
+        'cookies': {},
+        'cookie_string': '',
+        'message': message
+    }
+
+
+def module_available(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+def check_chrome_installation() -> Optional[str]:
+    """Return the first Chrome/Chromium binary found, or None."""
+    found_paths = [path for path in CHROME_PATHS if os.path.exists(path)]
+    if found_paths:
+        logger.info(f"Found Chrome/Chromium installations: {found_paths}")
+        return found_paths[0]
+
+    logger.warning("No Chrome/Chromium installation found in common locations")
+    for command in ('google-chrome', 'chromium', 'chromium-browser'):
+        try:
+            result = subprocess.run(['which', command], capture_output=True, text=True)
+            if result.returncode == 0 and result.stdout.strip():
+                chrome_path = result.stdout.strip()
+                logger.info(f"Found {command} via 'which' command: {chrome_path}")
+                return chrome_path
+        except Exception:
+            pass
+
+    logger.warning("Could not find Chrome/Chromium using system commands either")
+    return None
+
+
+def detect_headless() -> bool:
+    """True on servers, containers, SSH sessions and xvfb, or when FORCE_HEADLESS=true."""
+    display_available = False
+    try:
+        if os.environ.get('DISPLAY'):
+            # Try to check if X server is running
+            result = subprocess.run(['xdpyinfo'], capture_output=True, text=True, timeout=5)
+            display_available = result.returncode == 0
+    except Exception:
+        display_available = False
+
+    return bool(
+        os.path.exists('/.dockerenv') or
+        os.environ.get('DOCKER_CONTAINER') or
+        not os.environ.get('DISPLAY') or
+        not display_available or
+        os.environ.get('SSH_CLIENT') or
+        os.environ.get('SSH_TTY') or
+        os.environ.get('XVFB_RUN') or  # xvfb-run sets this
+        'xvfb' in os.environ.get('_', '') or  # xvfb-run modifies _ variable
+        os.environ.get('FORCE_HEADLESS', '').lower() == 'true'
+    )
+
+
+def chrome_arguments(headless: bool, debug_port: int) -> List[str]:
+    """Chrome switches shared by the undetected-chromedriver and Selenium backends."""
+    arguments = ['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu', '--window-size=1366,768']
+    if headless:
+        arguments.extend(HEADLESS_CHROME_ARGS)
+        arguments.append(f'--remote-debugging-port={debug_port}')
+    return arguments
+
+
+def create_undetected_driver(slot: int = 0):
+    """
+    Launch an undetected Chrome driver for the browser pool.
+
+    Args:
+        slot: Pool slot; every live browser gets its own remote debugging port
+    """
+    import signal
+    import undetected_chromedriver as uc
+
+    chrome_path = check_chrome_installation()
+    headless = detect_headless()
+    if headless:
+        logger.info("Running in headless environment - using headless mode")
+    else:
+        logger.info("Running locally - using non-headless mode for better Cloudflare bypass")
+
+    def build_options():
+        options = uc.ChromeOptions()
+        for argument in chrome_arguments(headless, BASE_DEBUG_PORT + slot):
+            options.add_argument(argument)
+        return options
+
+    def timeout_handler(signum, frame):
+        raise TimeoutError("Chrome driver creation timed out")
+
+    # SIGALRM can only be armed from the main thread; pool warm-up runs in a background thread
+    use_alarm = threading.current_thread() is threading.main_thread()
+
+    def set_alarm(seconds):
+        if use_alarm:
+            signal.alarm(seconds)
+
+    if use_alarm:
+        signal.signal(signal.SIGALRM, timeout_handler)
+
+    try:
+        set_alarm(60)  # 60 second timeout
+        if chrome_path:
+            logger.info(f"Using Chrome binary: {chrome_path}")
+            driver = uc.Chrome(options=build_options(), browser_executable_path=chrome_path)
+        else:
+            logger.info("No Chrome path found, using auto-detection")
+            driver = uc.Chrome(options=build_options())
+        logger.info("Chrome driver created successfully")
+        return driver
+    except TimeoutError:
+        logger.error("Chrome driver creation timed out after 60 seconds")
+        raise Exception("Chrome driver creation timed out. This might indicate Chrome installation "
+                        "issues or insufficient system resources.")
+    except Exception as e:
+        logger.error(f"Failed to create Chrome driver: {e}")
+    finally:
+        set_alarm(0)
+
+    # Fallback: let undetected-chromedriver locate the browser itself (fresh options)
+    try:
+        logger.info("Trying fallback: Chrome driver without binary path")
+        set_alarm(60)
+        driver = uc.Chrome(options=build_options())
+        logger.info("Fallback Chrome driver created successfully")
+        return driver
+    except TimeoutError:
+        logger.error("Fallback Chrome driver creation also timed out")
+        raise Exception("Both primary and fallback Chrome driver creation timed out. "
+                        "Please check Chrome installation and system resources.")
+    except Exception as e:
+        logger.error(f"Fallback also failed: {e}")
+        raise Exception(f"Could not create Chrome driver. Please install Chrome/Chromium. Error: {e}")
+    finally:
+        set_alarm(0)
+
+
+def create_selenium_driver(slot: int = 0):
+    """Launch a plain Selenium Chrome driver (no undetected-chromedriver patches)."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_path = check_chrome_installation()
+    if not chrome_path:
+        raise Exception("No Chrome installation found")
+
+    logger.info(f"Using Chrome binary: {chrome_path}")
+    options = Options()
+    options.binary_location = chrome_path
+    for argument in chrome_arguments(detect_headless(), BASE_DEBUG_PORT + slot):
+        options.add_argument(argument)
+
+    try:
+        driver = webdriver.Chrome(options=options)
+        logger.info("✅ Chrome driver created successfully")
+        return driver
+    except Exception as e:
+        logger.error(f"Failed to create Chrome driver: {e}")
+        raise Exception(f"Could not create Chrome driver: {e}")
+
+
+def find_first(driver, selectors, label: str):
+    """First element matching one of ``selectors`` on a Selenium driver."""
+    for selector in selectors:
+        try:
+            element = driver.find_element("css selector", selector)
+            logger.info(f"Found {label}: {selector}")
+            return element
+        except Exception:
+            continue
+    raise Exception(f"Could not find {label}")
+
+
+def login_with_driver(driver, username: str, password: str) -> Dict:
+    """Log in through an already launched Selenium-compatible browser and return the result with cookies."""
+    timer = PhaseTimer(logger)
+
+    logger.info("Navigating to YGG Torrent login page...")
+    with timer.phase('navigate'):
+        driver.get(LOGIN_URL)
+
+    # Wait for Cloudflare to clear and the login form to render (title, form and cf_clearance polling)
+    if wait_for_login_page(driver, timer):
+        logger.info("✅ Login form ready")
+    else:
+        logger.warning("⚠️ Login form not detected before the deadline")
+
+        # Debug: Save page source for inspection
+        try:
+            with open('data/debug_api_page.html', 'w', encoding='utf-8') as f:
+                f.write(driver.page_source)
+            logger.info("Page source saved to data/debug_api_page.html for debugging")
+        except Exception as e:
+            logger.warning(f"Could not save debug page: {e}")
+
+    logger.info("Looking for login form...")
+    username_field = find_first(driver, USERNAME_SELECTORS, 'username field')
+    password_field = find_first(driver, PASSWORD_SELECTORS, 'password field')
+
+    logger.info("Filling login form...")
+    username_field.clear()
+    username_field.send_keys(username)
+    password_field.clear()
+    password_field.send_keys(password)
+
+    submit_button = find_first(driver, SUBMIT_SELECTORS, 'submit button')
+    logger.info("Submitting login form...")
+    submit_button.click()
+
+    with timer.phase('login_result'):
+        wait_for_login_result(driver, LOGIN_URL)
+
+    logger.info(f"Current URL: {driver.current_url}")
+    logger.info(f"Page title: {driver.title}")
+    logger.info(timer.summary())
+
+    # Check for success indicators (logout link first, page text as fallback)
+    has_success = has_element(driver, LOGOUT_LINK_SELECTOR)
+    if not has_success:
+        page_source = driver.page_source.lower()
+        has_success = any(indicator in page_source for indicator in SUCCESS_INDICATORS)
+
+    if not has_success:
+        logger.error("Login failed")
+        return login_failed('Login failed - still showing login page')
+
+    logger.info("Login successful!")
+    return login_succeeded(driver.get_cookies())
+
+
+class AuthBackend:
+    """
+    Turns credentials into cookies for ``ygg_service``.
+
+    ``login`` returns ``{'success', 'cookies', 'expires', 'cookie_string',
+    'message'}`` and never raises. ``max_concurrency`` sizes the service's
+    login job queue. Backends whose ``uses_browser`` is False cannot log in
+    themselves; the service then only serves cookie files found on disk.
+    """
+
+    name = 'base'
+    description = ''
+    uses_browser = True
+    requires = ()
+
+    # Saved cookie files the service's cookie store adopts
+    cookie_patterns = ('api_cookies_*.json',)
+
+    @property
+    def max_concurrency(self) -> int:
+        return 1
+
+    def check(self) -> Optional[str]:
+        """Describe a missing dependency, or None when the backend can run."""
+        missing = [module for module in self.requires if not module_available(module)]
+        if missing:
+            return f"Missing Python packages: {', '.join(missing)}"
+        return None
+
+    def warm(self):
+        """Prepare browsers ahead of the first login (called off the request path)."""
+
+    def login(self, username: str, password: str) -> Dict:
+        raise NotImplementedError
+
+    def close(self):
+        """Release browsers and threads."""
+
+    def stats(self) -> Dict:
+        return {'name': self.name, 'description': self.description, 'uses_browser': self.uses_browser}
+
+
+class WebDriverBackend(AuthBackend):
+    """Selenium-API browsers leased from a warm ``BrowserPool``."""
+
+    def __init__(self):
+        self.browser_pool = BrowserPool(
+            self.create_driver,
+            reset=reset_webdriver,
+            is_healthy=webdriver_is_healthy,
+            dispose=quit_webdriver
+        )
+        atexit.register(self.browser_pool.close)
+
+    def create_driver(self, slot: int):
+        raise NotImplementedError
+
+    @property
+    def max_concurrency(self) -> int:
+        return self.browser_pool.max_size
+
+    def check(self) -> Optional[str]:
+        problem = super().check()
+        if problem is None and check_chrome_installation() is None:
+            problem = 'Chrome/Chromium not found in common locations'
+        return problem
+
+    def warm(self):
+        self.browser_pool.warm()
+
+    def login(self, username: str, password: str) -> Dict:
+        logger.info(f"Starting authentication for user: {username}")
+        try:
+            # Lease a warm browser; it is reset (or relaunched after an error) when the block exits
+            with self.browser_pool.lease(timeout=BROWSER_LEASE_TIMEOUT) as driver:
+                return login_with_driver(driver, username, password)
+        except Exception as e:
+            logger.error(f"Authentication error: {e}")
+            return login_failed(f'Authentication error: {str(e)}')
+
+    def close(self):
+        self.browser_pool.close()
+
+    def stats(self) -> Dict:
+        chrome_path = check_chrome_installation()
+        return dict(super().stats(),
+                    chrome={'installed': chrome_path is not None, 'path': chrome_path},
+                    browser_pool=self.browser_pool.stats())
+
+
+class UndetectedChromeBackend(WebDriverBackend):
+    name = 'undetected'
+    description = 'undetected-chromedriver'
+    requires = ('undetected_chromedriver',)
+
+    def create_driver(self, slot: int):
+        return create_undetected_driver(slot)
+
+
+class SeleniumBackend(WebDriverBackend):
+    name = 'selenium'
+    description = 'Selenium WebDriver'
+    requires = ('selenium',)
+
+    def create_driver(self, slot: int):
+        return create_selenium_driver(slot)
+
+
+class ZendriverBackend(AuthBackend):
+    """
+    zendriver browsers pooled like the WebDriver ones.
+
+    All browser calls run on one ``EventLoopThread``; login job threads
+    block on ``loop.run`` while a coroutine drives their leased browser.
+    """
+
+    name = 'zendriver'
+    description = 'zendriver (Chrome DevTools Protocol)'
+    requires = ('zendriver',)
+
+    def __init__(self):
+        self.loop = EventLoopThread('zendriver-loop')
+        self.browser_pool = BrowserPool(self._launch, reset=self._reset, dispose=self._stop)
+        atexit.register(self.close)
+
+    @property
+    def max_concurrency(self) -> int:
+        return self.browser_pool.max_size
+
+    def _launch(self, slot: int):
+        import zendriver as zd
+
+        headless = detect_headless()
+        logger.info(f"🚀 Initializing Zendriver browser (headless={headless})...")
+        return self.loop.run(zd.start(
+            headless=headless,
+            disable_images=True,
+            disable_javascript=False,  # Keep JS enabled for Cloudflare
+            user_agent=USER_AGENT
+        ))
+
+    def _reset(self, browser):
+        self.loop.run(browser.cookies.clear())
+
+    def _stop(self, browser):
+        result = browser.stop()
+        if inspect.isawaitable(result):
+            self.loop.run(result)
+
+    def warm(self):
+        self.browser_pool.warm()
+
+    def login(self, username: str, password: str) -> Dict:
+        logger.info(f"🔐 Starting authentication for user: {username}")
+        try:
+            with self.browser_pool.lease(timeout=BROWSER_LEASE_TIMEOUT) as browser:
+                return self.loop.run(self._login(browser, username, password), ZENDRIVER_LOGIN_TIMEOUT)
+        except Exception as e:
+            logger.error(f"❌ Authentication error: {e}")
+            return login_failed(f'Authentication error: {str(e)}')
+
+    async def _select_first(self, page, selectors, label: str):
+        for selector in selectors:
+            try:
+                element = await page.select(selector)
+                if element:
+                    logger.info(f"✅ Found {label} with selector: {selector}")
+                    return element
+            except Exception:
+                continue
+        raise Exception(f"Could not find {label}")
+
+    async def _login(self, browser, username: str, password: str) -> Dict:
+        timer = PhaseTimer(logger)
+
+        logger.info("🌐 Navigating to YGG Torrent login page...")
+        with timer.phase('navigate'):
+            page = await browser.get(LOGIN_URL)
+
+        # Wait for the login form or a Cloudflare interstitial
+        form_ready = await wait_for_login_page_async(page, timer)
+
+        if not form_ready and await is_cloudflare_challenge_async(page):
+            logger.info("🛡️ Cloudflare challenge detected, waiting for automatic bypass...")
+            with timer.phase('cloudflare'):
+                form_ready = await wait_for_element_async(page, LOGIN_FORM_SELECTOR, CLOUDFLARE_TIMEOUT)
+
+        if not form_ready:
+            # Debug: Save page content to see what we're working with
+            with open("data/debug_zendriver_page.html", "w", encoding="utf-8") as f:
+                f.write(await page.get_content())
+            logger.info("💾 Page content saved to data/debug_zendriver_page.html for debugging")
+
+        logger.info("🔍 Looking for login form...")
+        username_field = await self._select_first(page, USERNAME_SELECTORS, 'username field')
+        password_field = await self._select_first(page, PASSWORD_SELECTORS, 'password field')
+
+        logger.info("📝 Filling login form...")
+        await username_field.type(username)
+        await password_field.type(password)
+
+        submit_button = await self._select_first(page, SUBMIT_SELECTORS, 'submit button')
+        logger.info("🚀 Submitting login form...")
+        await submit_button.click()
+
+        with timer.phase('login_result'):
+            await wait_for_login_result_async(page)
+        logger.info(timer.summary())
+
+        current_url = await page.get_url()
+        page_title = await page.get_title()
+        logger.info(f"📍 Current URL: {current_url}")
+        logger.info(f"📄 Page title: {page_title}")
+
+        if "login" in current_url.lower() or "yggtorrent" not in page_title.lower():
+            logger.error("❌ Login failed - still on login page")
+            return login_failed('Login failed - still showing login page')
+
+        logger.info("✅ Login successful!")
+        return login_succeeded(await page.get_cookies())
+
+    def close(self):
+        self.browser_pool.close()
+        self.loop.stop()
+
+    def stats(self) -> Dict:
+        return dict(super().stats(), browser_pool=self.browser_pool.stats())
+
+
+class ManualCookieBackend(AuthBackend):
+    """
+    No browser: cookies come from ``ygg_manual_auth.py`` files.
+
+    ``POST /auth/load-cookies`` (or the cookie store's directory watch)
+    picks up a new file.
+    """
+
+    name = 'manual'
+    description = 'manual cookies (python3 ygg_manual_auth.py)'
+    uses_browser = False
+    cookie_patterns = ('manual_cookies_*.json',)
+
+    def login(self, username: str, password: str) -> Dict:
+        return login_failed('The manual backend cannot log in - run python3 ygg_manual_auth.py, '
+                            'then POST /auth/load-cookies')
+
+
+AUTH_BACKENDS = {
+    UndetectedChromeBackend.name: UndetectedChromeBackend,
+    SeleniumBackend.name: SeleniumBackend,
+    ZendriverBackend.name: ZendriverBackend,
+    ManualCookieBackend.name: ManualCookieBackend
+}
+
+
+def create_backend(name: str = None) -> AuthBackend:
+    """
+    Instantiate an auth backend by name (``YGG_AUTH_BACKEND`` when omitted).
+
+    Raises:
+        ValueError: Unknown backend name
+    """
+    name = (name or DEFAULT_AUTH_BACKEND).strip().lower()
+    try:
+        backend_class = AUTH_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown auth backend '{name}' (choose from: {', '.join(AUTH_BACKENDS)})")
+    return backend_class()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Cookie validation for YGG Torrent
+Probes the start of an authenticated page and caches the verdict per cookie set
+"""
+
+import os
+from typing import Dict, Optional, Tuple
+
+from ygg_session_pool import cookie_key
+from ygg_response_cache import ResponseCache, UpstreamError, CACHE_MISS
+
+
+# Seconds a validation result is reused for the same cookie set
+AUTH_CACHE_TTL = float(os.getenv('YGG_AUTH_CACHE_TTL', '60'))
+
+# Distinct cookie sets whose validation result is remembered
+AUTH_CACHE_SIZE = 1024
+
+# Bytes of the page read at most while looking for a marker
+PROBE_MAX_BYTES = 128 * 1024
+
+PROBE_CHUNK_SIZE = 8192
+
+# Only rendered for logged-in users (header user menu), lower-cased UTF-8
+AUTH_MARKERS = (b'logout', 'déconnexion'.encode('utf-8'))
+
+
+def probe_authentication(session, url: str, max_bytes: int = PROBE_MAX_BYTES,
+                         timeout: int = 30) -> Tuple[bool, int]:
+    """
+    Check whether ``session`` is logged in without downloading a whole page.
+
+    The response is streamed (with a ``Range`` hint for servers that honour
+    it) and reading stops at the first logged-in marker or after
+    ``max_bytes``. Chunks are scanned with an overlap so markers split
+    across two chunks are still found.
+
+    Returns:
+        ``(authenticated, status_code)``; ``authenticated`` is False for
+        any non-200/206 answer
+    """
+    headers = {'Range': f"bytes=0-{max_bytes - 1}"}
+    overlap = max(len(marker) for marker in AUTH_MARKERS) - 1
+
+    with session.get(url, timeout=timeout, stream=True, headers=headers) as response:
+        if response.status_code not in (200, 206):
+            return False, response.status_code
+
+        tail = b''
+        read = 0
+        for chunk in response.iter_content(chunk_size=PROBE_CHUNK_SIZE):
+            window = tail + chunk.lower()
+            if any(marker in window for marker in AUTH_MARKERS):
+                return True, response.status_code
+            tail = window[-overlap:]
+            read += len(chunk)
+            if read >= max_bytes:
+                break
+
+        return False, response.status_code
+
+
+class AuthValidator:
+    """
+    Validation results cached per cookie-set hash.
+
+    Hits are a dictionary lookup; concurrent misses for the same cookies
+    share one probe. Answers other than 200/206 (Cloudflare 403, 5xx) and
+    network errors are returned but never cached.
+    """
+
+    def __init__(self, ttl: float = AUTH_CACHE_TTL, max_entries: int = AUTH_CACHE_SIZE,
+                 max_bytes: int = PROBE_MAX_BYTES):
+        self.cache = ResponseCache(ttl=ttl, max_entries=max_entries)
+        self.max_bytes = max_bytes
+
+    def validate(self, session, cookies: Optional[Dict[str, str]], url: str) -> Tuple[bool, int, str, float]:
+        """
+        Validate ``cookies`` (as installed on ``session``) against ``url``.
+
+        Returns:
+            ``(authenticated, status_code, cache_status, age)`` where
+            cache_status is ``HIT``, ``MISS`` or ``COALESCED``
+        """
+        def load():
+            authenticated, status_code = probe_authentication(session, url, self.max_bytes)
+            if status_code not in (200, 206):
+                raise UpstreamError(status_code)
+            return authenticated, status_code
+
+        try:
+            (authenticated, status_code), cache_status, age = self.cache.get_or_load(
+                (cookie_key(cookies), url), load
+            )
+        except UpstreamError as e:
+            return False, e.status_code, CACHE_MISS, 0.0
+        return authenticated, status_code, cache_status, age
+
+    def invalidate(self, cookies: Optional[Dict[str, str]], url: str):
+        """Forget the result for a cookie set (e.g. after a 403 elsewhere)."""
+        self.cache.invalidate((cookie_key(cookies), url))
+
+    def stats(self) -> Dict:
+        return self.cache.stats()
+
+
+# Shared by the API routes and parsers of this process
+auth_validator = AuthValidator()
@@ -19,6 +19,10 @@ from selenium.common.exceptions import TimeoutException, WebDriverException, NoS
 from selenium.webdriver.common.action_chains import ActionChains
 import random
 
+from ygg_readiness import (PhaseTimer, DEFAULT_POLL_INTERVAL, LOGIN_FORM_SELECTOR,
+                           is_cloudflare_challenge, has_clearance_cookie, wait_for_cloudflare,
+                           wait_for_element, wait_for_login_result)
+
 
 def setup_logging():
     """Setup logging."""
@@ -122,56 +126,35 @@ class YGGAutoBypass:
         """Automatically bypass Cloudflare challenge."""
         self.logger.info("🛡️ Attempting to bypass Cloudflare automatically...")
         
-        # Wait for page to load
-        time.sleep(3)
-        
-        # Check for Cloudflare challenge
-        cloudflare_indicators = [
-            "just a moment",
-            "checking your browser",
-            "please wait",
-            "ddos protection",
-            "cloudflare",
-            "cf-browser-verification"
-        ]
-        
         max_attempts = 10
         attempt = 0
         
         while attempt < max_attempts:
             try:
-                page_source = self.driver.page_source.lower()
-                title = (self.driver.title or "").lower()
+                # Title and cf_clearance checks are cheap compared to reading page_source
+                if not is_cloudflare_challenge(self.driver) or has_clearance_cookie(self.driver):
+                    if attempt == 0:
+                        self.logger.info("✅ No Cloudflare challenge detected")
+                    else:
+                        self.logger.info("✅ Cloudflare challenge completed automatically!")
+                    return True
                 
-                is_cloudflare = any(indicator in page_source or indicator in title for indicator in cloudflare_indicators)
+                self.logger.info(f"⏳ Cloudflare challenge detected (attempt {attempt + 1}/{max_attempts})...")
                 
-                if is_cloudflare:
-                    self.logger.info(f"⏳ Cloudflare challenge detected (attempt {attempt + 1}/{max_attempts})...")
-                    
-                    # Simulate human behavior
-                    self.human_like_behavior()
-                    
-                    # Wait for challenge to complete
-                    time.sleep(random.uniform(5, 10))
-                    
-                    # Check if challenge completed
-                    new_page_source = self.driver.page_source.lower()
-                    new_title = (self.driver.title or "").lower()
-                    still_cloudflare = any(indicator in new_page_source or indicator in new_title for indicator in cloudflare_indicators)
-                    
-                    if not still_cloudflare:
-                        self.logger.info("✅ Cloudflare challenge completed automatically!")
-                        return True
-                    
-                    attempt += 1
-                else:
-                    self.logger.info("✅ No Cloudflare challenge detected")
+                # Simulate human behavior
+                self.human_like_behavior()
+                
+                # Return as soon as the challenge clears instead of sleeping a fixed time
+                if wait_for_cloudflare(self.driver, timeout=10):
+                    self.logger.info("✅ Cloudflare challenge completed automatically!")
                     return True
+                
+                attempt += 1
                     
             except Exception as e:
                 self.logger.warning(f"⚠️ Error checking Cloudflare status: {e}")
                 attempt += 1
-                time.sleep(2)
+                time.sleep(DEFAULT_POLL_INTERVAL)
         
         self.logger.warning("⚠️ Could not automatically bypass Cloudflare")
         return False
@@ -189,7 +172,6 @@ class YGGAutoBypass:
         
         # Navigate to YGG Torrent
         self.driver.get("https://www.yggtorrent.top")
-        time.sleep(3)
         
         # Try to bypass Cloudflare
         if not self.bypass_cloudflare_automatically():
@@ -198,7 +180,6 @@ class YGGAutoBypass:
         # Navigate to login page
         login_url = "https://www.yggtorrent.top/auth/login"
         self.driver.get(login_url)
-        time.sleep(3)
         
         # Try to bypass Cloudflare again
         self.bypass_cloudflare_automatically()
@@ -210,7 +191,8 @@ class YGGAutoBypass:
         self.logger.info("🔍 Looking for login form...")
         
         # Wait for form to load
-        time.sleep(2)
+        if not wait_for_element(self.driver, LOGIN_FORM_SELECTOR):
+            self.logger.warning("⚠️ Login form not detected before the deadline")
         
         # Try to find username field
         username_field = None
@@ -350,7 +332,7 @@ class YGGAutoBypass:
         submit_button.click()
         
         # Wait for login to process
-        time.sleep(5)
+        wait_for_login_result(self.driver, "https://www.yggtorrent.top/auth/login")
         
         return True
     
@@ -398,19 +380,27 @@ class YGGAutoBypass:
         try:
             self.logger.info("🚀 Starting automatic authentication...")
             
+            timer = PhaseTimer(self.logger)
+            
             # Create stealth driver
-            self.create_stealth_driver()
+            with timer.phase('browser_start'):
+                self.create_stealth_driver()
             
             # Navigate to login
-            self.navigate_to_login()
+            with timer.phase('navigate'):
+                self.navigate_to_login()
             
             # Find and fill form
-            if not self.find_and_fill_form(username, password):
-                return False, {}
+            with timer.phase('fill_form'):
+                if not self.find_and_fill_form(username, password):
+                    return False, {}
             
             # Submit form
-            if not self.submit_form():
-                return False, {}
+            with timer.phase('submit'):
+                if not self.submit_form():
+                    return False, {}
+            
+            self.logger.info(timer.summary())
             
             # Check login success
             if not self.check_login_success():
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+YGG Parser Micro-Benchmarks
+Measures hot-path costs against the sample data saved in data/
+"""
+
+import sys
+import glob
+import json
+import time
+import logging
+import timeit
+import argparse
+import xml.etree.ElementTree as ET
+
+from ygg_parser import YGGParserWithDownloads, RSS_NAMESPACES, extract_torrent_info
+from ygg_json import JSON_SERIALIZERS, available_backends
+
+
+DEFAULT_RSS_FILE = 'data/rss_debug_response.xml'
+DEFAULT_JSON_FILES = 'data/*.json'
+
+
+def legacy_extract_torrent_info(parser, item):
+    """Item extraction as it was done before the single-pass table (one .//tag search per field)."""
+    namespaces = RSS_NAMESPACES
+    return {
+        'title': parser._get_text(item, 'title'),
+        'description': parser._get_text(item, 'description'),
+        'link': parser._get_text(item, 'link'),
+        'guid': parser._get_text(item, 'guid'),
+        'torrent_link': parser._get_text(item, 'torrent:link', namespaces),
+        'info_hash': parser._get_text(item, 'torrent:infoHash', namespaces),
+        'size': parser._get_text(item, 'torrent:size', namespaces),
+        'seeds': parser._get_text(item, 'torrent:seeds', namespaces),
+        'peers': parser._get_text(item, 'torrent:peers', namespaces),
+        'pub_date': parser._get_text(item, 'pubDate'),
+        'category': parser._get_text(item, 'category'),
+        'parsed_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'downloaded': False,
+        'download_path': None
+    }
+
+
+def report(name, timings, number, units):
+    """Print the best per-unit timing of a benchmark."""
+    best = min(timings) / number
+    print(f"  {name:<28} {best / units * 1e6:10.2f} µs/item   ({best * 1e3:.2f} ms total)")
+    return best
+
+
+def bench_parse(rss_file, repeat, number):
+    """Compare legacy and single-pass item extraction on a saved feed."""
+    parser = YGGParserWithDownloads()
+    # Keep per-feed log lines out of the timings output
+    parser.logger.setLevel(logging.WARNING)
+
+    with open(rss_file, 'rb') as f:
+        content = f.read()
+
+    items = ET.fromstring(content).findall('.//item')
+    if not items:
+        print(f"❌ No items found in {rss_file}")
+        return False
+
+    print(f"\n📊 Item extraction: {len(items)} items from {rss_file} (best of {repeat} x {number})")
+
+    legacy = report(
+        'legacy .//tag lookups',
+        timeit.repeat(lambda: [legacy_extract_torrent_info(parser, i) for i in items],
+                      repeat=repeat, number=number),
+        number, len(items)
+    )
+    single = report(
+        'single-pass tag table',
+        timeit.repeat(lambda: [extract_torrent_info(i) for i in items],
+                      repeat=repeat, number=number),
+        number, len(items)
+    )
+    print(f"  {'speedup':<28} {legacy / single:10.2f}x")
+
+    chunks = [content[i:i + 16384] for i in range(0, len(content), 16384)]
+
+    print(f"\n📊 Full feed parse: {len(content)} bytes")
+    report(
+        'parse_rss_feed (tree)',
+        timeit.repeat(lambda: parser.parse_rss_feed(content), repeat=repeat, number=number),
+        number, len(items)
+    )
+    report(
+        'iter_parse_rss (streaming)',
+        timeit.repeat(lambda: list(parser.iter_parse_rss(chunks)), repeat=repeat, number=number),
+        number, len(items)
+    )
+    return True
+
+
+def bench_serialize(pattern, repeat, number):
+    """Compare the ygg_json backends with the previous ``json.dump`` calls on saved snapshots."""
+    documents = []
+    for filename in sorted(glob.glob(pattern)):
+        with open(filename, 'r', encoding='utf-8') as f:
+            documents.append(json.load(f))
+    if not documents:
+        print(f"❌ No JSON files match {pattern}")
+        return False
+
+    size = sum(len(json.dumps(document, indent=2, ensure_ascii=False).encode('utf-8')) for document in documents)
+    print(f"\n📊 JSON encoding: {len(documents)} files, {size / 1024:.0f} KB (best of {repeat} x {number})")
+    print(f"  installed backends: {', '.join(available_backends())}")
+
+    def per_document(name, encode):
+        return report(name, timeit.repeat(lambda: [encode(d) for d in documents], repeat=repeat, number=number),
+                      number, len(documents))
+
+    def speedups(baseline, timings):
+        for name, best in timings.items():
+            print(f"  {'speedup ' + name:<28} {baseline / best:10.2f}x")
+
+    print("\n  Snapshots (save_torrents_to_json)")
+    baseline = per_document('json.dumps indent=2',
+                            lambda d: json.dumps(d, indent=2, ensure_ascii=False).encode('utf-8'))
+    timings = {}
+    for name in available_backends():
+        serializer = JSON_SERIALIZERS[name][0]()
+        timings[f'{name} indent'] = per_document(f'{name} indent', lambda d: serializer.dumps(d))
+        timings[f'{name} compact'] = per_document(f'{name} compact', lambda d: serializer.dumps(d, compact=True))
+    speedups(baseline, timings)
+
+    print("\n  API responses (jsonify: sorted keys, compact)")
+    baseline = per_document('json.dumps sort_keys', lambda d: json.dumps(
+        d, separators=(',', ':'), sort_keys=True).encode('utf-8'))
+    timings = {}
+    for name in available_backends():
+        serializer = JSON_SERIALIZERS[name][0]()
+        timings[name] = per_document(name, lambda d: serializer.dumps(d, compact=True, sort_keys=True))
+    speedups(baseline, timings)
+
+    print("\n  Snapshot reads (load_torrents_from_json)")
+    encoded = [json.dumps(d).encode('utf-8') for d in documents]
+    baseline = report('json.loads', timeit.repeat(lambda: [json.loads(e) for e in encoded],
+                                                  repeat=repeat, number=number), number, len(documents))
+    timings = {}
+    for name in available_backends():
+        serializer = JSON_SERIALIZERS[name][0]()
+        timings[name] = report(name, timeit.repeat(lambda: [serializer.loads(e) for e in encoded],
+                                                   repeat=repeat, number=number), number, len(documents))
+    speedups(baseline, timings)
+    return True
+
+
+def main():
+    """Run the selected benchmark."""
+    parser = argparse.ArgumentParser(description='YGG Parser micro-benchmarks')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    parse_cmd = subparsers.add_parser('parse', help='Per-item RSS parse cost')
+    parse_cmd.add_argument('--file', default=DEFAULT_RSS_FILE, help='Saved RSS feed to parse')
+    parse_cmd.add_argument('--repeat', type=int, default=5, help='Number of timing rounds')
+    parse_cmd.add_argument('--number', type=int, default=20, help='Iterations per round')
+
+    serialize_cmd = subparsers.add_parser('serialize', help='JSON encode/decode cost per backend')
+    serialize_cmd.add_argument('--files', default=DEFAULT_JSON_FILES, help='Glob of JSON files to encode')
+    serialize_cmd.add_argument('--repeat', type=int, default=5, help='Number of timing rounds')
+    serialize_cmd.add_argument('--number', type=int, default=20, help='Iterations per round')
+
+    args = parser.parse_args()
+
+    print("🚀 YGG Parser Benchmarks")
+    print("=" * 50)
+
+    if args.benchmark == 'parse':
+        ok = bench_parse(args.file, args.repeat, args.number)
+    elif args.benchmark == 'serialize':
+        ok = bench_serialize(args.files, args.repeat, args.number)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
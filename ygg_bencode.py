@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Bencode validation and metadata extraction for .torrent files
+Works on bytes, memoryviews and mmaps without copying the file; the info-hash is hashed from the raw info span
+"""
+
+import re
+import mmap
+import hashlib
+from typing import Any, Dict, Optional, Tuple, Union
+
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# Nesting accepted before a file is rejected (real torrents use 4-5 levels)
+MAX_DEPTH = 64
+
+# SHA-1 digest per piece in the ``pieces`` string
+PIECE_HASH_SIZE = 20
+
+_LIST, _DICT, _END = b'l'[0], b'd'[0], b'e'[0]
+
+# One token per match, run directly on the buffer: string length prefix, integer, or l/d/e
+_TOKEN_RE = re.compile(rb'(0|[1-9][0-9]*):|i(0|-?[1-9][0-9]*)e|[lde]')
+_STRING_RE = re.compile(rb'(0|[1-9][0-9]*):')
+_INTEGER_RE = re.compile(rb'i(0|-?[1-9][0-9]*)e')
+
+
+class BencodeError(ValueError):
+    """The data is not valid bencode or not a usable .torrent file."""
+
+
+class TorrentMetadata:
+    """Ground-truth facts read from a .torrent file."""
+
+    __slots__ = ('info_hash', 'name', 'total_size', 'file_count', 'piece_length',
+                 'piece_count', 'private', 'announce', 'torrent_size')
+
+    def __init__(self, info_hash: str, name: str, total_size: int, file_count: int,
+                 piece_length: int, piece_count: int, private: bool = False,
+                 announce: Optional[str] = None, torrent_size: int = 0):
+        self.info_hash = info_hash
+        self.name = name
+        self.total_size = total_size
+        self.file_count = file_count
+        self.piece_length = piece_length
+        self.piece_count = piece_count
+        self.private = private
+        self.announce = announce
+        self.torrent_size = torrent_size
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return (f"TorrentMetadata(info_hash={self.info_hash!r}, name={self.name!r}, "
+                f"total_size={self.total_size}, file_count={self.file_count})")
+
+
+def _error(mv: memoryview, pos: int, expected: str = 'a bencoded value') -> BencodeError:
+    if pos >= len(mv):
+        return BencodeError("truncated bencode data")
+    return BencodeError(f"expected {expected} at offset {pos}, found {bytes(mv[pos:pos + 10])!r}")
+
+
+def _string_span(mv: memoryview, pos: int) -> Tuple[int, int]:
+    """Return the (start, end) of the byte string encoded at ``pos``."""
+    match = _STRING_RE.match(mv, pos)
+    if match is None:
+        raise _error(mv, pos, 'a string')
+    start = match.end()
+    end = start + int(match.group(1))
+    if end > len(mv):
+        raise BencodeError(f"string at offset {pos} runs past the end of the data")
+    return start, end
+
+
+def _read_string(mv: memoryview, pos: int) -> Tuple[bytes, int]:
+    start, end = _string_span(mv, pos)
+    return bytes(mv[start:end]), end
+
+
+def _read_int(mv: memoryview, pos: int) -> Tuple[int, int]:
+    match = _INTEGER_RE.match(mv, pos)
+    if match is None:
+        raise _error(mv, pos, 'an integer')
+    return int(match.group(1)), match.end()
+
+
+def _skip(mv: memoryview, pos: int, depth: int = 0) -> int:
+    """
+    Validate the value at ``pos`` without building it; return the position after it.
+
+    Iterative, one regex match per token. ``open_containers`` holds -1 for
+    a list and the number of items read so far for a dictionary, whose
+    even positions must be string keys.
+    """
+    match_token = _TOKEN_RE.match
+    size = len(mv)
+    open_containers = []
+    while True:
+        match = match_token(mv, pos)
+        if match is None:
+            raise _error(mv, pos)
+
+        if match.lastindex == 1:
+            pos = match.end() + int(match.group(1))
+            if pos > size:
+                raise BencodeError(f"string at offset {match.start()} runs past the end of the data")
+        else:
+            token = mv[pos]
+            top = open_containers[-1] if open_containers else -1
+            if top >= 0 and not top % 2 and token != _END:
+                raise BencodeError(f"dictionary key at offset {pos} is not a string")
+
+            if match.lastindex == 2:
+                pos = match.end()
+            elif token == _END:
+                if not open_containers:
+                    raise _error(mv, pos)
+                if top >= 0 and top % 2:
+                    raise BencodeError(f"dictionary key without a value before offset {pos}")
+                open_containers.pop()
+                pos += 1
+            else:
+                if depth + len(open_containers) >= MAX_DEPTH:
+                    raise BencodeError(f"nesting deeper than {MAX_DEPTH} at offset {pos}")
+                open_containers.append(-1 if token == _LIST else 0)
+                pos += 1
+                continue
+
+        if not open_containers:
+            return pos
+        if open_containers[-1] >= 0:
+            open_containers[-1] += 1
+
+
+def _decode(mv: memoryview, pos: int, depth: int = 0) -> Tuple[Any, int]:
+    if depth > MAX_DEPTH:
+        raise BencodeError(f"nesting deeper than {MAX_DEPTH} at offset {pos}")
+
+    match = _TOKEN_RE.match(mv, pos)
+    if match is None:
+        raise _error(mv, pos)
+    if match.lastindex == 1:
+        return _read_string(mv, pos)
+    if match.lastindex == 2:
+        return int(match.group(2)), match.end()
+
+    token = mv[pos]
+    if token == _LIST:
+        items, pos = [], pos + 1
+        while mv[pos] != _END:
+            item, pos = _decode(mv, pos, depth + 1)
+            items.append(item)
+        return items, pos + 1
+    if token == _DICT:
+        items, pos = {}, pos + 1
+        while mv[pos] != _END:
+            key, pos = _read_string(mv, pos)
+            items[key], pos = _decode(mv, pos, depth + 1)
+        return items, pos + 1
+    raise _error(mv, pos)
+
+
+def _dict_items(mv: memoryview, pos: int):
+    """Yield ``(key, value_position)`` of the dictionary at ``pos``; the caller advances past each value."""
+    if mv[pos] != _DICT:
+        raise _error(mv, pos, 'a dictionary')
+    pos += 1
+    while mv[pos] != _END:
+        key, pos = _read_string(mv, pos)
+        pos = yield key, pos
+    yield None, pos + 1
+
+
+def decode(data: Buffer) -> Any:
+    """
+    Decode a complete bencoded value (strings come back as ``bytes``).
+
+    Raises:
+        BencodeError: On malformed, truncated or trailing data
+    """
+    with memoryview(data) as mv:
+        try:
+            value, end = _decode(mv, 0)
+        except IndexError:
+            raise BencodeError("truncated bencode data") from None
+        if end != len(mv):
+            raise BencodeError(f"{len(mv) - end} trailing bytes after the bencoded value")
+        return value
+
+
+def _parse_files(mv: memoryview, pos: int) -> Tuple[int, int, int]:
+    """Walk a multi-file ``files`` list; return (total size, file count, end position)."""
+    if mv[pos] != _LIST:
+        raise _error(mv, pos, "a list of files")
+    total_size = file_count = 0
+    pos += 1
+    while mv[pos] != _END:
+        length = None
+        items = _dict_items(mv, pos)
+        key, value_pos = next(items)
+        while key is not None:
+            if key == b'length':
+                length, end = _read_int(mv, value_pos)
+            else:
+                end = _skip(mv, value_pos, 2)
+            key, value_pos = items.send(end)
+        pos = value_pos
+
+        if length is None or length < 0:
+            raise BencodeError(f"file entry {file_count} has no valid length")
+        total_size += length
+        file_count += 1
+    return total_size, file_count, pos + 1
+
+
+def _parse_info(mv: memoryview, pos: int) -> Dict[str, Any]:
+    info = {'pieces': None}
+    items = _dict_items(mv, pos)
+    key, value_pos = next(items)
+    while key is not None:
+        if key == b'length':
+            info['length'], end = _read_int(mv, value_pos)
+        elif key == b'piece length':
+            info['piece_length'], end = _read_int(mv, value_pos)
+        elif key == b'private':
+            info['private'], end = _read_int(mv, value_pos)
+        elif key == b'name':
+            info['name'], end = _read_string(mv, value_pos)
+        elif key == b'pieces':
+            start, end = _string_span(mv, value_pos)
+            info['pieces'] = end - start
+        elif key == b'files':
+            info['files_size'], info['file_count'], end = _parse_files(mv, value_pos)
+        else:
+            end = _skip(mv, value_pos, 1)
+        key, value_pos = items.send(end)
+    info['end'] = value_pos
+    return info
+
+
+def parse_torrent(data: Buffer) -> TorrentMetadata:
+    """
+    Validate a .torrent file and extract its metadata in one pass.
+
+    The info-hash is the SHA-1 of the ``info`` dictionary exactly as it
+    appears in the file, so it matches what clients and trackers compute
+    even for files with non-canonical encoding. Byte strings that are not
+    needed (the piece hashes) are only measured, never copied.
+
+    Args:
+        data: The whole file as bytes, a memoryview or an mmap
+
+    Returns:
+        The torrent's metadata
+
+    Raises:
+        BencodeError: If the data is not a valid single- or multi-file torrent
+    """
+    with memoryview(data) as mv:
+        if len(mv) == 0:
+            raise BencodeError("empty data")
+        try:
+            info, info_span, announce = None, None, None
+            items = _dict_items(mv, 0)
+            key, value_pos = next(items)
+            while key is not None:
+                if key == b'info':
+                    info = _parse_info(mv, value_pos)
+                    info_span = (value_pos, info['end'])
+                    end = info['end']
+                elif key == b'announce':
+                    announce, end = _read_string(mv, value_pos)
+                else:
+                    end = _skip(mv, value_pos, 1)
+                key, value_pos = items.send(end)
+        except IndexError:
+            raise BencodeError("truncated bencode data") from None
+
+        if value_pos != len(mv):
+            raise BencodeError(f"{len(mv) - value_pos} trailing bytes after the torrent dictionary")
+        if info is None:
+            raise BencodeError("no info dictionary")
+
+        info_hash = hashlib.sha1(mv[info_span[0]:info_span[1]]).hexdigest()
+        torrent_size = len(mv)
+
+    if 'file_count' in info:
+        total_size, file_count = info['files_size'], info['file_count']
+    elif info.get('length', -1) >= 0:
+        total_size, file_count = info['length'], 1
+    else:
+        raise BencodeError("info dictionary has neither 'length' nor 'files'")
+
+    piece_length = info.get('piece_length', 0)
+    if piece_length <= 0:
+        raise BencodeError("missing or invalid 'piece length'")
+    if info['pieces'] is None or info['pieces'] % PIECE_HASH_SIZE:
+        raise BencodeError("missing or malformed 'pieces'")
+    piece_count = info['pieces'] // PIECE_HASH_SIZE
+    if piece_count != -(-total_size // piece_length):
+        raise BencodeError(f"{piece_count} piece hashes for {total_size} bytes of {piece_length}-byte pieces")
+    if 'name' not in info:
+        raise BencodeError("info dictionary has no 'name'")
+
+    return TorrentMetadata(
+        info_hash=info_hash,
+        name=info['name'].decode('utf-8', 'replace'),
+        total_size=total_size,
+        file_count=file_count,
+        piece_length=piece_length,
+        piece_count=piece_count,
+        private=info.get('private') == 1,
+        announce=announce.decode('utf-8', 'replace') if announce is not None else None,
+        torrent_size=torrent_size
+    )
+
+
+def read_torrent_file(path: str) -> TorrentMetadata:
+    """Parse a .torrent file through an mmap (the file is never read into memory as a whole)."""
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            raise BencodeError("empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            return parse_torrent(view)
+
+
+def verify_torrent_file(path: str) -> Optional[TorrentMetadata]:
+    """Return the metadata of a valid .torrent file, or None if it is missing or invalid."""
+    try:
+        return read_torrent_file(path)
+    except (OSError, BencodeError):
+        return None
+
+
+def verify_torrent_data(data: Buffer) -> Optional[TorrentMetadata]:
+    """Return the metadata of a downloaded .torrent body, or None if it is not a valid torrent."""
+    try:
+        return parse_torrent(data)
+    except BencodeError:
+        return None
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Warm pool of browser instances for YGG Torrent authentication
+Browsers are launched once and leased per login instead of started and quit every time
+"""
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Browsers kept alive at once
+DEFAULT_POOL_SIZE = int(os.getenv('YGG_BROWSER_POOL_SIZE', '2'))
+
+# Logins served by one browser before it is quit and relaunched
+DEFAULT_MAX_USES = int(os.getenv('YGG_BROWSER_MAX_USES', '20'))
+
+# First remote debugging port; slot N uses BASE_DEBUG_PORT + N
+BASE_DEBUG_PORT = 9222
+
+logger = logging.getLogger(__name__)
+
+
+class PooledBrowser:
+    """A pooled browser plus its bookkeeping."""
+
+    __slots__ = ('browser', 'slot', 'uses', 'created_at')
+
+    def __init__(self, browser: Any, slot: int):
+        self.browser = browser
+        self.slot = slot
+        self.uses = 0
+        self.created_at = time.time()
+
+
+class BrowserPool:
+    """
+    Fixed-size pool of launched browsers leased one login at a time.
+
+    The pool is agnostic of the browser library: ``factory(slot)`` launches a
+    browser (``slot`` is unique among live browsers, e.g. to derive a free
+    remote debugging port), ``reset`` wipes cookies/storage after each lease,
+    ``is_healthy`` probes a browser before it is handed out again and
+    ``dispose`` quits it. Unhealthy browsers, browsers whose lease raised
+    and browsers that reached ``max_uses`` are disposed of and relaunched on
+    demand.
+    """
+
+    def __init__(self, factory: Callable[[int], Any],
+                 reset: Callable[[Any], None] = None,
+                 is_healthy: Callable[[Any], bool] = None,
+                 dispose: Callable[[Any], None] = None,
+                 max_size: int = DEFAULT_POOL_SIZE,
+                 max_uses: int = DEFAULT_MAX_USES):
+        self.factory = factory
+        self.reset = reset
+        self.is_healthy = is_healthy
+        self.dispose = dispose
+        self.max_size = max(1, max_size)
+        self.max_uses = max_uses
+
+        self._idle: List[PooledBrowser] = []
+        self._free_slots = list(range(self.max_size))
+        self._condition = threading.Condition()
+        self._closed = False
+        self._launched = 0
+        self._recycled = 0
+        self._leases = 0
+
+    def _launch(self, slot: int) -> PooledBrowser:
+        started = time.time()
+        try:
+            browser = self.factory(slot)
+        except Exception:
+            with self._condition:
+                self._free_slots.append(slot)
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._launched += 1
+        logger.info(f"🌐 Browser launched in slot {slot} ({time.time() - started:.1f}s)")
+        return PooledBrowser(browser, slot)
+
+    def _discard(self, pooled: PooledBrowser):
+        try:
+            if self.dispose:
+                self.dispose(pooled.browser)
+        except Exception as e:
+            logger.warning(f"⚠ Error closing browser in slot {pooled.slot}: {e}")
+        finally:
+            with self._condition:
+                self._free_slots.append(pooled.slot)
+                self._recycled += 1
+                self._condition.notify()
+
+    def _healthy(self, pooled: PooledBrowser) -> bool:
+        if not self.is_healthy:
+            return True
+        try:
+            return bool(self.is_healthy(pooled.browser))
+        except Exception:
+            return False
+
+    def _acquire(self, timeout: Optional[float]) -> PooledBrowser:
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Browser pool is closed")
+                    if self._idle:
+                        pooled, slot = self._idle.pop(), None
+                        break
+                    if self._free_slots:
+                        pooled, slot = None, self._free_slots.pop(0)
+                        break
+
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("No browser available in the pool")
+                    self._condition.wait(remaining)
+
+            if pooled is None:
+                return self._launch(slot)
+            if self._healthy(pooled):
+                return pooled
+
+            logger.warning(f"⚠ Browser in slot {pooled.slot} failed its health check, relaunching")
+            self._discard(pooled)
+
+    def _release(self, pooled: PooledBrowser, failed: bool):
+        pooled.uses += 1
+
+        if failed or pooled.uses >= self.max_uses or self._closed:
+            self._discard(pooled)
+            return
+
+        try:
+            if self.reset:
+                self.reset(pooled.browser)
+        except Exception as e:
+            logger.warning(f"⚠ Could not reset browser in slot {pooled.slot}: {e}")
+            self._discard(pooled)
+            return
+
+        with self._condition:
+            self._idle.append(pooled)
+            self._condition.notify()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """
+        Borrow a browser for the duration of a ``with`` block.
+
+        Args:
+            timeout: Seconds to wait for a free browser, None to wait forever
+
+        Yields:
+            A launched browser with no cookies or storage from earlier leases
+        """
+        pooled = self._acquire(timeout)
+        with self._condition:
+            self._leases += 1
+
+        failed = False
+        try:
+            yield pooled.browser
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._release(pooled, failed)
+
+    def warm(self, count: int = None):
+        """Launch browsers ahead of the first login (up to ``count`` or the pool size)."""
+        count = self.max_size if count is None else min(count, self.max_size)
+        launched = []
+        try:
+            for _ in range(count):
+                with self._condition:
+                    if not self._free_slots or self._closed:
+                        break
+                    slot = self._free_slots.pop(0)
+                launched.append(self._launch(slot))
+        except Exception as e:
+            logger.error(f"❌ Browser pool warm-up failed: {e}")
+        finally:
+            with self._condition:
+                self._idle.extend(launched)
+                self._condition.notify_all()
+
+    def close(self):
+        """Quit idle browsers; leased ones are quit when returned."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+
+    def stats(self) -> Dict:
+        """Pool occupancy and counters for health endpoints."""
+        with self._condition:
+            return {
+                'max_size': self.max_size,
+                'idle': len(self._idle),
+                'leased': self.max_size - len(self._idle) - len(self._free_slots),
+                'launched': self._launched,
+                'recycled': self._recycled,
+                'leases': self._leases
+            }
+
+
+def reset_webdriver(driver):
+    """Clear cookies and web storage of a Selenium / undetected-chromedriver driver."""
+    driver.delete_all_cookies()
+    try:
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    except Exception:
+        # about:blank and error pages have no storage
+        pass
+    driver.get('about:blank')
+
+
+def webdriver_is_healthy(driver) -> bool:
+    """A driver is healthy when its browser still answers WebDriver commands."""
+    return bool(driver.window_handles)
+
+
+def quit_webdriver(driver):
+    """Quit a Selenium / undetected-chromedriver driver."""
+    driver.quit()
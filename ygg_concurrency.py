@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Adaptive (AIMD) concurrency limit for batch downloads
+Raises the number of in-flight requests while they stay fast and error-free, halves it when the tracker pushes back
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+
+# Bounds of the in-flight download limit (and the worker threads of a batch)
+DOWNLOAD_MIN_CONCURRENCY = int(os.getenv('YGG_DOWNLOAD_MIN_CONCURRENCY', '1'))
+DOWNLOAD_MAX_CONCURRENCY = int(os.getenv('YGG_DOWNLOAD_MAX_CONCURRENCY', '16'))
+
+# Limit a new controller starts from
+DOWNLOAD_INITIAL_CONCURRENCY = 2
+
+# Latency above this multiple of the baseline stops increases (the tracker is queueing)
+LATENCY_TOLERANCE = 2.0
+
+# Share of failed requests among the last ERROR_WINDOW that counts as overload
+ERROR_RATE_LIMIT = 0.2
+ERROR_WINDOW = 20
+
+# Multiplicative decrease on overload
+BACKOFF_FACTOR = 0.5
+
+# Seconds of completions the throughput metric is averaged over
+THROUGHPUT_WINDOW = 60.0
+
+# Request outcomes reported to the controller
+SUCCESS, ERROR, OVERLOAD = 'success', 'error', 'overload'
+
+logger = logging.getLogger(__name__)
+
+
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease limit on concurrent requests.
+
+    Every request holds a slot. A fast success, with the limit actually in
+    use, adds ``1 / limit``, so the limit grows by one per round of
+    ``limit`` requests. An overload (429, 5xx, timeout, Cloudflare
+    challenge) or an error rate above ``ERROR_RATE_LIMIT`` multiplies it
+    by ``BACKOFF_FACTOR``; only requests sent after the last decrease
+    count, so one burst of failures halves the limit once. Slow successes
+    (latency above ``LATENCY_TOLERANCE`` times the baseline) hold the
+    limit where it is.
+    """
+
+    def __init__(self, initial: int = DOWNLOAD_INITIAL_CONCURRENCY,
+                 min_limit: int = DOWNLOAD_MIN_CONCURRENCY,
+                 max_limit: int = DOWNLOAD_MAX_CONCURRENCY,
+                 latency_tolerance: float = LATENCY_TOLERANCE,
+                 error_rate_limit: float = ERROR_RATE_LIMIT,
+                 backoff_factor: float = BACKOFF_FACTOR):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_tolerance = latency_tolerance
+        self.error_rate_limit = error_rate_limit
+        self.backoff_factor = backoff_factor
+
+        self._limit = float(min(self.max_limit, max(self.min_limit, initial)))
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+        self._latency = None
+        self._baseline = None
+        self._last_decrease = 0.0
+        self._outcomes = deque(maxlen=ERROR_WINDOW)
+        self._completions = deque()
+        self._started = None
+        self._counts = {SUCCESS: 0, ERROR: 0, OVERLOAD: 0, 'increases': 0, 'decreases': 0}
+        self._peak = int(self._limit)
+
+    @property
+    def limit(self) -> int:
+        """Requests currently allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self):
+        """Block until a request may start and take its slot."""
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+            if self._started is None:
+                self._started = time.monotonic()
+
+    def release(self, latency: Optional[float], outcome: str = SUCCESS):
+        """
+        Free a slot and adjust the limit from the request's outcome.
+
+        Args:
+            latency: Seconds the request took (None if it never reached the tracker)
+            outcome: ``SUCCESS``, ``ERROR`` or ``OVERLOAD``
+        """
+        with self._condition:
+            saturated = self._in_flight >= int(self._limit)
+            self._in_flight -= 1
+            now = time.monotonic()
+            self._counts[outcome] += 1
+            self._outcomes.append(outcome != SUCCESS)
+
+            if outcome == SUCCESS:
+                self._completions.append(now)
+                if latency is not None:
+                    self._observe_latency(latency)
+
+            # Requests sent before the last decrease saw the old limit; their failures are already accounted for
+            fresh = latency is None or now - latency >= self._last_decrease
+            error_rate = sum(self._outcomes) / len(self._outcomes)
+            if outcome == OVERLOAD:
+                if fresh:
+                    self._decrease(now, 'overload')
+            elif outcome == ERROR and fresh and len(self._outcomes) >= ERROR_WINDOW // 2 \
+                    and error_rate > self.error_rate_limit:
+                self._decrease(now, f"{error_rate:.0%} errors")
+            elif outcome == SUCCESS and saturated and self._healthy():
+                self._increase()
+
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, classify: Callable[[BaseException], str] = None) -> Iterator[None]:
+        """
+        Hold a slot for the duration of one request and report how it went.
+
+        Exceptions are classified with ``classify`` (default: ``ERROR``) and re-raised.
+        """
+        self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self.release(time.monotonic() - started, classify(e) if classify else ERROR)
+            raise
+        self.release(time.monotonic() - started, SUCCESS)
+
+    def _observe_latency(self, latency: float):
+        # Smoothed latency; the baseline follows its lows and drifts up slowly if the tracker gets slower for good
+        self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+        if self._baseline is None or self._latency < self._baseline:
+            self._baseline = self._latency
+        else:
+            self._baseline += (self._latency - self._baseline) * 0.01
+
+    def _healthy(self) -> bool:
+        return self._latency is None or self._latency <= self._baseline * self.latency_tolerance
+
+    def _increase(self):
+        before = int(self._limit)
+        self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+        if int(self._limit) > before:
+            self._counts['increases'] += 1
+            self._peak = max(self._peak, int(self._limit))
+            logger.info(f"📈 Download concurrency {before} → {int(self._limit)}")
+
+    def _decrease(self, now: float, reason: str):
+        before = int(self._limit)
+        self._limit = max(self.min_limit, self._limit * self.backoff_factor)
+        self._last_decrease = now
+        self._outcomes.clear()
+        if int(self._limit) < before:
+            self._counts['decreases'] += 1
+            logger.warning(f"📉 Download concurrency {before} → {int(self._limit)} ({reason})")
+
+    def metrics(self) -> Dict:
+        """Current limit, in-flight requests, throughput and latency, for logs and stats."""
+        with self._condition:
+            now = time.monotonic()
+            while self._completions and now - self._completions[0] > THROUGHPUT_WINDOW:
+                self._completions.popleft()
+            elapsed = min(THROUGHPUT_WINDOW, now - self._started) if self._started is not None else 0.0
+            return {
+                'concurrency': int(self._limit),
+                'in_flight': self._in_flight,
+                'peak_concurrency': self._peak,
+                'throughput_per_second': round(len(self._completions) / elapsed, 3) if elapsed > 0 else 0.0,
+                'latency_ms': round(self._latency * 1000, 1) if self._latency is not None else None,
+                'baseline_latency_ms': round(self._baseline * 1000, 1) if self._baseline is not None else None,
+                'completed': self._counts[SUCCESS],
+                'errors': self._counts[ERROR],
+                'overloads': self._counts[OVERLOAD],
+                'increases': self._counts['increases'],
+                'decreases': self._counts['decreases'],
+            }
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Cookie session manager for YGG Torrent
+Keeps the active cookie jar in memory, tracks its expiry and renews it in the background
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from ygg_session_pool import parse_cookie_string
+
+
+# Cookie files written by the authentication scripts and APIs, newest wins
+COOKIE_FILE_PATTERNS = ('api_cookies_*.json', 'manual_cookies_*.json')
+
+# Cloudflare "challenge passage" - how long a cf_clearance stays valid after it was issued
+CF_CLEARANCE_LIFETIME = int(os.getenv('YGG_CF_CLEARANCE_LIFETIME', '1800'))
+
+# Lifetime assumed for jars without any expiry information
+DEFAULT_MAX_AGE = int(os.getenv('YGG_COOKIE_MAX_AGE', '86400'))
+
+# Renew this many seconds before the jar expires
+DEFAULT_REFRESH_MARGIN = int(os.getenv('YGG_COOKIE_REFRESH_MARGIN', '300'))
+
+# Seconds between two checks of the background refresher
+DEFAULT_CHECK_INTERVAL = 30
+
+# Seconds before a scheduled refresh is retried after a failed login
+REFRESH_RETRY_DELAY = 120
+
+CLEARANCE_COOKIE = 'cf_clearance'
+
+logger = logging.getLogger(__name__)
+
+
+def clearance_issued_at(value: str) -> Optional[float]:
+    """
+    Issue time of a ``cf_clearance`` value.
+
+    Cloudflare embeds a Unix timestamp as the second dash-separated field
+    (``<hash>-<issued>-<version>-<signature>``).
+    """
+    for part in (value or '').split('-')[1:]:
+        if len(part) == 10 and part.isdigit():
+            return float(part)
+    return None
+
+
+def normalize_cookies(data: Any) -> Tuple[Dict[str, str], Dict[str, float]]:
+    """
+    Turn any cookie format used in this repo into ``(cookies, expires)``.
+
+    Accepts a ``name=value; ...`` string, a ``{name: value}`` dict, a saved
+    API file (``{'cookies': {...}, 'expires': {...}}``) or a Selenium /
+    zendriver cookie list (``[{'name', 'value', 'expiry'|'expires'}]``).
+
+    Returns:
+        Cookie values and the known expiry (Unix time) per cookie name
+    """
+    if isinstance(data, str):
+        return parse_cookie_string(data), {}
+
+    if isinstance(data, dict) and isinstance(data.get('cookies'), (dict, list)):
+        cookies, expires = normalize_cookies(data['cookies'])
+        expires.update({name: float(when) for name, when in (data.get('expires') or {}).items()})
+        return cookies, expires
+
+    cookies, expires = {}, {}
+    if isinstance(data, dict):
+        cookies = {str(name): str(value) for name, value in data.items()
+                   if isinstance(value, (str, int, float))}
+    elif isinstance(data, list):
+        for cookie in data:
+            if isinstance(cookie, dict) and 'name' in cookie:
+                cookies[cookie['name']] = cookie.get('value', '')
+                when = cookie.get('expiry', cookie.get('expires'))
+                # Session cookies carry no expiry (-1 in CDP)
+                if isinstance(when, (int, float)) and when > 0:
+                    expires[cookie['name']] = float(when)
+    return cookies, expires
+
+
+class CookieJar:
+    """
+    Immutable snapshot of an authenticated cookie set.
+
+    A new jar is built for every refresh, so a worker holding a jar keeps a
+    consistent set of cookies while the store swaps in the next one.
+    """
+
+    __slots__ = ('cookies', 'expires', 'obtained_at', 'source', 'version')
+
+    def __init__(self, cookies: Dict[str, str], expires: Dict[str, float] = None,
+                 obtained_at: float = None, source: str = '', version: int = 0):
+        self.cookies = dict(cookies)
+        self.expires = dict(expires or {})
+        self.obtained_at = obtained_at or time.time()
+        self.source = source
+        self.version = version
+
+    @property
+    def clearance_expires_at(self) -> Optional[float]:
+        """When ``cf_clearance`` stops passing the Cloudflare check, if present."""
+        value = self.cookies.get(CLEARANCE_COOKIE)
+        if value is None:
+            return None
+        issued = clearance_issued_at(value) or self.obtained_at
+        return issued + CF_CLEARANCE_LIFETIME
+
+    @property
+    def expires_at(self) -> float:
+        """Earliest expiry among the cookies, cf_clearance lifetime included."""
+        candidates = list(self.expires.values())
+        clearance = self.clearance_expires_at
+        if clearance is not None:
+            candidates.append(clearance)
+        return min(candidates) if candidates else self.obtained_at + DEFAULT_MAX_AGE
+
+    def ttl(self, now: float = None) -> float:
+        """Seconds until the jar expires (negative once expired)."""
+        return self.expires_at - (now or time.time())
+
+    def is_expired(self, now: float = None) -> bool:
+        return self.ttl(now) <= 0
+
+    @property
+    def cookie_string(self) -> str:
+        return '; '.join(f"{name}={value}" for name, value in self.cookies.items())
+
+    def to_dict(self) -> Dict:
+        """Jar metadata (without cookie values) for health endpoints."""
+        return {
+            'version': self.version,
+            'source': self.source,
+            'cookies_count': len(self.cookies),
+            'obtained_at': datetime.fromtimestamp(self.obtained_at).isoformat(),
+            'expires_at': datetime.fromtimestamp(self.expires_at).isoformat(),
+            'ttl': int(self.ttl())
+        }
+
+
+def load_cookie_file(path) -> Optional[CookieJar]:
+    """Read a saved cookie file; the generation time comes from the file or its mtime."""
+    path = Path(path)
+    with open(path, 'r') as f:
+        data = json.load(f)
+
+    cookies, expires = normalize_cookies(data)
+    if not cookies:
+        return None
+
+    obtained_at = path.stat().st_mtime
+    if isinstance(data, dict) and data.get('generated_at'):
+        try:
+            obtained_at = datetime.fromisoformat(data['generated_at']).timestamp()
+        except ValueError:
+            pass
+
+    return CookieJar(cookies, expires, obtained_at, source=path.name)
+
+
+class CookieStore:
+    """
+    Holds the active ``CookieJar`` and keeps it fresh.
+
+    ``current()`` is a plain attribute read - it never touches the disk or a
+    browser. A background thread (``start()``) picks up newer cookie files
+    when the data directory changes and calls ``refresher`` ahead of the
+    jar's expiry. ``refresher`` performs the login (e.g. through the browser
+    pool) and returns cookies in any format ``normalize_cookies`` accepts.
+
+    Workers that get a 403 call ``report_forbidden(jar)``; the first report
+    for a jar schedules one refresh and later reports for the same jar are
+    ignored. The new jar replaces the old one in a single assignment, so
+    in-flight requests finish with the jar they started with.
+    """
+
+    def __init__(self, data_dir: str = 'data',
+                 patterns: Iterable[str] = COOKIE_FILE_PATTERNS,
+                 refresher: Callable[[], Any] = None,
+                 refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+                 check_interval: float = DEFAULT_CHECK_INTERVAL):
+        self.data_dir = Path(data_dir)
+        self.patterns = tuple(patterns)
+        self.refresher = refresher
+        self.refresh_margin = refresh_margin
+        self.check_interval = check_interval
+
+        self._jar: Optional[CookieJar] = None
+        self._version = 0
+        self._loaded = False
+        self._dir_mtime = None
+        self._condition = threading.Condition()
+        self._refreshing = False
+        self._forbidden_version = None
+        self._last_error = None
+        self._retry_at = 0.0
+        self._refreshes = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def current(self) -> Optional[CookieJar]:
+        """The active jar (loaded from disk on first use), or None."""
+        if not self._loaded:
+            self.reload()
+        return self._jar
+
+    def update(self, cookies: Any, expires: Dict[str, float] = None,
+               source: str = 'update') -> Optional[CookieJar]:
+        """
+        Install a new jar for every subsequent ``current()`` call.
+
+        Args:
+            cookies: Cookies in any format ``normalize_cookies`` accepts
+            expires: Extra per-cookie expiry times (Unix time)
+            source: Where the cookies came from, for logs and health output
+        """
+        values, known_expires = normalize_cookies(cookies)
+        if not values:
+            return None
+        known_expires.update(expires or {})
+        return self._swap(CookieJar(values, known_expires, source=source))
+
+    def _swap(self, jar: CookieJar) -> CookieJar:
+        with self._condition:
+            self._version += 1
+            jar.version = self._version
+            self._jar = jar
+            self._loaded = True
+            self._condition.notify_all()
+        logger.info(f"🍪 Cookie jar v{jar.version} active from {jar.source} "
+                    f"({len(jar.cookies)} cookies, expires in {int(jar.ttl())}s)")
+        return jar
+
+    def _newest_file(self) -> Optional[Path]:
+        files = [path for pattern in self.patterns for path in self.data_dir.glob(pattern)]
+        return max(files, key=lambda f: f.stat().st_mtime) if files else None
+
+    def reload(self) -> Optional[CookieJar]:
+        """Adopt the newest cookie file if it is newer than the active jar."""
+        self._loaded = True
+        try:
+            self._dir_mtime = self.data_dir.stat().st_mtime
+            latest_file = self._newest_file()
+            if latest_file is None:
+                return self._jar
+
+            jar = load_cookie_file(latest_file)
+        except (OSError, ValueError) as e:
+            logger.error(f"❌ Failed to load cookies: {e}")
+            return self._jar
+
+        current = self._jar
+        if jar is not None and (current is None or jar.obtained_at > current.obtained_at):
+            return self._swap(jar)
+        return current
+
+    def _directory_changed(self) -> bool:
+        try:
+            return self.data_dir.stat().st_mtime != self._dir_mtime
+        except OSError:
+            return False
+
+    def needs_refresh(self, jar: CookieJar = None) -> bool:
+        jar = jar or self._jar
+        return jar is None or jar.ttl() <= self.refresh_margin
+
+    def refresh(self, wait: bool = False, timeout: float = None) -> Optional[CookieJar]:
+        """
+        Renew the jar through ``refresher`` (or the cookie files without one).
+
+        Only one refresh runs at a time; concurrent calls join it.
+
+        Args:
+            wait: Block until the refresh finished (never do this on a request path)
+            timeout: Maximum seconds to wait when ``wait`` is set
+        """
+        with self._condition:
+            start = not self._refreshing
+            self._refreshing = True
+
+        if start:
+            threading.Thread(target=self._run_refresh, name='cookie-refresh', daemon=True).start()
+
+        if wait:
+            with self._condition:
+                self._condition.wait_for(lambda: not self._refreshing, timeout)
+        return self._jar
+
+    def _run_refresh(self):
+        try:
+            if self.refresher is None:
+                self.reload()
+                return
+
+            logger.info("🔄 Renewing cookies in the background...")
+            cookies = self.refresher()
+            if not self.update(cookies, source='refresh'):
+                raise RuntimeError("refresher returned no cookies")
+            self._refreshes += 1
+            self._last_error = None
+        except Exception as e:
+            self._last_error = str(e)
+            self._retry_at = time.time() + REFRESH_RETRY_DELAY
+            logger.error(f"❌ Cookie refresh failed: {e}")
+        finally:
+            with self._condition:
+                self._refreshing = False
+                self._condition.notify_all()
+
+    def report_forbidden(self, jar: Optional[CookieJar]):
+        """
+        Report a 403 seen with ``jar``; schedules one refresh per jar version.
+
+        None (cookies that did not come from the store) is ignored.
+
+        Returns immediately - callers retry with ``current()`` once the
+        refreshed jar has been swapped in.
+        """
+        if jar is None:
+            # Cookies supplied by the caller, not by this store
+            return
+
+        with self._condition:
+            if jar.version != self._version or jar.version == self._forbidden_version:
+                return
+            self._forbidden_version = jar.version
+
+        logger.warning(f"⚠️ 403 with cookie jar v{jar.version}, scheduling refresh")
+        self.refresh()
+
+    def wait_for_update(self, version: int, timeout: float = None) -> Optional[CookieJar]:
+        """Block until a jar newer than ``version`` is active (background workers only)."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._version > version, timeout)
+            return self._jar
+
+    def _loop(self):
+        while not self._stop.wait(self.check_interval):
+            try:
+                if self._directory_changed():
+                    self.reload()
+                if self.needs_refresh() and time.time() >= self._retry_at:
+                    self.refresh()
+            except Exception as e:
+                logger.error(f"❌ Cookie store check failed: {e}")
+
+    def start(self):
+        """Start the background refresher thread (idempotent)."""
+        self.current()
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='cookie-store', daemon=True)
+            self._thread.start()
+        if self.needs_refresh():
+            self.refresh()
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self) -> Dict:
+        """Active jar and refresher state for health endpoints."""
+        jar = self._jar
+        return {
+            'jar': jar.to_dict() if jar else None,
+            'refreshing': self._refreshing,
+            'refreshes': self._refreshes,
+            'auto_refresh': self.refresher is not None,
+            'last_error': self._last_error
+        }
@@ -6,11 +6,14 @@ Browse categories using the REAL category mappings discovered through content an
 
 import os
 import json
-import time
 import requests
 import cloudscraper
 import xml.etree.ElementTree as ET
 
+from ygg_sweep import SweepEngine
+from ygg_bencode import verify_torrent_data
+from ygg_torrent_store import get_torrent_store
+
 
 def setup_session_with_cookies(cookie_string):
     """Setup session with the new cookies."""
@@ -84,7 +87,9 @@ def get_real_categories():
 
 def test_category_rss(session, category_id, category_name, passkey, max_items=3):
     """Test RSS feed for a specific category."""
-    print(f"\n📡 Testing category: {category_name} (ID: {category_id})")
+    # Output is buffered so concurrent sweeps print one block per category
+    lines = []
+    lines.append(f"\n📡 Testing category: {category_name} (ID: {category_id})")
     
     rss_url = f"https://www.yggtorrent.top/rss?action=generate&type=subcat&id={category_id}&passkey={passkey}"
     
@@ -96,7 +101,7 @@ def test_category_rss(session, category_id, category_name, passkey, max_items=3)
             root = ET.fromstring(response.text)
             items = root.findall('.//item')
             
-            print(f"✅ RSS feed accessible: {len(items)} items found")
+            lines.append(f"✅ RSS feed accessible: {len(items)} items found")
             
             # Show first few items
             for i, item in enumerate(items[:max_items]):
@@ -105,19 +110,23 @@ def test_category_rss(session, category_id, category_name, passkey, max_items=3)
                 
                 if title is not None and link is not None:
                     torrent_id = link.text.split('/')[-1].split('-')[0]
-                    print(f"  {i+1}. {title.text}")
-                    print(f"     ID: {torrent_id}")
+                    lines.append(f"  {i+1}. {title.text}")
+                    lines.append(f"     ID: {torrent_id}")
             
             if len(items) > max_items:
-                print(f"  ... and {len(items) - max_items} more items")
+                lines.append(f"  ... and {len(items) - max_items} more items")
+            
+            print("\n".join(lines))
             
             return True, len(items)
         else:
-            print(f"❌ RSS feed failed: {response.status_code}")
+            lines.append(f"❌ RSS feed failed: {response.status_code}")
+            print("\n".join(lines))
             return False, 0
             
     except Exception as e:
-        print(f"❌ Error testing category {category_name}: {e}")
+        lines.append(f"❌ Error testing category {category_name}: {e}")
+        print("\n".join(lines))
         return False, 0
 
 
@@ -150,25 +159,32 @@ def download_sample_from_category(session, category_id, category_name, passkey):
                     # Download the torrent
                     download_url = f"https://www.yggtorrent.top/rss/download?id={torrent_id}&passkey={passkey}"
                     
+                    # Reuse a torrent fetched before (by any script) instead of downloading it again
+                    torrent_store = get_torrent_store()
+                    stored = torrent_store.lookup(torrent_id)
+                    if stored:
+                        print(f"  ♻️ Already in torrent store: {stored[0]}")
+                        return stored[0]
+                    
                     download_response = session.get(download_url, timeout=30)
                     
                     if download_response.status_code == 200:
                         content = download_response.content
                         
                         # Check if it's a torrent file
-                        if (content.startswith(b'd8:announce') or 
-                            content.startswith(b'd10:created') or
-                            b'announce' in content[:100]):
+                        metadata = verify_torrent_data(content)
+                        if metadata:
                             
                             # Save the torrent file
                             safe_title = "".join(c for c in torrent_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
                             torrent_filename = f"data/correct_{category_name}_{safe_title}.torrent"
                             
-                            with open(torrent_filename, 'wb') as f:
-                                f.write(content)
+                            stored_path, _ = torrent_store.put(content, torrent_id, download_url, torrent_title, category_name, metadata)
+                            torrent_store.link(stored_path, torrent_filename)
                             
                             print(f"  ✅ Downloaded: {torrent_filename}")
                             print(f"  📊 File size: {len(content)} bytes")
+                            print(f"  🧲 Info hash: {metadata.info_hash} ({metadata.file_count} files, {metadata.total_size} bytes)")
                             return torrent_filename
                         else:
                             print(f"  ❌ Downloaded content doesn't look like a torrent file")
@@ -225,18 +241,23 @@ def main():
     choice = input("\nEnter your choice (1-5): ").strip()
     
     try:
-        # Setup session
-        session = setup_session_with_cookies(cookie_string)
+        # Setup sessions - every request goes through the shared rate limiter
+        engine = SweepEngine(lambda: setup_session_with_cookies(cookie_string))
+        session = engine.rate_limited(setup_session_with_cookies(cookie_string))
         
         if choice == "1":
             # Test all categories
             print(f"\n🧪 Testing all {len(categories)} categories...")
             
             results = {}
-            for category_key, category_info in categories.items():
-                success, item_count = test_category_rss(session, category_info["id"], category_info["name"], passkey)
+            outcomes = engine.map(
+                categories,
+                lambda worker_session, category_key: test_category_rss(
+                    worker_session, categories[category_key]["id"], categories[category_key]["name"], passkey
+                )
+            )
+            for category_key, (success, item_count) in outcomes:
                 results[category_key] = {"success": success, "item_count": item_count}
-                time.sleep(1)  # Small delay between requests
             
             # Summary
             print(f"\n{'='*60}")
@@ -276,7 +297,6 @@ def main():
                 
                 for cat_key, cat_info in selected_categories:
                     test_category_rss(session, cat_info["id"], cat_info["name"], passkey)
-                    time.sleep(1)
                     
             except ValueError:
                 print("❌ Invalid selection")
@@ -298,7 +318,6 @@ def main():
                     torrent_file = download_sample_from_category(session, cat_info["id"], cat_info["name"], passkey)
                     if torrent_file:
                         downloaded_files.append(torrent_file)
-                    time.sleep(2)  # Delay between downloads
                 
                 if downloaded_files:
                     print(f"\n🎉 Downloaded {len(downloaded_files)} sample torrents!")
@@ -341,7 +360,6 @@ def main():
                     torrent_file = download_sample_from_category(session, cat_info["id"], cat_name, passkey)
                     if torrent_file:
                         downloaded_files.append(torrent_file)
-                    time.sleep(2)
             
             if downloaded_files:
                 print(f"\n🎉 Downloaded {len(downloaded_files)} diverse samples!")
@@ -11,6 +11,8 @@ import requests
 import cloudscraper
 from bs4 import BeautifulSoup
 
+from ygg_sweep import SweepEngine
+
 
 def setup_session_with_cookies(cookie_string):
     """Setup session with the new cookies."""
@@ -169,8 +171,9 @@ def main():
     os.makedirs('data', exist_ok=True)
     
     try:
-        # Setup session
-        session = setup_session_with_cookies(cookie_string)
+        # Setup sessions - every request goes through the shared rate limiter
+        engine = SweepEngine(lambda: setup_session_with_cookies(cookie_string))
+        session = engine.rate_limited(setup_session_with_cookies(cookie_string))
         
         # Step 1: Discover parent categories from RSS page
         print(f"\n{'='*60}")
@@ -195,7 +198,6 @@ def main():
         for parent_id, parent_info in parent_categories.items():
             subcategories = discover_subcategories(session, parent_id, parent_info['name'], passkey)
             all_subcategories.update(subcategories)
-            time.sleep(1)  # Small delay between requests
         
         print(f"\n📊 Total subcategories discovered: {len(all_subcategories)}")
         
@@ -205,9 +207,15 @@ def main():
         print(f"{'='*60}")
         
         working_subcategories = {}
-        for subcat_id, subcat_info in all_subcategories.items():
+        results = engine.map(
+            all_subcategories,
+            lambda worker_session, subcat_id: test_rss_feed(
+                worker_session, subcat_id, all_subcategories[subcat_id]['name'], passkey
+            )
+        )
+        for subcat_id, (success, item_count) in results:
+            subcat_info = all_subcategories[subcat_id]
             print(f"  Testing subcategory {subcat_id}: {subcat_info['name']}...", end=" ")
-            success, item_count = test_rss_feed(session, subcat_id, subcat_info['name'], passkey)
             
             if success:
                 subcat_info['item_count'] = item_count
@@ -216,8 +224,6 @@ def main():
                 print(f"✅ {item_count} items")
             else:
                 print("❌ No items")
-            
-            time.sleep(0.5)  # Small delay between requests
         
         # Step 4: Organize results by parent category
         print(f"\n{'='*60}")
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Persistent .torrent download queue keyed by torrent ID
+SQLite-backed per-item state with exponential backoff, a shared 429/503 slowdown and resume after restart
+"""
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from config import MAX_RETRIES, RETRY_DELAY
+from ygg_seen_index import torrent_key
+
+
+DEFAULT_QUEUE_PATH = os.getenv('YGG_DOWNLOAD_QUEUE', 'data/download_queue.db')
+
+# Upper bound (seconds) of one retry delay and of the shared slowdown
+MAX_RETRY_DELAY = float(os.getenv('YGG_DOWNLOAD_MAX_DELAY', '300'))
+
+# Statuses worth another attempt; 429 and 503 also slow every worker down
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504, 520, 521, 522, 523, 524})
+SLOWDOWN_STATUS = frozenset({429, 503})
+
+# Seconds an idle worker waits before checking the queue again while others are still downloading
+POLL_INTERVAL = 1.0
+
+PENDING, ACTIVE, DONE, FAILED = 'pending', 'active', 'done', 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS download_queue (
+    key TEXT PRIMARY KEY,
+    torrent_id INTEGER,
+    guid TEXT,
+    title TEXT,
+    category TEXT,
+    torrent_link TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    last_status INTEGER,
+    download_path TEXT,
+    info_hash TEXT,
+    enqueued_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS download_queue_due ON download_queue (state, next_attempt_at);
+"""
+
+
+def backoff_delay(attempt: int, base: float = RETRY_DELAY, cap: float = MAX_RETRY_DELAY) -> float:
+    """
+    Delay before retry number ``attempt`` (1-based): exponential, with jitter.
+
+    The ceiling doubles per attempt up to ``cap``; the delay is drawn from
+    its upper half so workers that failed together do not retry together.
+    """
+    ceiling = min(cap, base * 2 ** max(0, attempt - 1))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date), capped at ``MAX_RETRY_DELAY``."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), MAX_RETRY_DELAY)
+    try:
+        seconds = parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+    return min(max(0.0, seconds), MAX_RETRY_DELAY)
+
+
+class GlobalSlowdown:
+    """
+    Pause shared by all download workers after the tracker answers 429 or 503.
+
+    Each trip pauses every worker for ``Retry-After`` seconds, or for an
+    exponentially growing penalty when the header is missing. Trips while
+    a pause is still running only extend it, so a burst of 429s from
+    parallel workers counts as one strike. A success resets the penalty.
+    """
+
+    def __init__(self, base_delay: float = RETRY_DELAY, max_delay: float = MAX_RETRY_DELAY):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._strikes = 0
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> float:
+        """Seconds left in the current pause (0 when downloads may proceed)."""
+        return max(0.0, self._resume_at - time.monotonic())
+
+    def trip(self, retry_after: float = None) -> float:
+        """Start or extend the pause; return its remaining length in seconds."""
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._resume_at:
+                self._strikes += 1
+            delay = retry_after if retry_after is not None else \
+                min(self.max_delay, self.base_delay * 2 ** (self._strikes - 1))
+            self._resume_at = max(self._resume_at, now + delay)
+            return self._resume_at - now
+
+    def reset(self):
+        """Forget past strikes after a successful download."""
+        with self._lock:
+            self._strikes = 0
+
+    def wait(self) -> float:
+        """Sleep until the current pause is over; return the seconds slept."""
+        slept = 0.0
+        while True:
+            remaining = self.remaining
+            if remaining <= 0:
+                return slept
+            time.sleep(remaining)
+            slept += remaining
+
+
+# Shared by every download worker of this process
+slowdown = GlobalSlowdown()
+
+
+class DownloadQueue:
+    """
+    Download jobs and their state, one row per torrent ID.
+
+    Items move ``pending`` -> ``active`` -> ``done``, or back to ``pending``
+    with a backoff delay after a retryable failure, or to ``failed`` once
+    ``max_retries`` retries are used up. ``recover`` requeues items a
+    crashed run left ``active``, and ``done`` items are never downloaded
+    again, so re-running a backfill resumes it.
+    """
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH, max_retries: int = MAX_RETRIES,
+                 retry_delay: float = RETRY_DELAY, max_delay: float = MAX_RETRY_DELAY):
+        self.path = path
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.max_delay = max_delay
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def recover(self) -> int:
+        """
+        Make items left active by a run that stopped mid-download pending again.
+
+        Call it before a run starts; only one downloader should use a queue file at a time.
+
+        Returns:
+            Number of recovered items
+        """
+        with self._lock:
+            count = self._conn.execute(
+                'UPDATE download_queue SET state = ?, updated_at = ? WHERE state = ?',
+                (PENDING, datetime.now().isoformat(), ACTIVE)
+            ).rowcount
+            self._conn.commit()
+        return count
+
+    def enqueue(self, torrents: Iterable) -> List[str]:
+        """
+        Add torrents to the queue.
+
+        New torrents become pending; failed ones are reset with a fresh
+        retry budget; pending and done ones are left as they are.
+
+        Args:
+            torrents: Torrent records or dictionaries with a ``torrent_link``
+
+        Returns:
+            The queue keys of the torrents, in order
+        """
+        now = datetime.now().isoformat()
+        keys, rows = [], []
+        for torrent in torrents:
+            key = torrent_key(torrent)
+            if key is None or not torrent.get('torrent_link'):
+                continue
+            keys.append(key)
+            rows.append((key, torrent.get('id'), torrent.get('guid'), torrent.get('title'),
+                         torrent.get('category'), torrent['torrent_link'], now, now))
+
+        with self._lock:
+            self._conn.executemany(
+                'INSERT INTO download_queue '
+                '(key, torrent_id, guid, title, category, torrent_link, enqueued_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET state = \'pending\', attempts = 0, next_attempt_at = 0, '
+                'torrent_link = excluded.torrent_link, updated_at = excluded.updated_at '
+                'WHERE state = \'failed\'',
+                rows
+            )
+            self._conn.commit()
+        return keys
+
+    def claim(self) -> Optional[Dict]:
+        """
+        Take the next pending item that is due and mark it active.
+
+        Returns:
+            The item's row (``attempts`` includes this one), or None if nothing is due
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                'SELECT * FROM download_queue WHERE state = ? AND next_attempt_at <= ? '
+                'ORDER BY next_attempt_at, rowid LIMIT 1',
+                (PENDING, time.time())
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            item = dict(zip([description[0] for description in cursor.description], row))
+            item['state'] = ACTIVE
+            item['attempts'] += 1
+            self._conn.execute(
+                'UPDATE download_queue SET state = ?, attempts = ?, updated_at = ? WHERE key = ?',
+                (ACTIVE, item['attempts'], datetime.now().isoformat(), item['key'])
+            )
+            self._conn.commit()
+        return item
+
+    def complete(self, key: str, download_path: str, info_hash: str = None):
+        """Mark an item downloaded."""
+        with self._lock:
+            self._conn.execute(
+                'UPDATE download_queue SET state = ?, download_path = ?, info_hash = ?, '
+                'last_error = NULL, last_status = NULL, updated_at = ? WHERE key = ?',
+                (DONE, download_path, info_hash, datetime.now().isoformat(), key)
+            )
+            self._conn.commit()
+
+    def fail(self, key: str, error: str, status: int = None,
+             retryable: bool = True, retry_after: float = None) -> Optional[float]:
+        """
+        Record a failed attempt and schedule the next one.
+
+        Args:
+            key: Queue key of the item
+            error: Error message, kept for ``stats`` and the CLI
+            status: HTTP status, if the tracker answered
+            retryable: False for errors another attempt cannot fix
+            retry_after: Minimum delay the tracker asked for
+
+        Returns:
+            Seconds until the retry, or None if the item is now failed for good
+        """
+        if status is not None and status not in RETRYABLE_STATUS:
+            retryable = False
+
+        with self._lock:
+            row = self._conn.execute('SELECT attempts FROM download_queue WHERE key = ?', (key,)).fetchone()
+            attempts = row[0] if row else 0
+
+            delay = None
+            if retryable and attempts <= self.max_retries:
+                delay = max(backoff_delay(attempts, self.retry_delay, self.max_delay), retry_after or 0)
+            self._conn.execute(
+                'UPDATE download_queue SET state = ?, next_attempt_at = ?, last_error = ?, '
+                'last_status = ?, updated_at = ? WHERE key = ?',
+                (PENDING if delay is not None else FAILED, time.time() + (delay or 0),
+                 error, status, datetime.now().isoformat(), key)
+            )
+            self._conn.commit()
+        return delay
+
+    def next_due_in(self) -> Optional[float]:
+        """
+        Seconds until the next pending item is due.
+
+        Returns ``POLL_INTERVAL`` when nothing is pending but items are still
+        active (their retries may be scheduled), and None when the queue is drained.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT MIN(next_attempt_at) FROM download_queue WHERE state = ?', (PENDING,)
+            ).fetchone()
+            if row[0] is not None:
+                return max(0.0, row[0] - time.time())
+            active = self._conn.execute(
+                'SELECT 1 FROM download_queue WHERE state = ? LIMIT 1', (ACTIVE,)
+            ).fetchone()
+        return POLL_INTERVAL if active else None
+
+    def results(self, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Download path per key (None unless the item is done)."""
+        keys = list(keys)
+        results = dict.fromkeys(keys)
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit on large backfills
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                results.update(self._conn.execute(
+                    f"SELECT key, download_path FROM download_queue "
+                    f"WHERE state = ? AND key IN ({', '.join('?' * len(chunk))})",
+                    (DONE, *chunk)
+                ))
+        return results
+
+    def retry_failed(self) -> int:
+        """Give every failed item a fresh retry budget; return how many were reset."""
+        with self._lock:
+            count = self._conn.execute(
+                'UPDATE download_queue SET state = ?, attempts = 0, next_attempt_at = 0, updated_at = ? '
+                'WHERE state = ?',
+                (PENDING, datetime.now().isoformat(), FAILED)
+            ).rowcount
+            self._conn.commit()
+        return count
+
+    def failures(self, limit: int = 20) -> List[Dict]:
+        """Most recently failed items with their last error."""
+        with self._lock:
+            cursor = self._conn.execute(
+                'SELECT key, title, attempts, last_status, last_error FROM download_queue '
+                'WHERE state = ? ORDER BY updated_at DESC LIMIT ?',
+                (FAILED, limit)
+            )
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor]
+
+    def stats(self) -> Dict:
+        """Item counts per state."""
+        with self._lock:
+            counts = dict(self._conn.execute('SELECT state, COUNT(*) FROM download_queue GROUP BY state'))
+        return {state: counts.get(state, 0) for state in (PENDING, ACTIVE, DONE, FAILED)}
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Persistent .torrent download queue')
+    parser.add_argument('--path', default=DEFAULT_QUEUE_PATH, help=f'Queue database (default: {DEFAULT_QUEUE_PATH})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('stats', help='Show item counts and recent failures')
+    subparsers.add_parser('retry', help='Queue failed items again')
+
+    args = parser.parse_args()
+    queue = DownloadQueue(args.path)
+
+    if args.command == 'retry':
+        print(f"🔁 {queue.retry_failed()} failed downloads queued again")
+    else:
+        stats = queue.stats()
+        print(f"📊 {stats[DONE]} done, {stats[PENDING]} pending, {stats[ACTIVE]} active, {stats[FAILED]} failed")
+        for item in queue.failures():
+            status = f"HTTP {item['last_status']}" if item['last_status'] else 'error'
+            print(f"  ❌ {item['key']} {item['title']} - {status} after {item['attempts']} attempts: {item['last_error']}")
+
+    queue.close()
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
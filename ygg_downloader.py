@@ -9,6 +9,7 @@ import time
 import json
 from ygg_auth import YGGRealAuth
 from ygg_parser import YGGParserWithDownloads
+from ygg_seen_index import torrent_key
 
 
 def auto_auth_and_download():
@@ -104,9 +105,17 @@ def auto_auth_and_download():
     
     print(f"✅ Found {len(torrents)} torrents")
     
-    # Show first few torrents
-    print("\n📋 First 5 torrents:")
-    for i, torrent in enumerate(torrents[:5], 1):
+    # Only peek: torrents are marked as seen once they have been handled below
+    new_torrents = parser.seen_index.peek_new(torrents)
+    print(f"🆕 {len(new_torrents)} new since the last run")
+    
+    if not new_torrents:
+        print("✅ Nothing new to download")
+        return True
+    
+    # Show first few new torrents
+    print("\n📋 First 5 new torrents:")
+    for i, torrent in enumerate(new_torrents[:5], 1):
         title = torrent.get('title', 'Unknown')
         size = torrent.get('size', 'Unknown')
         seeds = torrent.get('seeds', 'Unknown')
@@ -121,7 +130,7 @@ def auto_auth_and_download():
         print()
     
     # Find downloadable torrents
-    downloadable_torrents = [t for t in torrents if t.get('torrent_link')]
+    downloadable_torrents = [t for t in new_torrents if t.get('torrent_link')]
     
     if not downloadable_torrents:
         print("⚠️ No torrents with direct download links found")
@@ -144,9 +153,13 @@ def auto_auth_and_download():
     
     choice = input("\nEnter your choice (1-4): ").strip()
     
+    # Torrents handled by the chosen option, and the keys of those whose download failed
+    processed, failed = [], set()
+    
     if choice == "1":
         # Download first torrent
         first_torrent = downloadable_torrents[0]
+        processed = [first_torrent]
         print(f"\n⬇️ Downloading: {first_torrent.get('title', 'Unknown')}")
         
         def progress_callback(filename, progress, downloaded, total):
@@ -161,6 +174,7 @@ def auto_auth_and_download():
         if filepath:
             print(f"✅ Download successful: {filepath}")
         else:
+            failed.add(torrent_key(first_torrent))
             print("❌ Download failed")
     
     elif choice == "2":
@@ -168,16 +182,18 @@ def auto_auth_and_download():
         demo_torrents = downloadable_torrents[:3]
         print(f"\n🚀 Downloading {len(demo_torrents)} torrents in parallel...")
         
-        results = parser.download_torrents_batch(demo_torrents, max_workers=2)
+        results = parser.download_torrents_batch(demo_torrents)
+        processed = demo_torrents
+        failed = {key for key, path in results.items() if not path}
         
-        successful = sum(1 for path in results.values() if path)
+        successful = len(results) - len(failed)
         print(f"✅ Batch download completed: {successful}/{len(demo_torrents)} successful")
         
-        for title, filepath in results.items():
+        for torrent_id, filepath in results.items():
             if filepath:
-                print(f"  ✅ {title} -> {filepath}")
+                print(f"  ✅ {torrent_id} -> {filepath}")
             else:
-                print(f"  ❌ {title} -> Failed")
+                print(f"  ❌ {torrent_id} -> Failed")
     
     elif choice == "3":
         # Download with criteria
@@ -194,19 +210,24 @@ def auto_auth_and_download():
             max_size_mb=max_size,
             keywords=keywords
         )
+        processed = downloadable_torrents
+        failed = {key for key, path in results.items() if not path}
         
-        successful = sum(1 for path in results.values() if path)
+        successful = len(results) - len(failed)
         print(f"✅ Criteria-based download: {successful} torrents downloaded")
         
-        for title, filepath in results.items():
+        for torrent_id, filepath in results.items():
             if filepath:
-                print(f"  ✅ {title}")
+                print(f"  ✅ {filepath}")
             else:
-                print(f"  ❌ {title} (failed)")
+                print(f"  ❌ torrent {torrent_id} (failed)")
     
     elif choice == "4":
         print("⏭️ Skipping downloads, showing torrent information only")
     
+    # Failed downloads stay new so the next run offers them again
+    parser.seen_index.mark_seen([t for t in processed if torrent_key(t) not in failed], subcat_id)
+    
     # Show download statistics
     print(f"\n📊 Download Statistics:")
     stats = parser.get_download_stats()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Conditional GET support for YGG Torrent RSS polling
+Keeps ETag / Last-Modified validators and a body hash per feed
+"""
+
+import time
+import hashlib
+import threading
+from typing import Any, Dict, Hashable, Optional
+
+
+class FeedValidatorCache:
+    """
+    Per-feed validator cache for conditional RSS requests.
+
+    Usage::
+
+        headers = cache.conditional_headers(key)
+        response = session.get(url, headers=headers)
+        digest = cache.check(key, response)
+        if digest is None:
+            result = cache.payload(key)          # unchanged, skip parsing
+        else:
+            result = parse(response.text)
+            cache.store(key, response, digest, result)
+
+    A ``304 Not Modified`` answer and a ``200`` whose body hashes to the
+    same digest as last time are both reported as unchanged, so feeds served
+    without validators still skip parsing.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def conditional_headers(self, key: Hashable) -> Dict[str, str]:
+        """Return If-None-Match / If-Modified-Since headers for a known feed."""
+        with self._lock:
+            entry = self._entries.get(key)
+
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def check(self, key: Hashable, response) -> Optional[str]:
+        """
+        Compare a response against the stored entry.
+
+        Returns:
+            The body digest when the feed changed (pass it to ``store``),
+            or None when it is unchanged (304 or identical body).
+        """
+        if response.status_code == 304:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry:
+                    entry['checked_at'] = time.time()
+            return None
+
+        digest = hashlib.sha1(response.content).hexdigest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry['digest'] == digest:
+                entry['checked_at'] = time.time()
+                return None
+        return digest
+
+    def store(self, key: Hashable, response, digest: str, payload: Any = None):
+        """Remember validators, digest and the parsed result for a changed feed."""
+        now = time.time()
+        with self._lock:
+            self._entries[key] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'digest': digest,
+                'payload': payload,
+                'changed_at': now,
+                'checked_at': now
+            }
+
+    def payload(self, key: Hashable) -> Any:
+        """Return the result stored with the last changed response, if any."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry['payload'] if entry else None
+
+    def forget(self, key: Hashable):
+        """Drop a feed so the next request is unconditional."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict:
+        """Summary of cached feeds for health endpoints and logs."""
+        with self._lock:
+            return {
+                'feeds': len(self._entries),
+                'with_etag': sum(1 for e in self._entries.values() if e['etag']),
+                'with_last_modified': sum(1 for e in self._entries.values() if e['last_modified'])
+            }
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Atomic file writes for downloads and data/ snapshots
+Content goes to a hidden temporary file next to the target and is renamed into place
+"""
+
+import os
+import secrets
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Tuple
+
+
+# Suffix of in-progress files; never a .torrent/.json name, so listings skip them
+TEMP_SUFFIX = '.part'
+
+
+def _create_temp(path: str) -> Tuple[int, str]:
+    """
+    Create a hidden temporary file next to ``path``.
+
+    Unlike ``tempfile.mkstemp`` (always 0600) the file is created with mode
+    0o666, so the kernel applies the umask exactly as ``open(path, 'wb')``
+    would; the umask itself is never read or changed.
+
+    Returns:
+        ``(fd, temp_path)``
+    """
+    directory = os.path.dirname(path) or '.'
+    flags = os.O_RDWR | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    while True:
+        temp_path = os.path.join(directory, f".{os.path.basename(path)}.{secrets.token_hex(4)}{TEMP_SUFFIX}")
+        try:
+            return os.open(temp_path, flags, 0o666), temp_path
+        except FileExistsError:
+            continue
+
+
+@contextmanager
+def atomic_open(path: str, fsync: bool = False) -> Iterator[BinaryIO]:
+    """
+    Open a binary file that only appears at ``path`` once it is complete.
+
+    Writes go to a temporary file in the same directory, which replaces
+    ``path`` with ``os.replace`` when the block exits normally. On an
+    exception (or a crash) ``path`` is left untouched and the temporary
+    file is removed. The file is also readable, so callers can validate
+    what they wrote before it is published.
+
+    Args:
+        path: Final file path
+        fsync: Flush the data to disk before the rename (survives power loss)
+    """
+    fd, temp_path = _create_temp(path)
+    try:
+        with os.fdopen(fd, 'w+b') as f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_atomic(path: str, data: bytes, fsync: bool = False) -> int:
+    """
+    Write ``data`` to ``path`` in one call through ``atomic_open``.
+
+    Returns:
+        Number of bytes written
+    """
+    with atomic_open(path, fsync) as f:
+        f.write(data)
+    return len(data)
@@ -10,6 +10,8 @@ import time
 import requests
 import cloudscraper
 import xml.etree.ElementTree as ET
+from ygg_bencode import verify_torrent_data
+from ygg_torrent_store import get_torrent_store
 
 
 def setup_session_with_cookies(cookie_string):
@@ -78,24 +80,28 @@ def download_torrent(session, torrent_id, torrent_title, passkey):
         # Use RSS download URL
         download_url = f"https://www.yggtorrent.top/rss/download?id={torrent_id}&passkey={passkey}"
         
+        # Reuse a torrent fetched before (by any script) instead of downloading it again
+        torrent_store = get_torrent_store()
+        stored = torrent_store.lookup(torrent_id)
+        if stored:
+            print(f"♻️ Already in torrent store: {stored[0]}")
+            return stored[0]
+        
         response = session.get(download_url, timeout=30)
         
         if response.status_code == 200:
             content = response.content
-            content_type = response.headers.get('content-type', '')
             
             # Check if it's a torrent file
-            if (content_type == 'application/x-bittorrent' or 
-                content.startswith(b'd8:announce') or 
-                content.startswith(b'd10:created') or
-                b'announce' in content[:100]):
+            metadata = verify_torrent_data(content)
+            if metadata:
                 
                 # Save the torrent file
                 safe_title = "".join(c for c in torrent_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
                 torrent_filename = f"data/auto_{safe_title}.torrent"
                 
-                with open(torrent_filename, 'wb') as f:
-                    f.write(content)
+                stored_path, _ = torrent_store.put(content, torrent_id, download_url, torrent_title, metadata=metadata)
+                torrent_store.link(stored_path, torrent_filename)
                 
                 print(f"✅ Successfully downloaded: {torrent_filename}")
                 print(f"📊 File size: {len(content)} bytes")
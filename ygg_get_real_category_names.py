@@ -5,12 +5,14 @@ Get the actual category names by examining the parent category pages
 """
 
 import os
-import json
 import time
+import json
 import requests
 import cloudscraper
 from bs4 import BeautifulSoup
 
+from ygg_sweep import SweepEngine
+
 
 def setup_session_with_cookies(cookie_string):
     """Setup session with the new cookies."""
@@ -90,7 +92,8 @@ def get_real_category_names(session, parent_id, passkey):
 
 def analyze_category_content(session, category_id, passkey):
     """Analyze the content of a category to determine its type."""
-    print(f"    Analyzing category {category_id}...", end=" ")
+    # Printed as one line so concurrent workers do not interleave output
+    prefix = f"    Analyzing category {category_id}..."
     
     rss_url = f"https://www.yggtorrent.top/rss?action=generate&type=subcat&id={category_id}&passkey={passkey}"
     
@@ -114,7 +117,7 @@ def analyze_category_content(session, category_id, passkey):
                 # Analyze titles to determine category
                 category_type = analyze_titles(titles)
                 
-                print(f"✅ {len(items)} items - {category_type}")
+                print(f"{prefix} ✅ {len(items)} items - {category_type}")
                 return {
                     'id': category_id,
                     'name': category_type,
@@ -122,14 +125,14 @@ def analyze_category_content(session, category_id, passkey):
                     'sample_titles': titles[:2]
                 }
             else:
-                print("❌ No items")
+                print(f"{prefix} ❌ No items")
                 return None
         else:
-            print(f"❌ {response.status_code}")
+            print(f"{prefix} ❌ {response.status_code}")
             return None
             
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(f"{prefix} ❌ Error: {e}")
         return None
 
 
@@ -233,8 +236,9 @@ def main():
         return
     
     try:
-        # Setup session
-        session = setup_session_with_cookies(cookie_string)
+        # Setup sessions - every request goes through the shared rate limiter
+        engine = SweepEngine(lambda: setup_session_with_cookies(cookie_string))
+        session = engine.rate_limited(setup_session_with_cookies(cookie_string))
         
         # Analyze categories to get real names
         print(f"\n{'='*60}")
@@ -252,13 +256,14 @@ def main():
             # Get real category names from the parent page
             real_names = get_real_category_names(session, parent_id, passkey)
             
-            # Analyze each subcategory
-            for subcat_id, subcat_info in subcategories.items():
+            # Analyze each subcategory concurrently
+            analyses = engine.map(
+                subcategories,
+                lambda worker_session, subcat_id: analyze_category_content(worker_session, subcat_id, passkey)
+            )
+            for subcat_id, analysis in analyses:
                 # Try to get real name first
-                real_name = real_names.get(subcat_id, subcat_info['name'])
-                
-                # Analyze content to determine category type
-                analysis = analyze_category_content(session, subcat_id, passkey)
+                real_name = real_names.get(subcat_id, subcategories[subcat_id]['name'])
                 
                 if analysis:
                     all_categories_with_names[subcat_id] = {
@@ -271,10 +276,6 @@ def main():
                         'sample_titles': analysis['sample_titles'],
                         'rss_url': f"https://www.yggtorrent.top/rss?action=generate&type=subcat&id={subcat_id}&passkey={passkey}"
                     }
-                
-                time.sleep(0.5)  # Small delay between requests
-            
-            time.sleep(1)  # Delay between parent categories
         
         # Summary
         print(f"\n{'='*60}")
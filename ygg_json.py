@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+JSON serialization for API responses and data/ snapshots
+Uses orjson or ujson when installed and falls back to the standard library
+"""
+
+import os
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from ygg_files import write_atomic
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ujson
+    UJSON_AVAILABLE = True
+except ImportError:
+    UJSON_AVAILABLE = False
+
+
+# Serializer to use: auto (fastest installed), orjson, ujson or json
+JSON_BACKEND = os.getenv('YGG_JSON_BACKEND', 'auto')
+
+# Write data/ snapshots without indentation (smaller and faster; for machine consumers)
+JSON_COMPACT = os.getenv('YGG_JSON_COMPACT', 'false').lower() in ('1', 'true', 'yes')
+
+logger = logging.getLogger(__name__)
+
+
+def json_default(value):
+    """Serialize the typed values the JSON encoders do not handle natively."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    to_dict = getattr(value, 'to_dict', None)
+    if to_dict is not None:
+        return to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JSONSerializer:
+    """
+    Standard library serializer; the base of the faster backends.
+
+    ``dumps`` always returns UTF-8 bytes (non-ASCII characters are kept,
+    as with ``ensure_ascii=False``). Pretty output is indented by two
+    spaces, compact output has no whitespace at all.
+    """
+
+    name = 'json'
+
+    def dumps(self, obj: Any, compact: bool = False, sort_keys: bool = False,
+              default: Callable = json_default) -> bytes:
+        if compact:
+            text = json.dumps(obj, ensure_ascii=False, separators=(',', ':'),
+                              sort_keys=sort_keys, default=default)
+        else:
+            text = json.dumps(obj, ensure_ascii=False, indent=2,
+                              sort_keys=sort_keys, default=default)
+        return text.encode('utf-8')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class UjsonSerializer(JSONSerializer):
+    """ujson (>= 5.4 for ``default``); values it cannot encode go through the stdlib."""
+
+    name = 'ujson'
+
+    def dumps(self, obj: Any, compact: bool = False, sort_keys: bool = False,
+              default: Callable = json_default) -> bytes:
+        try:
+            text = ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False,
+                               indent=0 if compact else 2, sort_keys=sort_keys, default=default)
+        except (TypeError, OverflowError):
+            return super().dumps(obj, compact, sort_keys, default)
+        return text.encode('utf-8')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return ujson.loads(data)
+
+
+class OrjsonSerializer(JSONSerializer):
+    """
+    orjson; values it cannot encode (integers over 64 bits) go through the stdlib.
+
+    Datetimes are passed through to ``default`` so every backend formats
+    them the same way.
+    """
+
+    name = 'orjson'
+
+    def dumps(self, obj: Any, compact: bool = False, sort_keys: bool = False,
+              default: Callable = json_default) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            return super().dumps(obj, compact, sort_keys, default)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+JSON_SERIALIZERS = {
+    'orjson': (OrjsonSerializer, ORJSON_AVAILABLE),
+    'ujson': (UjsonSerializer, UJSON_AVAILABLE),
+    'json': (JSONSerializer, True),
+}
+
+
+def available_backends() -> List[str]:
+    """Names of the installed serializers, fastest first."""
+    return [name for name, (_, available) in JSON_SERIALIZERS.items() if available]
+
+
+def create_serializer(name: str = None) -> JSONSerializer:
+    """
+    Build the serializer called ``name`` (default: ``YGG_JSON_BACKEND``).
+
+    ``auto`` picks the fastest installed one; a named backend that is not
+    installed falls back to the standard library with a warning.
+    """
+    name = (name or JSON_BACKEND).lower()
+    if name == 'auto':
+        name = available_backends()[0]
+
+    if name not in JSON_SERIALIZERS:
+        raise ValueError(f"Unknown JSON backend '{name}' (choose from: auto, {', '.join(JSON_SERIALIZERS)})")
+
+    serializer_class, available = JSON_SERIALIZERS[name]
+    if not available:
+        logger.warning(f"⚠ {name} is not installed - using the standard json module (pip install {name})")
+        serializer_class = JSONSerializer
+    return serializer_class()
+
+
+# Shared by the APIs, parser and downloaders of this process
+serializer = create_serializer()
+
+
+def dumps(obj: Any, compact: bool = False, sort_keys: bool = False,
+          default: Callable = json_default) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes with the shared serializer."""
+    return serializer.dumps(obj, compact, sort_keys, default)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON bytes or text with the shared serializer."""
+    return serializer.loads(data)
+
+
+def dump_file(obj: Any, filename: str, compact: Optional[bool] = None) -> int:
+    """
+    Write ``obj`` to ``filename`` as JSON (atomically, see ygg_files).
+
+    Args:
+        obj: Data to write
+        filename: Destination file
+        compact: No indentation (default: ``YGG_JSON_COMPACT``)
+
+    Returns:
+        Number of bytes written
+    """
+    return write_atomic(filename, dumps(obj, compact=JSON_COMPACT if compact is None else compact))
+
+
+def load_file(filename: str) -> Any:
+    """Read a JSON file written by ``dump_file`` (or any other JSON file)."""
+    with open(filename, 'rb') as f:
+        return loads(f.read())
+
+
+def describe() -> Dict[str, Any]:
+    """Active and installed serializers, for health and benchmark output."""
+    return {'backend': serializer.name, 'available': available_backends(), 'compact_snapshots': JSON_COMPACT}
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Background login jobs for the YGG Torrent APIs
+Browser logins run on a bounded executor and are polled by job id instead of blocking a request
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# Logins running at once (match the number of pooled browsers)
+DEFAULT_LOGIN_WORKERS = int(os.getenv('YGG_LOGIN_WORKERS', '2'))
+
+# Logins allowed to wait for a worker before new ones are refused
+DEFAULT_MAX_QUEUE = int(os.getenv('YGG_LOGIN_QUEUE', '8'))
+
+# Seconds a finished job stays pollable
+DEFAULT_JOB_RETENTION = int(os.getenv('YGG_LOGIN_JOB_TTL', '600'))
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when no more logins can be queued."""
+
+
+class LoginJob:
+    """State of one background login (the password is never stored)."""
+
+    __slots__ = ('id', 'username', 'status', 'created_at', 'started_at',
+                 'finished_at', 'result', 'error', 'done')
+
+    def __init__(self, username: str):
+        self.id = uuid.uuid4().hex
+        self.username = username
+        self.status = JOB_QUEUED
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_SUCCEEDED, JOB_FAILED)
+
+    def to_dict(self) -> Dict:
+        """JSON-serialisable job state; ``result`` is included once the job finished."""
+        def iso(timestamp):
+            return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+        data = {
+            'job_id': self.id,
+            'username': self.username,
+            'status': self.status,
+            'created_at': iso(self.created_at),
+            'started_at': iso(self.started_at),
+            'finished_at': iso(self.finished_at)
+        }
+        if self.started_at and self.finished_at:
+            data['duration'] = round(self.finished_at - self.started_at, 2)
+        if self.finished:
+            data['result'] = self.result
+            data['error'] = self.error
+        return data
+
+
+class LoginJobQueue:
+    """
+    Runs ``runner(username, password)`` on a bounded thread pool.
+
+    ``submit`` returns at once. A login already queued or running for the
+    same username is returned instead of starting a second browser session.
+    When ``max_workers + max_queue`` logins are unfinished, ``submit``
+    raises ``QueueFullError``. Finished jobs are kept ``retention`` seconds.
+
+    ``runner`` returns a dict; the job succeeds when its ``success`` key is
+    truthy.
+    """
+
+    def __init__(self, runner: Callable[[str, str], Dict],
+                 max_workers: int = DEFAULT_LOGIN_WORKERS,
+                 max_queue: int = DEFAULT_MAX_QUEUE,
+                 retention: float = DEFAULT_JOB_RETENTION):
+        self.runner = runner
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max_queue
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='login-job')
+        self._jobs: Dict[str, LoginJob] = {}
+        self._inflight: Dict[str, LoginJob] = {}
+        self._lock = threading.Lock()
+        self._counters = {'submitted': 0, 'deduplicated': 0, 'rejected': 0,
+                          JOB_SUCCEEDED: 0, JOB_FAILED: 0}
+
+    def submit(self, username: str, password: str) -> Tuple[LoginJob, bool]:
+        """
+        Queue a login.
+
+        Returns:
+            ``(job, created)``; ``created`` is False when an in-flight job
+            for the same username was reused
+
+        Raises:
+            QueueFullError: Too many logins are waiting
+        """
+        with self._lock:
+            self._prune(time.time())
+
+            job = self._inflight.get(username)
+            if job is not None:
+                self._counters['deduplicated'] += 1
+                return job, False
+
+            if len(self._inflight) >= self.max_workers + self.max_queue:
+                self._counters['rejected'] += 1
+                raise QueueFullError(f"{len(self._inflight)} logins already in progress")
+
+            job = LoginJob(username)
+            self._jobs[job.id] = job
+            self._inflight[username] = job
+            self._counters['submitted'] += 1
+
+        self._executor.submit(self._run, job, password)
+        logger.info(f"🧾 Login job {job.id} queued for user: {username}")
+        return job, True
+
+    def _run(self, job: LoginJob, password: str):
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = self.runner(job.username, password)
+            job.status = JOB_SUCCEEDED if job.result and job.result.get('success') else JOB_FAILED
+        except Exception as e:
+            logger.error(f"❌ Login job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = JOB_FAILED
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._inflight.pop(job.username, None)
+                self._counters[job.status] += 1
+            job.done.set()
+            logger.info(f"🧾 Login job {job.id} {job.status} in {job.finished_at - job.started_at:.1f}s")
+
+    def get(self, job_id: str) -> Optional[LoginJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job: LoginJob, timeout: float = None) -> bool:
+        """Block until ``job`` finished (for callers that opted into a synchronous login)."""
+        return job.done.wait(timeout)
+
+    def _prune(self, now: float):
+        """Drop finished jobs older than ``retention`` (lock held)."""
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished and now - job.finished_at > self.retention]:
+            del self._jobs[job_id]
+
+    def stats(self) -> Dict:
+        """Queue occupancy and counters for health endpoints."""
+        with self._lock:
+            running = sum(1 for job in self._inflight.values() if job.status == JOB_RUNNING)
+            return dict(self._counters,
+                        running=running,
+                        queued=len(self._inflight) - running,
+                        max_workers=self.max_workers,
+                        max_queue=self.max_queue)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+class EventLoopThread:
+    """
+    One asyncio loop running in a daemon thread for the whole process.
+
+    Synchronous code submits coroutines with ``run`` instead of creating
+    (and tearing down) a new event loop for every call. The thread starts
+    on first use, so importing a module that owns one before a server
+    forks its workers is safe.
+    """
+
+    def __init__(self, name: str = 'asyncio-loop'):
+        self.name = name
+        self.loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self.loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self.loop.run_forever, name=self.name, daemon=True)
+                self._thread.start()
+
+    def run(self, coro, timeout: float = None) -> Any:
+        """Run ``coro`` on the loop thread and return its result."""
+        self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def stop(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
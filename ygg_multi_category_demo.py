@@ -10,6 +10,8 @@ import time
 import requests
 import cloudscraper
 import xml.etree.ElementTree as ET
+from ygg_bencode import verify_torrent_data
+from ygg_torrent_store import get_torrent_store
 
 
 def setup_session_with_cookies(cookie_string):
@@ -60,25 +62,32 @@ def download_sample_from_category(session, category_id, category_name, passkey):
                     # Download the torrent
                     download_url = f"https://www.yggtorrent.top/rss/download?id={torrent_id}&passkey={passkey}"
                     
+                    # Reuse a torrent fetched before (by any script) instead of downloading it again
+                    torrent_store = get_torrent_store()
+                    stored = torrent_store.lookup(torrent_id)
+                    if stored:
+                        print(f"  ♻️ Already in torrent store: {stored[0]}")
+                        return stored[0]
+                    
                     download_response = session.get(download_url, timeout=30)
                     
                     if download_response.status_code == 200:
                         content = download_response.content
                         
                         # Check if it's a torrent file
-                        if (content.startswith(b'd8:announce') or 
-                            content.startswith(b'd10:created') or
-                            b'announce' in content[:100]):
+                        metadata = verify_torrent_data(content)
+                        if metadata:
                             
                             # Save the torrent file
                             safe_title = "".join(c for c in torrent_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
                             torrent_filename = f"data/multi_{category_name}_{safe_title}.torrent"
                             
-                            with open(torrent_filename, 'wb') as f:
-                                f.write(content)
+                            stored_path, _ = torrent_store.put(content, torrent_id, download_url, torrent_title, category_name, metadata)
+                            torrent_store.link(stored_path, torrent_filename)
                             
                             print(f"  ✅ Downloaded: {torrent_filename}")
                             print(f"  📊 File size: {len(content)} bytes")
+                            print(f"  🧲 Info hash: {metadata.info_hash} ({metadata.file_count} files, {metadata.total_size} bytes)")
                             return torrent_filename
                         else:
                             print(f"  ❌ Downloaded content doesn't look like a torrent file")
@@ -12,17 +12,346 @@ import re
 import os
 import logging
 from urllib.parse import urljoin, urlparse
-from typing import List, Dict, Optional, Callable
+from typing import List, Dict, Optional, Callable, Iterable, Iterator, Tuple
 from bs4 import BeautifulSoup
 from datetime import datetime
+import mmap
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+from ygg_torrent_record import TorrentRecord, records_from_dicts, records_to_dicts, extract_torrent_id
+from ygg_feed_cache import FeedValidatorCache
+from ygg_seen_index import SeenIndex, DEFAULT_INDEX_PATH, torrent_key
+from ygg_sweep import SweepEngine, DEFAULT_REQUESTS_PER_SECOND
+from ygg_session_pool import create_session
+from ygg_auth_check import auth_validator
+import ygg_json
+from ygg_files import atomic_open, write_atomic
+from ygg_bencode import BencodeError, TorrentMetadata, parse_torrent, verify_torrent_file
+from ygg_torrent_store import TorrentStore, DEFAULT_STORE_ROOT
+from ygg_download_queue import DownloadQueue, DEFAULT_QUEUE_PATH, SLOWDOWN_STATUS, parse_retry_after
+import ygg_download_queue
+from ygg_concurrency import AIMDController, ERROR, OVERLOAD
 
-try:
-    import cloudscraper
-    CLOUDSCRAPER_AVAILABLE = True
-except ImportError:
-    CLOUDSCRAPER_AVAILABLE = False
+
+RSS_NAMESPACES = {
+    'rss': 'http://purl.org/rss/1.0/',
+    'atom': 'http://www.w3.org/2005/Atom',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'torrent': 'http://xmlns.ezrss.it/0.1/'
+}
+
+# Tags that close a torrent entry (plain RSS 2.0 and namespaced RSS 1.0)
+RSS_ITEM_TAGS = frozenset({'item', '{http://purl.org/rss/1.0/}item'})
+
+# Root element of an RSS 2.0 / RSS 1.0 document; anything else is an error or challenge page
+RSS_ROOT_TAGS = frozenset({'rss', '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}RDF'})
+
+# Bytes requested per read when streaming a feed
+RSS_STREAM_CHUNK_SIZE = 16384
+
+# .torrent bodies up to this size (by Content-Length) are read in one call; larger ones are streamed
+TORRENT_MEMORY_LIMIT = int(os.getenv('YGG_TORRENT_MEMORY_LIMIT', str(1024 * 1024)))
+
+# Bytes per read (and progress callback) when streaming a large .torrent body
+TORRENT_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Item child tag -> torrent field, resolved once so extraction is a single walk
+_RSS1 = f"{{{RSS_NAMESPACES['rss']}}}"
+_TORRENT = f"{{{RSS_NAMESPACES['torrent']}}}"
+RSS_FIELD_TAGS = {
+    'title': 'title',
+    'description': 'description',
+    'link': 'link',
+    'guid': 'guid',
+    'pubDate': 'pub_date',
+    'category': 'category',
+    f'{_RSS1}title': 'title',
+    f'{_RSS1}description': 'description',
+    f'{_RSS1}link': 'link',
+    f'{_TORRENT}link': 'torrent_link',
+    f'{_TORRENT}infoHash': 'info_hash',
+    f'{_TORRENT}size': 'size',
+    f'{_TORRENT}seeds': 'seeds',
+    f'{_TORRENT}peers': 'peers',
+}
+RSS_FIELDS = ('title', 'description', 'link', 'guid', 'torrent_link', 'info_hash',
+              'size', 'seeds', 'peers', 'pub_date', 'category')
+
+# YGG feeds only expose stats inside the French CDATA description and the title
+DESCRIPTION_SIZE_RE = re.compile(r"Taille de l'upload:\s*([\d.,]+)\s*([KMGT]?[oB])", re.IGNORECASE)
+DESCRIPTION_STATUS_RE = re.compile(r"Status:\s*(\d+)\s*seeders?\s*et\s*(\d+)\s*leechers?", re.IGNORECASE)
+DESCRIPTION_ADDED_RE = re.compile(r"Ajouté le:\s*(\d{2})/(\d{2})/(\d{4})\s+(\d{2}):(\d{2}):(\d{2})")
+TITLE_STATS_RE = re.compile(r"\(S:(\d+)/L:(\d+)\)\s*$")
+SIZE_UNITS = {
+    'O': 1, 'B': 1,
+    'KO': 1024, 'KB': 1024,
+    'MO': 1024 ** 2, 'MB': 1024 ** 2,
+    'GO': 1024 ** 3, 'GB': 1024 ** 3,
+    'TO': 1024 ** 4, 'TB': 1024 ** 4,
+}
+
+
+# Body snippets of Cloudflare "Just a moment..." interstitials
+CLOUDFLARE_CHALLENGE_MARKERS = (b'Just a moment', b'cf-chl', b'challenge-platform')
+
+# Module-level parsing logs through the same logger as YGGParserWithDownloads instances
+logger = logging.getLogger('ygg_parser_downloads')
+
+
+class FeedParseError(ValueError):
+    """A feed body is not a complete RSS document (HTML error page, Cloudflare challenge, cut-off XML)."""
+
+
+class TorrentPayloadError(ValueError):
+    """A downloaded body is not a complete .torrent file (login page, truncated transfer)."""
+
+
+class CloudflareChallengeError(TorrentPayloadError):
+    """The tracker answered with a Cloudflare challenge instead of the file (it is shedding load)."""
+
+
+def is_cloudflare_challenge(response, head: bytes = b'') -> bool:
+    """Whether a response (or the first bytes of its body) is a Cloudflare challenge page."""
+    if response.headers.get('cf-mitigated') == 'challenge':
+        return True
+    return not head.startswith(b'd') and any(marker in head for marker in CLOUDFLARE_CHALLENGE_MARKERS)
+
+
+def download_outcome(error: BaseException) -> str:
+    """
+    How a failed .torrent request counts for the concurrency controller.
+    
+    429, 5xx, timeouts and Cloudflare challenges mean the tracker is
+    overloaded; anything else (404, invalid body, reset connection) is an error.
+    """
+    if isinstance(error, (CloudflareChallengeError, requests.exceptions.Timeout)):
+        return OVERLOAD
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return OVERLOAD if status == 429 or status >= 500 else ERROR
+    return ERROR
+
+
+def check_torrent_payload(data, expected_size: int = 0) -> TorrentMetadata:
+    """
+    Validate a downloaded .torrent body and read its metadata.
+
+    YGG answers expired sessions with an HTML page and status 200, and a
+    dropped connection truncates the bencoded data; both fail here instead
+    of being saved as a .torrent file.
+
+    Args:
+        data: The body as bytes or an mmap of the written file
+        expected_size: Content-Length, if the server sent one
+
+    Returns:
+        The torrent's metadata (info-hash, total size, file count, ...)
+
+    Raises:
+        TorrentPayloadError: If the body is not a complete torrent
+    """
+    if expected_size and len(data) != expected_size:
+        raise TorrentPayloadError(f"truncated: {len(data)} of {expected_size} bytes")
+    try:
+        return parse_torrent(data)
+    except BencodeError as e:
+        raise TorrentPayloadError(str(e)) from None
+
+
+def extract_torrent_info(item) -> Optional[TorrentRecord]:
+    """
+    Extract torrent information from an RSS item.
+    
+    The item subtree is walked once and every known tag is mapped through
+    ``RSS_FIELD_TAGS``. As with ``find('.//tag')`` the first matching
+    element in document order wins.
+    """
+    try:
+        found = {}
+        enclosure = None
+        for child in item.iter():
+            field = RSS_FIELD_TAGS.get(child.tag)
+            if field is None:
+                if child.tag == 'enclosure' and enclosure is None:
+                    enclosure = (child.get('url'), child.get('length'))
+                continue
+            if field in found:
+                continue
+            text = child.text
+            found[field] = text.strip() if text else None
+        
+        torrent_info = {field: found.get(field) for field in RSS_FIELDS}
+        
+        enclosure_length = None
+        if enclosure:
+            enclosure_url, enclosure_length = enclosure
+            if not torrent_info['torrent_link'] and enclosure_url:
+                torrent_info['torrent_link'] = enclosure_url
+        
+        decode_torrent_stats(torrent_info, enclosure_length)
+        torrent_info['parsed_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        
+        return TorrentRecord.from_dict(torrent_info)
+        
+    except Exception as e:
+        logger.error(f"⚠ Error extracting torrent info: {e}")
+        return None
+
+
+def decode_torrent_stats(torrent_info: Dict, enclosure_length: Optional[str] = None) -> Dict:
+    """
+    Fill typed ``size_bytes``, ``seeders``, ``leechers`` and ``added_at`` fields.
+    
+    Sources are tried from most to least precise: the enclosure length,
+    the ``torrent:`` namespace elements, the CDATA description and
+    finally the ``(S:x/L:y)`` title suffix. Missing values stay ``None``.
+    """
+    description = torrent_info.get('description') or ''
+    
+    size_bytes = None
+    if enclosure_length and enclosure_length.isdigit():
+        size_bytes = int(enclosure_length)
+    else:
+        size = torrent_info.get('size')
+        if size and size.isdigit():
+            size_bytes = int(size)
+        else:
+            match = DESCRIPTION_SIZE_RE.search(description)
+            if match:
+                number, unit = match.groups()
+                size_bytes = int(float(number.replace(',', '.')) * SIZE_UNITS[unit.upper()])
+    
+    seeders = leechers = None
+    match = DESCRIPTION_STATUS_RE.search(description)
+    if match:
+        seeders, leechers = int(match.group(1)), int(match.group(2))
+    else:
+        seeds = torrent_info.get('seeds')
+        if seeds and seeds.isdigit():
+            seeders = int(seeds)
+        match = TITLE_STATS_RE.search(torrent_info.get('title') or '')
+        if match:
+            if seeders is None:
+                seeders = int(match.group(1))
+            leechers = int(match.group(2))
+    
+    added_at = None
+    match = DESCRIPTION_ADDED_RE.search(description)
+    if match:
+        day, month, year, hour, minute, second = map(int, match.groups())
+        try:
+            added_at = datetime(year, month, day, hour, minute, second)
+        except ValueError:
+            added_at = None
+    
+    torrent_info['size_bytes'] = size_bytes
+    torrent_info['seeders'] = seeders
+    torrent_info['leechers'] = leechers
+    torrent_info['added_at'] = added_at
+    return torrent_info
+
+
+class RSSStreamParser:
+    """
+    Incremental RSS parser: ``feed`` raw bytes as they arrive and get back
+    the torrents whose ``</item>`` they completed.
+    
+    Shared by ``iter_parse_rss`` and the asyncio client so both extract
+    items the same way. Each ``<item>`` is cleared and detached from its
+    parent once it has been extracted, so memory stays bounded by a single
+    item no matter how long the feed is.
+    """
+    
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=('start', 'end'))
+        self._stack = []
+        self.count = 0
+    
+    def feed(self, chunk: bytes) -> List[TorrentRecord]:
+        """
+        Parse the next chunk of the feed.
+        
+        Returns:
+            Torrent records completed by this chunk, in feed order
+        
+        Raises:
+            FeedParseError: If the content is not well-formed XML or not an RSS document
+        """
+        try:
+            self._parser.feed(chunk)
+            return self._drain()
+        except ET.ParseError as e:
+            raise FeedParseError(str(e)) from None
+    
+    def close(self) -> List[TorrentRecord]:
+        """
+        Finish the feed and return the last completed torrents.
+        
+        Raises:
+            FeedParseError: If the document is incomplete
+        """
+        try:
+            self._parser.close()
+            return self._drain()
+        except ET.ParseError as e:
+            raise FeedParseError(str(e)) from None
+    
+    def _drain(self) -> List[TorrentRecord]:
+        """Consume pending pull-parser events and return completed items."""
+        torrents = []
+        stack = self._stack
+        for event, element in self._parser.read_events():
+            if event == 'start':
+                # Well-formed but not a feed (an XHTML error page): stop at its first tag
+                if not stack and element.tag not in RSS_ROOT_TAGS:
+                    raise FeedParseError(f"not an RSS feed (root element <{element.tag}>)")
+                stack.append(element)
+                continue
+            
+            stack.pop()
+            if element.tag not in RSS_ITEM_TAGS:
+                continue
+            
+            torrent_info = extract_torrent_info(element)
+            
+            # Drop the finished item so the tree does not grow with the feed
+            element.clear()
+            if stack:
+                stack[-1].remove(element)
+            
+            if torrent_info:
+                torrents.append(torrent_info)
+        
+        self.count += len(torrents)
+        return torrents
+
+
+def iter_parse_rss(chunks: Iterable[bytes], strict: bool = False) -> Iterator[TorrentRecord]:
+    """
+    Incrementally parse RSS content and yield torrents as items close.
+    
+    Args:
+        chunks: Iterable of raw feed bytes (e.g. ``response.iter_content()``)
+        strict: Raise ``FeedParseError`` when the body is not a complete RSS
+            document, instead of logging it and ending the items early
+        
+    Yields:
+        Torrent records in feed order
+    """
+    parser = RSSStreamParser()
+    
+    try:
+        for chunk in chunks:
+            if chunk:
+                yield from parser.feed(chunk)
+        yield from parser.close()
+    except FeedParseError as e:
+        if strict:
+            raise
+        logger.error(f"⚠ XML parsing error after {parser.count} items: {e}")
+        return
+    
+    logger.info(f"📋 Streamed {parser.count} items from RSS feed")
 
 
 class YGGParserWithDownloads:
@@ -33,7 +362,18 @@ class YGGParserWithDownloads:
         self.session = None
         self.authenticated = False
         self.cookies = {}
+        self.cookie_store = None
+        self._cookie_jar = None
         self.download_dir = "downloads"
+        self.feed_cache = FeedValidatorCache()
+        self.seen_index_path = DEFAULT_INDEX_PATH
+        self._seen_index = None
+        self.torrent_store_root = DEFAULT_STORE_ROOT
+        self._torrent_store = None
+        self._torrent_store_lock = threading.Lock()
+        self.download_queue_path = DEFAULT_QUEUE_PATH
+        self._download_queue = None
+        self.download_controller = AIMDController()
         self.logger = self._setup_logging()
         self._setup_session()
         self._create_directories()
@@ -65,32 +405,39 @@ class YGGParserWithDownloads:
     
     def _setup_session(self):
         """Setup session with cloudscraper."""
-        if CLOUDSCRAPER_AVAILABLE:
-            try:
-                self.session = cloudscraper.create_scraper(
-                    browser={
-                        'browser': 'chrome',
-                        'platform': 'linux',
-                        'mobile': False
-                    }
-                )
-                self.logger.info("✅ Using cloudscraper session")
-            except Exception as e:
-                self.logger.warning(f"⚠ Cloudscraper failed: {e}")
-                self.session = requests.Session()
-        else:
-            self.session = requests.Session()
-        
-        # Set headers
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
+        self.session = self._create_session()
+    
+    def _create_session(self):
+        """Create a cloudscraper (or plain requests) session with browser headers and pooled adapters."""
+        return create_session()
+    
+    def _clone_session(self):
+        """New session carrying the current authentication cookies, for worker threads."""
+        session = self._create_session()
+        session.cookies.update(self.session.cookies)
+        return session
+    
+    @property
+    def seen_index(self) -> SeenIndex:
+        """Persistent seen-torrent index, opened on first use."""
+        if self._seen_index is None:
+            self._seen_index = SeenIndex(self.seen_index_path)
+        return self._seen_index
+    
+    @property
+    def torrent_store(self) -> TorrentStore:
+        """Content-addressed .torrent store (one copy per info-hash), opened on first use."""
+        with self._torrent_store_lock:
+            if self._torrent_store is None:
+                self._torrent_store = TorrentStore(self.torrent_store_root)
+            return self._torrent_store
+    
+    @property
+    def download_queue(self) -> DownloadQueue:
+        """Persistent download queue (per-torrent state and retries), opened on first use."""
+        if self._download_queue is None:
+            self._download_queue = DownloadQueue(self.download_queue_path)
+        return self._download_queue
     
     def _create_directories(self):
         """Create necessary directories."""
@@ -113,34 +460,76 @@ class YGGParserWithDownloads:
         self.cookies = cookies
         self.logger.info(f"✅ Set {len(cookies)} cookies")
         
-        # Test authentication
+        # Test authentication (probe cached per cookie set, stops at the first logout marker)
         try:
             test_url = f"{self.base_url}/"
-            response = self.session.get(test_url, timeout=30)
+            authenticated, status_code, cache_status, _ = auth_validator.validate(self.session, cookies, test_url)
             
-            if response.status_code == 200:
-                if "login" not in response.text.lower() or "logout" in response.text.lower():
+            if status_code in (200, 206):
+                if authenticated:
                     self.authenticated = True
-                    self.logger.info("✅ Cookie authentication successful!")
+                    self.logger.info(f"✅ Cookie authentication successful! ({cache_status})")
                     return True
                 else:
                     self.logger.error("❌ Cookie authentication failed - still showing login page")
                     return False
             else:
-                self.logger.error(f"❌ Cookie authentication test failed with status {response.status_code}")
+                self.logger.error(f"❌ Cookie authentication test failed with status {status_code}")
                 return False
                 
         except Exception as e:
             self.logger.error(f"❌ Cookie authentication test error: {e}")
             return False
     
+    def use_cookie_store(self, store) -> bool:
+        """
+        Take cookies from a ``CookieStore`` instead of a fixed cookie string.
+        
+        The store renews its jar in the background; the parser switches to
+        a new jar on its next request without a login on the request path.
+        
+        Returns:
+            True if the store already holds a jar
+        """
+        self.cookie_store = store
+        return self._sync_cookie_store()
+    
+    def _sync_cookie_store(self) -> bool:
+        """Swap in the store's jar if it changed since the last request."""
+        if self.cookie_store is None:
+            return self.authenticated
+        
+        jar = self.cookie_store.current()
+        if jar is None or jar is self._cookie_jar:
+            return self.authenticated
+        
+        # Build the new session aside and replace it in one assignment so
+        # requests already running keep the session (and jar) they started with
+        session = self._create_session()
+        session.cookies.update(jar.cookies)
+        self.session, self.cookies, self._cookie_jar = session, dict(jar.cookies), jar
+        self.authenticated = True
+        self.logger.info(f"🍪 Using cookie jar v{jar.version} ({len(jar.cookies)} cookies)")
+        return True
+    
+    def _report_forbidden(self):
+        """Mark the session unauthenticated and ask the cookie store for a fresh jar."""
+        self.authenticated = False
+        if self.cookie_store is not None:
+            self.cookie_store.report_forbidden(self._cookie_jar)
+    
+    def _build_rss_url(self, subcat_id: int, passkey: str) -> str:
+        """Build the RSS URL for a subcategory."""
+        return f"{self.base_url}/rss?action=generate&type=subcat&id={subcat_id}&passkey={passkey}"
+    
     def get_rss_feed(self, subcat_id: int, passkey: str) -> Optional[str]:
         """Fetch RSS feed content."""
+        self._sync_cookie_store()
         if not self.authenticated:
             self.logger.error("❌ Not authenticated. Please authenticate first.")
             return None
         
-        rss_url = f"{self.base_url}/rss?action=generate&type=subcat&id={subcat_id}&passkey={passkey}"
+        rss_url = self._build_rss_url(subcat_id, passkey)
         
         self.logger.info(f"📡 Fetching RSS feed: {rss_url}")
         
@@ -161,7 +550,7 @@ class YGGParserWithDownloads:
                     
             elif response.status_code == 403:
                 self.logger.error("❌ 403 Forbidden - authentication may have expired")
-                self.authenticated = False
+                self._report_forbidden()
             else:
                 self.logger.error(f"❌ Unexpected status code: {response.status_code}")
                 
@@ -170,20 +559,89 @@ class YGGParserWithDownloads:
         
         return None
     
-    def parse_rss_feed(self, rss_content: str) -> List[Dict]:
+    def poll_rss_feed(self, subcat_id: int, passkey: str) -> Optional[List[TorrentRecord]]:
+        """
+        Conditionally fetch and parse an RSS feed for repeated polling.
+        
+        The ETag / Last-Modified validators from the previous poll are sent
+        back. A 304 or a body identical to the last one means "no new items"
+        and the XML is not parsed at all.
+        
+        Returns:
+            Parsed torrents when the feed changed, an empty list when it is
+            unchanged, or None on error
+        """
+        self._sync_cookie_store()
+        if not self.authenticated:
+            self.logger.error("❌ Not authenticated. Please authenticate first.")
+            return None
+        
+        rss_url = self._build_rss_url(subcat_id, passkey)
+        headers = self.feed_cache.conditional_headers(rss_url)
+        
+        try:
+            response = self.session.get(rss_url, timeout=30, headers=headers)
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"❌ Request error: {e}")
+            return None
+        
+        if response.status_code == 403:
+            self.logger.error("❌ 403 Forbidden - authentication may have expired")
+            self._report_forbidden()
+            return None
+        if response.status_code not in (200, 304):
+            self.logger.error(f"❌ Unexpected status code: {response.status_code}")
+            return None
+        
+        digest = self.feed_cache.check(rss_url, response)
+        if digest is None:
+            self.logger.info(f"🔁 Subcategory {subcat_id} unchanged (HTTP {response.status_code})")
+            return []
+        
+        torrents = self.parse_rss_feed(response.text)
+        self.feed_cache.store(rss_url, response, digest, torrents)
+        return torrents
+    
+    def iter_new_items(self, subcat_id: int, passkey: str) -> Iterator[TorrentRecord]:
+        """
+        Yield only torrents that were never seen before in any previous run.
+        
+        Builds on ``poll_rss_feed`` so an unchanged feed costs one conditional
+        request, and on the persistent ``seen_index`` so downstream filtering
+        and downloading only ever handle new items. An unchanged feed is not
+        parsed again, but its last parsed items are still checked, so
+        torrents left unseen by an earlier run come back.
+        
+        A torrent is marked as seen once the consumer asks for the next one
+        (or the loop ends), so items the consumer failed on or never reached
+        are yielded again on the next run.
+        
+        Args:
+            subcat_id: Subcategory ID
+            passkey: User passkey
+            
+        Yields:
+            Unseen torrent records, in feed order
+        """
+        torrents = self.poll_rss_feed(subcat_id, passkey)
+        if torrents is None:
+            return
+        if not torrents:
+            torrents = self.feed_cache.payload(self._build_rss_url(subcat_id, passkey)) or []
+        
+        new_torrents = self.seen_index.peek_new(torrents)
+        self.logger.info(f"🆕 {len(new_torrents)} new of {len(torrents)} torrents in subcategory {subcat_id}")
+        for torrent in new_torrents:
+            yield torrent
+            self.seen_index.mark_seen((torrent,), subcat_id)
+    
+    def parse_rss_feed(self, rss_content: str) -> List[TorrentRecord]:
         """Parse RSS feed content and extract torrent information."""
         torrents = []
         
         try:
             root = ET.fromstring(rss_content)
             
-            namespaces = {
-                'rss': 'http://purl.org/rss/1.0/',
-                'atom': 'http://www.w3.org/2005/Atom',
-                'dc': 'http://purl.org/dc/elements/1.1/',
-                'torrent': 'http://xmlns.ezrss.it/0.1/'
-            }
-            
             items = root.findall('.//item')
             if not items:
                 items = root.findall('.//{http://purl.org/rss/1.0/}item')
@@ -191,7 +649,7 @@ class YGGParserWithDownloads:
             self.logger.info(f"📋 Found {len(items)} items in RSS feed")
             
             for item in items:
-                torrent_info = self._extract_torrent_info(item, namespaces)
+                torrent_info = extract_torrent_info(item)
                 if torrent_info:
                     torrents.append(torrent_info)
                     
@@ -201,45 +659,91 @@ class YGGParserWithDownloads:
         
         return torrents
     
-    def _extract_torrent_info(self, item, namespaces: Dict) -> Optional[Dict]:
-        """Extract torrent information from an RSS item."""
-        try:
-            title = self._get_text(item, 'title')
-            description = self._get_text(item, 'description')
-            link = self._get_text(item, 'link')
-            guid = self._get_text(item, 'guid')
-            
-            torrent_link = self._get_text(item, 'torrent:link', namespaces)
-            torrent_info_hash = self._get_text(item, 'torrent:infoHash', namespaces)
-            torrent_size = self._get_text(item, 'torrent:size', namespaces)
-            torrent_seeds = self._get_text(item, 'torrent:seeds', namespaces)
-            torrent_peers = self._get_text(item, 'torrent:peers', namespaces)
-            
-            pub_date = self._get_text(item, 'pubDate')
-            category = self._get_text(item, 'category')
-            
-            torrent_info = {
-                'title': title,
-                'description': description,
-                'link': link,
-                'guid': guid,
-                'torrent_link': torrent_link,
-                'info_hash': torrent_info_hash,
-                'size': torrent_size,
-                'seeds': torrent_seeds,
-                'peers': torrent_peers,
-                'pub_date': pub_date,
-                'category': category,
-                'parsed_at': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'downloaded': False,
-                'download_path': None
-            }
+    def iter_parse_rss(self, chunks: Iterable[bytes]) -> Iterator[TorrentRecord]:
+        """Incrementally parse RSS content and yield torrents as items close (see ``iter_parse_rss``)."""
+        return iter_parse_rss(chunks)
+    
+    def iter_rss_feed(self, subcat_id: int, passkey: str,
+                      chunk_size: int = RSS_STREAM_CHUNK_SIZE, session=None) -> Iterator[TorrentRecord]:
+        """
+        Stream an RSS feed and yield torrents while it is still downloading.
+        
+        Unlike ``get_rss_feed`` + ``parse_rss_feed`` the response body, the
+        XML tree and the torrent list are never held in memory at once.
+        
+        Args:
+            subcat_id: Subcategory ID
+            passkey: User passkey
+            chunk_size: Number of bytes read from the socket per chunk
+            session: Session to use instead of ``self.session`` (sweep workers)
             
-            return torrent_info
+        Yields:
+            Torrent records as soon as each ``</item>`` is received
+        """
+        self._sync_cookie_store()
+        if not self.authenticated:
+            self.logger.error("❌ Not authenticated. Please authenticate first.")
+            return
+        
+        rss_url = self._build_rss_url(subcat_id, passkey)
+        self.logger.info(f"📡 Streaming RSS feed: {rss_url}")
+        
+        try:
+            with (session or self.session).get(rss_url, timeout=30, stream=True) as response:
+                self.logger.info(f"📊 RSS response status: {response.status_code}")
+                
+                if response.status_code == 403:
+                    self.logger.error("❌ 403 Forbidden - authentication may have expired")
+                    self._report_forbidden()
+                    return
+                if response.status_code != 200:
+                    self.logger.error(f"❌ Unexpected status code: {response.status_code}")
+                    return
+                
+                yield from self.iter_parse_rss(response.iter_content(chunk_size=chunk_size))
+                
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"❌ Request error: {e}")
+    
+    def sweep_categories(self, passkey: str,
+                         categories_file: str = 'data/extracted_categories_simple.json',
+                         max_workers: int = 1,
+                         requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND) -> Iterator[TorrentRecord]:
+        """
+        Stream every subcategory listed in a categories file.
+        
+        Each feed is consumed through ``iter_rss_feed`` so peak memory stays
+        flat regardless of how many categories are swept. With
+        ``max_workers > 1`` feeds are fetched concurrently by a
+        ``SweepEngine`` and items arrive interleaved as they are parsed.
+        
+        Args:
+            passkey: User passkey
+            categories_file: JSON file keyed by subcategory ID
+            max_workers: Number of feeds fetched at the same time
+            requests_per_second: Ceiling on requests to the tracker
             
-        except Exception as e:
-            self.logger.error(f"⚠ Error extracting torrent info: {e}")
-            return None
+        Yields:
+            Torrent records from every subcategory
+        """
+        with open(categories_file, 'r', encoding='utf-8') as f:
+            categories = json.load(f)
+        
+        self.logger.info(f"🧹 Sweeping {len(categories)} subcategories from {categories_file}")
+        
+        if max_workers <= 1:
+            for subcat_id in categories:
+                yield from self.iter_rss_feed(int(subcat_id), passkey)
+            return
+        
+        engine = SweepEngine(self._clone_session, max_workers=max_workers,
+                             requests_per_second=requests_per_second)
+        feeds = engine.run(
+            (int(subcat_id) for subcat_id in categories),
+            lambda session, subcat_id: self.iter_rss_feed(subcat_id, passkey, session=session)
+        )
+        for _, torrent in feeds:
+            yield torrent
     
     def _get_text(self, element, tag: str, namespaces: Dict = None) -> Optional[str]:
         """Safely extract text from XML element."""
@@ -257,7 +761,7 @@ class YGGParserWithDownloads:
         except:
             return None
     
-    def _parse_html_fallback(self, content: str) -> List[Dict]:
+    def _parse_html_fallback(self, content: str) -> List[TorrentRecord]:
         """Fallback parser for HTML content."""
         torrents = []
         try:
@@ -265,13 +769,11 @@ class YGGParserWithDownloads:
             torrent_links = soup.find_all('a', href=re.compile(r'\.torrent$'))
             
             for link in torrent_links:
-                torrent_info = {
+                torrent_info = TorrentRecord.from_dict({
                     'title': link.get_text(strip=True),
                     'torrent_link': urljoin(self.base_url, link.get('href', '')),
-                    'parsed_at': time.strftime('%Y-%m-%d %H:%M:%S'),
-                    'downloaded': False,
-                    'download_path': None
-                }
+                    'parsed_at': time.strftime('%Y-%m-%d %H:%M:%S')
+                })
                 torrents.append(torrent_info)
                 
         except Exception as e:
@@ -292,73 +794,181 @@ class YGGParserWithDownloads:
         Returns:
             Path to downloaded file or None if failed
         """
+        result = self.download_torrent(torrent_url, filename, progress_callback)
+        return result[0] if result else None
+    
+    def download_torrent(self, torrent_url: str, filename: str = None,
+                         progress_callback: Callable = None,
+                         torrent: Dict = None) -> Optional[Tuple[str, TorrentMetadata]]:
+        """
+        Download and validate a single torrent file.
+        
+        Like ``download_torrent_file`` but also returns the metadata read
+        from the file (info-hash, total size, file count, piece length).
+        An existing file is only reused if it is a valid torrent. Torrents
+        already in ``torrent_store`` are linked instead of downloaded, and
+        new downloads are added to it.
+        
+        Args:
+            torrent_url: URL of the torrent file
+            filename: Optional custom filename
+            progress_callback: Optional callback for progress updates
+            torrent: Optional torrent record, indexed with its ID, title and category
+        
+        Returns:
+            ``(path, metadata)`` or None if failed
+        """
+        try:
+            return self._fetch_torrent(torrent_url, filename, progress_callback, torrent)
+        except TorrentPayloadError as e:
+            self.logger.error(f"❌ Invalid torrent file from {torrent_url}: {e}")
+            return None
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"❌ Error downloading torrent file: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"❌ Unexpected error downloading torrent: {e}")
+            return None
+    
+    def _fetch_torrent(self, torrent_url: str, filename: str = None,
+                       progress_callback: Callable = None,
+                       torrent: Dict = None) -> Optional[Tuple[str, TorrentMetadata]]:
+        """
+        ``download_torrent`` without the error handling, for callers that retry.
+        
+        Returns:
+            ``(path, metadata)`` or None if not authenticated
+        
+        Raises:
+            TorrentPayloadError: If the body is not a complete torrent
+            requests.exceptions.RequestException: On network and HTTP errors
+        """
+        torrent = torrent or {}
+        torrent_id = torrent.get('id') or extract_torrent_id(torrent_url)
+        
+        # Generate filename if not provided
+        if not filename:
+            parsed_url = urlparse(torrent_url)
+            filename = os.path.basename(parsed_url.path)
+            if not filename or not filename.endswith('.torrent'):
+                filename = f"torrent_{int(time.time())}.torrent"
+        
+        # Ensure filename is safe
+        filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+        if not filename.endswith('.torrent'):
+            filename += '.torrent'
+        
+        filepath = os.path.join(self.download_dir, filename)
+        
+        # Check if file already exists
+        if os.path.exists(filepath):
+            metadata = verify_torrent_file(filepath)
+            if metadata:
+                self.logger.info(f"📁 File already exists: {filepath}")
+                self.torrent_store.adopt(filepath, metadata, torrent_id, torrent_url,
+                                         torrent.get('title'), torrent.get('category'))
+                return filepath, metadata
+            self.logger.warning(f"⚠ Existing file is not a valid torrent, downloading again: {filepath}")
+        
+        # Same torrent fetched before (any file name, any download URL)
+        stored = self.torrent_store.lookup(torrent_id, torrent_url)
+        if stored:
+            stored_path, metadata = stored
+            self.torrent_store.link(stored_path, filepath)
+            self.logger.info(f"♻️ Already in torrent store: {filepath} (info hash {metadata.info_hash})")
+            return filepath, metadata
+        
+        self._sync_cookie_store()
         if not self.authenticated:
             self.logger.error("❌ Not authenticated. Please authenticate first.")
             return None
         
-        try:
-            # Generate filename if not provided
-            if not filename:
-                parsed_url = urlparse(torrent_url)
-                filename = os.path.basename(parsed_url.path)
-                if not filename or not filename.endswith('.torrent'):
-                    filename = f"torrent_{int(time.time())}.torrent"
-            
-            # Ensure filename is safe
-            filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-            if not filename.endswith('.torrent'):
-                filename += '.torrent'
-            
-            filepath = os.path.join(self.download_dir, filename)
-            
-            # Check if file already exists
-            if os.path.exists(filepath):
-                self.logger.info(f"📁 File already exists: {filepath}")
-                return filepath
-            
-            self.logger.info(f"⬇️ Downloading: {filename}")
-            
-            # Download with progress tracking
-            response = self.session.get(torrent_url, timeout=30, stream=True)
+        self.logger.info(f"⬇️ Downloading: {filename}")
+        
+        # Each request holds a slot of the adaptive concurrency limit while it runs
+        with self.download_controller.slot(download_outcome), \
+                self.session.get(torrent_url, timeout=30, stream=True) as response:
+            if is_cloudflare_challenge(response):
+                raise CloudflareChallengeError(f"Cloudflare challenge (HTTP {response.status_code})")
             response.raise_for_status()
             
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded_size = 0
+            # Compressed bodies are measured after decoding, so only trust identity lengths
+            total_size = int(response.headers.get('content-length') or 0)
+            if response.headers.get('content-encoding', 'identity') != 'identity':
+                total_size = 0
             
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-                        
-                        # Call progress callback if provided
-                        if progress_callback and total_size > 0:
-                            progress = (downloaded_size / total_size) * 100
-                            progress_callback(filename, progress, downloaded_size, total_size)
+            if 0 < total_size <= TORRENT_MEMORY_LIMIT:
+                # Typical 10-100 KB torrent: one read, one write, one callback
+                data = response.content
+                if is_cloudflare_challenge(response, data[:4096]):
+                    raise CloudflareChallengeError("Cloudflare challenge page instead of the torrent")
+                metadata = check_torrent_payload(data, total_size)
+                write_atomic(filepath, data)
+                if progress_callback:
+                    progress_callback(filename, 100.0, len(data), total_size)
+            else:
+                metadata = self._stream_torrent_file(response, filepath, filename, total_size, progress_callback)
+        
+        # Keep one copy per info-hash; filepath becomes a link to it
+        self.torrent_store.adopt(filepath, metadata, torrent_id, torrent_url,
+                                 torrent.get('title'), torrent.get('category'))
+        
+        self.logger.info(f"✅ Downloaded: {filepath} (info hash {metadata.info_hash})")
+        return filepath, metadata
+    
+    def _stream_torrent_file(self, response, filepath: str, filename: str, total_size: int,
+                             progress_callback: Callable = None) -> TorrentMetadata:
+        """Stream a large or unsized .torrent body to ``filepath`` (visible only once complete)."""
+        downloaded_size = 0
+        
+        with atomic_open(filepath) as f:
+            for chunk in response.iter_content(chunk_size=TORRENT_STREAM_CHUNK_SIZE):
+                if not chunk:
+                    continue
+                if not downloaded_size and not chunk.startswith(b'd'):
+                    # Stop early on an HTML page instead of streaming all of it
+                    if is_cloudflare_challenge(response, chunk):
+                        raise CloudflareChallengeError("Cloudflare challenge page instead of the torrent")
+                    raise TorrentPayloadError(f"not a torrent file (starts with {chunk[:15]!r})")
+                f.write(chunk)
+                downloaded_size += len(chunk)
+                
+                if progress_callback and total_size > 0:
+                    progress = (downloaded_size / total_size) * 100
+                    progress_callback(filename, progress, downloaded_size, total_size)
             
-            self.logger.info(f"✅ Downloaded: {filepath}")
-            return filepath
+            if not downloaded_size:
+                raise TorrentPayloadError("empty body")
             
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"❌ Error downloading torrent file: {e}")
-            return None
-        except Exception as e:
-            self.logger.error(f"❌ Unexpected error downloading torrent: {e}")
-            return None
+            # Validate the written bytes in place; raising inside the block discards the temporary file
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                return check_torrent_payload(view, total_size)
     
-    def download_torrents_batch(self, torrents: List[Dict], max_workers: int = 3,
+    def download_torrents_batch(self, torrents: List[Dict], max_workers: int = None,
                               filter_func: Callable = None) -> Dict[str, str]:
         """
-        Download multiple torrent files in parallel.
+        Download multiple torrent files in parallel through ``download_queue``.
+        
+        Torrents are queued by ID, so an interrupted batch resumes where it
+        stopped when it is run again: finished torrents are not downloaded
+        again and items left pending by earlier runs are picked up too.
+        Failed attempts are retried ``config.MAX_RETRIES`` times with
+        exponential backoff, and a 429/503 pauses every worker.
+        
+        The number of concurrent downloads is set by ``download_controller``:
+        it grows while downloads stay fast and error-free and halves on
+        429s, 5xx responses, timeouts and Cloudflare challenges.
         
         Args:
-            torrents: List of torrent dictionaries
-            max_workers: Maximum number of concurrent downloads
+            torrents: List of torrent records (or dictionaries)
+            max_workers: Upper bound on concurrent downloads (default: ``YGG_DOWNLOAD_MAX_CONCURRENCY``)
             filter_func: Optional function to filter which torrents to download
             
         Returns:
-            Dictionary mapping torrent titles to download paths
+            Dictionary mapping torrent IDs to download paths (None if failed)
         """
+        self._sync_cookie_store()
         if not self.authenticated:
             self.logger.error("❌ Not authenticated. Please authenticate first.")
             return {}
@@ -374,59 +984,130 @@ class YGGParserWithDownloads:
             self.logger.warning("⚠ No downloadable torrents found")
             return {}
         
-        self.logger.info(f"🚀 Starting batch download of {len(downloadable_torrents)} torrents")
+        keys = self.download_queue.enqueue(downloadable_torrents)
+        self.logger.info(f"🚀 Starting batch download of {len(keys)} torrents")
         
-        results = {}
+        self._run_download_queue(max_workers, dict(zip(keys, downloadable_torrents)))
+        results = self.download_queue.results(keys)
         
-        def download_worker(torrent):
-            """Worker function for downloading a single torrent."""
-            title = torrent.get('title', 'Unknown')
-            torrent_url = torrent['torrent_link']
+        successful_downloads = sum(1 for path in results.values() if path)
+        metrics = self.download_controller.metrics()
+        self.logger.info(f"🎉 Batch download completed: {successful_downloads}/{len(keys)} successful "
+                         f"(concurrency {metrics['concurrency']}, peak {metrics['peak_concurrency']}, "
+                         f"{metrics['throughput_per_second']:.2f} torrents/s)")
+        
+        return results
+    
+    def resume_downloads(self, max_workers: int = None) -> Dict:
+        """
+        Finish the downloads an earlier (interrupted) run left in ``download_queue``.
+        
+        Returns:
+            Item counts per state once the queue is drained
+        """
+        self._sync_cookie_store()
+        if not self.authenticated:
+            self.logger.error("❌ Not authenticated. Please authenticate first.")
+            return self.download_queue.stats()
+        
+        self._run_download_queue(max_workers)
+        return self.download_queue.stats()
+    
+    def _run_download_queue(self, max_workers: int = None, torrents_by_key: Dict[str, Dict] = None):
+        """
+        Download every pending queue item until the queue is drained.
+        
+        One worker thread per possible slot (``max_workers``, default the
+        controller's maximum); ``download_controller`` decides how many of
+        them have a request in flight.
+        """
+        max_workers = max_workers or self.download_controller.max_limit
+        queue = self.download_queue
+        slowdown = ygg_download_queue.slowdown
+        torrents_by_key = torrents_by_key or {}
+        
+        recovered = queue.recover()
+        if recovered:
+            self.logger.info(f"♻️ Resuming {recovered} downloads interrupted by an earlier run")
+        
+        def progress_callback(name, progress, downloaded, total):
+            if progress % 10 == 0:  # Log every 10%
+                self.logger.info(f"📊 {name}: {progress:.1f}% ({downloaded}/{total} bytes)")
+        
+        def download_item(item):
+            """Download one claimed item and record the outcome in the queue."""
+            key = item['key']
+            # Records of this batch get the results; items from earlier runs are rebuilt from the queue
+            torrent = torrents_by_key.get(key) or {
+                'id': item['torrent_id'], 'guid': item['guid'], 'title': item['title'],
+                'category': item['category'], 'torrent_link': item['torrent_link']
+            }
+            title = torrent.get('title') or 'Unknown'
             
-            # Create safe filename
+            # Create safe filename; the key keeps torrents with the same title apart
             safe_title = re.sub(r'[<>:"/\\|?*]', '_', title)[:100]
-            filename = f"{safe_title}.torrent"
-            
-            def progress_callback(name, progress, downloaded, total):
-                if progress % 10 == 0:  # Log every 10%
-                    self.logger.info(f"📊 {name}: {progress:.1f}% ({downloaded}/{total} bytes)")
+            safe_key = re.sub(r'[^\w.-]', '_', key)[-40:]
+            filename = f"{safe_title} [{safe_key}].torrent"
             
-            filepath = self.download_torrent_file(torrent_url, filename, progress_callback)
+            status = retry_after = None
+            retryable, challenged = True, False
+            try:
+                result = self._fetch_torrent(torrent['torrent_link'], filename, progress_callback, torrent)
+                if result is None:
+                    error, retryable = "not authenticated", False
+            except requests.exceptions.HTTPError as e:
+                error = str(e)
+                if e.response is not None:
+                    status = e.response.status_code
+                    retry_after = parse_retry_after(e.response.headers.get('Retry-After'))
+                result = None
+            except CloudflareChallengeError as e:
+                error, result, challenged = str(e), None, True
+            except (TorrentPayloadError, requests.exceptions.RequestException) as e:
+                error, result = str(e), None
+            except Exception as e:
+                error, result, retryable = f"unexpected error: {e}", None, False
             
-            if filepath:
+            if result:
+                filepath, metadata = result
                 torrent['downloaded'] = True
                 torrent['download_path'] = filepath
-                return title, filepath
-            else:
-                return title, None
-        
-        # Download torrents in parallel
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_torrent = {
-                executor.submit(download_worker, torrent): torrent 
-                for torrent in downloadable_torrents
-            }
+                # The file is ground truth; feeds may omit or round these
+                torrent['info_hash'] = metadata.info_hash
+                torrent['size_bytes'] = metadata.total_size
+                if self._seen_index is not None:
+                    self._seen_index.mark_downloaded(torrent, filepath)
+                queue.complete(key, filepath, metadata.info_hash)
+                slowdown.reset()
+                self.logger.info(f"✅ Completed: {title}")
+                return
             
-            for future in as_completed(future_to_torrent):
-                torrent = future_to_torrent[future]
-                try:
-                    title, filepath = future.result()
-                    results[title] = filepath
-                    
-                    if filepath:
-                        self.logger.info(f"✅ Completed: {title}")
-                    else:
-                        self.logger.error(f"❌ Failed: {title}")
-                        
-                except Exception as e:
-                    title = torrent.get('title', 'Unknown')
-                    self.logger.error(f"❌ Exception downloading {title}: {e}")
-                    results[title] = None
+            if status in SLOWDOWN_STATUS or challenged:
+                pause = slowdown.trip(retry_after)
+                self.logger.warning(f"🐢 Tracker answered {status or 'a Cloudflare challenge'}, "
+                                    f"pausing all downloads for {pause:.0f}s")
+            delay = queue.fail(key, error, status, retryable, retry_after)
+            if delay is None:
+                self.logger.error(f"❌ Failed: {title} after {item['attempts']} attempts ({error})")
+            else:
+                self.logger.warning(f"🔁 Attempt {item['attempts']} failed for {title} ({error}), "
+                                    f"retrying in {delay:.0f}s")
         
-        successful_downloads = sum(1 for path in results.values() if path)
-        self.logger.info(f"🎉 Batch download completed: {successful_downloads}/{len(downloadable_torrents)} successful")
+        def worker():
+            while True:
+                slowdown.wait()
+                item = queue.claim()
+                if item is None:
+                    delay = queue.next_due_in()
+                    if delay is None:
+                        return
+                    time.sleep(min(delay, ygg_download_queue.POLL_INTERVAL))
+                    continue
+                download_item(item)
         
-        return results
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for future in [executor.submit(worker) for _ in range(max_workers)]:
+                future.result()
     
     def download_torrents_by_criteria(self, torrents: List[Dict], 
                                     min_seeds: int = 0, max_size_mb: int = None,
@@ -435,71 +1116,44 @@ class YGGParserWithDownloads:
         Download torrents based on specific criteria.
         
         Args:
-            torrents: List of torrent dictionaries
+            torrents: List of torrent records (or dictionaries)
             min_seeds: Minimum number of seeds required
             max_size_mb: Maximum size in MB
             keywords: List of keywords that must be in title
             
         Returns:
-            Dictionary mapping torrent titles to download paths
+            Dictionary mapping torrent IDs to download paths
         """
+        max_size_bytes = max_size_mb * 1024 * 1024 if max_size_mb else None
+        lowered_keywords = [keyword.lower() for keyword in keywords] if keywords else None
+        
+        # Torrents loaded from older JSON snapshots lack the typed fields
+        for torrent in torrents:
+            if 'seeders' not in torrent:
+                decode_torrent_stats(torrent)
+        
         def filter_func(torrent):
             # Check seeds
-            seeds = torrent.get('seeds', '0')
-            try:
-                seeds = int(seeds)
-                if seeds < min_seeds:
-                    return False
-            except (ValueError, TypeError):
-                if min_seeds > 0:
-                    return False
+            seeders = torrent.get('seeders')
+            if min_seeds > 0 and (seeders is None or seeders < min_seeds):
+                return False
             
             # Check size
-            if max_size_mb:
-                size_str = torrent.get('size', '')
-                size_mb = self._parse_size_to_mb(size_str)
-                if size_mb and size_mb > max_size_mb:
+            if max_size_bytes:
+                size_bytes = torrent.get('size_bytes')
+                if size_bytes is not None and size_bytes > max_size_bytes:
                     return False
             
             # Check keywords
-            if keywords:
+            if lowered_keywords:
                 title = torrent.get('title', '').lower()
-                if not any(keyword.lower() in title for keyword in keywords):
+                if not any(keyword in title for keyword in lowered_keywords):
                     return False
             
             return True
         
         return self.download_torrents_batch(torrents, filter_func=filter_func)
     
-    def _parse_size_to_mb(self, size_str: str) -> Optional[float]:
-        """Parse size string to MB."""
-        if not size_str:
-            return None
-        
-        size_str = size_str.upper().strip()
-        
-        # Extract number and unit
-        match = re.match(r'([\d.]+)\s*([KMGT]?B?)', size_str)
-        if not match:
-            return None
-        
-        number = float(match.group(1))
-        unit = match.group(2)
-        
-        # Convert to MB
-        if unit in ['B', '']:
-            return number / (1024 * 1024)
-        elif unit == 'KB':
-            return number / 1024
-        elif unit == 'MB':
-            return number
-        elif unit == 'GB':
-            return number * 1024
-        elif unit == 'TB':
-            return number * 1024 * 1024
-        
-        return None
-    
     def get_download_stats(self) -> Dict:
         """Get statistics about downloaded torrents."""
         if not os.path.exists(self.download_dir):
@@ -527,7 +1181,8 @@ class YGGParserWithDownloads:
             'total_files': len(files),
             'total_size': total_size,
             'total_size_mb': total_size / (1024 * 1024),
-            'files': sorted(files, key=lambda x: x['modified'], reverse=True)
+            'files': sorted(files, key=lambda x: x['modified'], reverse=True),
+            'concurrency': self.download_controller.metrics()
         }
     
     def save_torrents_to_json(self, torrents: List[Dict], filename: str = None) -> str:
@@ -538,12 +1193,18 @@ class YGGParserWithDownloads:
         
         os.makedirs('data', exist_ok=True)
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(torrents, f, indent=2, ensure_ascii=False)
+        ygg_json.dump_file(records_to_dicts(torrents), filename)
         
         self.logger.info(f"💾 Torrent information saved to: {filename}")
         return filename
     
+    def load_torrents_from_json(self, filename: str) -> List[TorrentRecord]:
+        """Load a JSON snapshot written by ``save_torrents_to_json`` back into records."""
+        torrents = records_from_dicts(ygg_json.load_file(filename))
+        
+        self.logger.info(f"📂 Loaded {len(torrents)} torrents from: {filename}")
+        return torrents
+    
     def get_available_categories(self) -> Dict[str, int]:
         """Return a dictionary of available subcategories."""
         return {
@@ -606,9 +1267,17 @@ def main():
     
     print(f"✅ Found {len(torrents)} torrents")
     
-    # Show first few torrents
-    print("\n📋 First 5 torrents:")
-    for i, torrent in enumerate(torrents[:5], 1):
+    # Only peek: torrents are marked as seen once they have been handled below
+    new_torrents = parser.seen_index.peek_new(torrents)
+    print(f"🆕 {len(new_torrents)} new since the last run")
+    
+    if not new_torrents:
+        print("✅ Nothing new to download")
+        return
+    
+    # Show first few new torrents
+    print("\n📋 First 5 new torrents:")
+    for i, torrent in enumerate(new_torrents[:5], 1):
         print(f"{i}. {torrent.get('title', 'Unknown')}")
         print(f"   📦 Size: {torrent.get('size', 'Unknown')}")
         print(f"   🌱 Seeds: {torrent.get('seeds', 'Unknown')}")
@@ -624,23 +1293,31 @@ def main():
     
     choice = input("\nEnter your choice (1-5): ").strip()
     
+    # Torrents handled by the chosen option, and the keys of those whose download failed
+    processed, failed = [], set()
+    
     if choice == "1":
-        # Download first torrent
-        if torrents[0].get('torrent_link'):
-            print(f"\n⬇️ Downloading: {torrents[0].get('title')}")
-            filepath = parser.download_torrent_file(torrents[0]['torrent_link'])
+        # Download first new torrent
+        first_torrent = new_torrents[0]
+        processed = [first_torrent]
+        if first_torrent.get('torrent_link'):
+            print(f"\n⬇️ Downloading: {first_torrent.get('title')}")
+            filepath = parser.download_torrent_file(first_torrent['torrent_link'])
             if filepath:
                 print(f"✅ Downloaded to: {filepath}")
             else:
+                failed.add(torrent_key(first_torrent))
                 print("❌ Download failed")
     
     elif choice == "2":
-        # Download all torrents
-        confirm = input(f"\n⚠️ This will download {len(torrents)} torrents. Continue? (y/n): ")
+        # Download all new torrents
+        confirm = input(f"\n⚠️ This will download {len(new_torrents)} torrents. Continue? (y/n): ")
         if confirm.lower() == 'y':
-            results = parser.download_torrents_batch(torrents)
-            successful = sum(1 for path in results.values() if path)
-            print(f"✅ Downloaded {successful}/{len(torrents)} torrents")
+            results = parser.download_torrents_batch(new_torrents)
+            processed = new_torrents
+            failed = {key for key, path in results.items() if not path}
+            successful = len(results) - len(failed)
+            print(f"✅ Downloaded {successful}/{len(new_torrents)} torrents")
     
     elif choice == "3":
         # Download with criteria
@@ -652,9 +1329,11 @@ def main():
         keywords = [k.strip() for k in keywords.split(',')] if keywords else None
         
         results = parser.download_torrents_by_criteria(
-            torrents, min_seeds=min_seeds, max_size_mb=max_size, keywords=keywords
+            new_torrents, min_seeds=min_seeds, max_size_mb=max_size, keywords=keywords
         )
-        successful = sum(1 for path in results.values() if path)
+        processed = new_torrents
+        failed = {key for key, path in results.items() if not path}
+        successful = len(results) - len(failed)
         print(f"✅ Downloaded {successful} torrents matching criteria")
     
     elif choice == "4":
@@ -667,6 +1346,9 @@ def main():
         for file_info in stats['files'][:5]:
             print(f"  {file_info['filename']} ({file_info['size_mb']:.2f} MB)")
     
+    # Failed downloads stay new so the next run offers them again
+    parser.seen_index.mark_seen([t for t in processed if torrent_key(t) not in failed], subcat_id)
+    
     # Save torrent information
     json_file = parser.save_torrents_to_json(torrents)
     print(f"\n💾 Torrent information saved to: {json_file}")
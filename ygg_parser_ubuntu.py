@@ -15,11 +15,8 @@ from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 from datetime import datetime
 
-try:
-    import cloudscraper
-    CLOUDSCRAPER_AVAILABLE = True
-except ImportError:
-    CLOUDSCRAPER_AVAILABLE = False
+from ygg_session_pool import create_session
+from ygg_auth_check import auth_validator
 
 try:
     from selenium import webdriver
@@ -74,33 +71,8 @@ class YGGParserUbuntu:
         return logger
     
     def _setup_session(self):
-        """Setup session with cloudscraper."""
-        if CLOUDSCRAPER_AVAILABLE:
-            try:
-                self.session = cloudscraper.create_scraper(
-                    browser={
-                        'browser': 'chrome',
-                        'platform': 'linux',
-                        'mobile': False
-                    }
-                )
-                self.logger.info("✅ Using cloudscraper session")
-            except Exception as e:
-                self.logger.warning(f"⚠ Cloudscraper failed: {e}")
-                self.session = requests.Session()
-        else:
-            self.session = requests.Session()
-        
-        # Set headers optimized for Ubuntu
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
+        """Setup session with cloudscraper and pooled adapters."""
+        self.session = create_session()
     
     def authenticate_with_selenium(self, username: str, password: str, headless: bool = True) -> bool:
         """
@@ -220,21 +192,21 @@ class YGGParserUbuntu:
         self.cookies = cookies
         self.logger.info(f"✅ Set {len(cookies)} cookies")
         
-        # Test authentication
+        # Test authentication (probe cached per cookie set, stops at the first logout marker)
         try:
             test_url = f"{self.base_url}/"
-            response = self.session.get(test_url, timeout=30)
+            authenticated, status_code, cache_status, _ = auth_validator.validate(self.session, cookies, test_url)
             
-            if response.status_code == 200:
-                if "login" not in response.text.lower() or "logout" in response.text.lower():
+            if status_code in (200, 206):
+                if authenticated:
                     self.authenticated = True
-                    self.logger.info("✅ Cookie authentication successful!")
+                    self.logger.info(f"✅ Cookie authentication successful! ({cache_status})")
                     return True
                 else:
                     self.logger.error("❌ Cookie authentication failed - still showing login page")
                     return False
             else:
-                self.logger.error(f"❌ Cookie authentication test failed with status {response.status_code}")
+                self.logger.error(f"❌ Cookie authentication test failed with status {status_code}")
                 return False
                 
         except Exception as e:
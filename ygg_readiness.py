@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Page readiness waits for YGG Torrent browser authentication
+Polls cheap signals (title, login form, cf_clearance cookie) instead of sleeping a fixed time
+"""
+
+import time
+import asyncio
+import logging
+import inspect
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+
+# Seconds between two polls of a readiness signal
+DEFAULT_POLL_INTERVAL = 0.25
+
+# Upper bounds for each phase; waits return as soon as the signal fires
+CLOUDFLARE_TIMEOUT = 30
+LOGIN_FORM_TIMEOUT = 15
+LOGIN_RESULT_TIMEOUT = 15
+
+LOGIN_FORM_SELECTOR = "input[name='id']"
+LOGOUT_LINK_SELECTOR = "a[href*='logout']"
+CLEARANCE_COOKIE = 'cf_clearance'
+
+# Lower-cased fragments of Cloudflare interstitial titles (English and French)
+CLOUDFLARE_TITLE_MARKERS = (
+    'just a moment',
+    'un instant',
+    'checking your browser',
+    'please wait',
+    'attention required',
+    'ddos protection',
+    'cloudflare'
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PhaseTimer:
+    """
+    Records how long each phase of a login took.
+
+    Usage::
+
+        timer = PhaseTimer(logger)
+        with timer.phase('cloudflare'):
+            wait_for_cloudflare(driver)
+        logger.info(timer.summary())
+    """
+
+    def __init__(self, log: logging.Logger = None):
+        self.log = log or logger
+        self.phases: Dict[str, float] = OrderedDict()
+        self._started = time.monotonic()
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+            self.log.info(f"⏱️ {name}: {elapsed:.2f}s")
+
+    @property
+    def total(self) -> float:
+        return time.monotonic() - self._started
+
+    def summary(self) -> str:
+        """One-line ``phase=seconds`` breakdown plus the total."""
+        parts = [f"{name}={seconds:.2f}s" for name, seconds in self.phases.items()]
+        parts.append(f"total={self.total:.2f}s")
+        return "⏱️ Login timing: " + ", ".join(parts)
+
+    def to_dict(self) -> Dict[str, float]:
+        data = {name: round(seconds, 3) for name, seconds in self.phases.items()}
+        data['total'] = round(self.total, 3)
+        return data
+
+
+def wait_until(predicate: Callable[[], Any], timeout: float,
+               interval: float = DEFAULT_POLL_INTERVAL) -> bool:
+    """
+    Poll ``predicate`` until it returns a truthy value or ``timeout`` expires.
+
+    Exceptions raised by the predicate (page navigating, element detached)
+    count as "not ready yet".
+
+    Returns:
+        True if the predicate succeeded before the deadline
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if predicate():
+                return True
+        except Exception:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+
+
+async def async_wait_until(predicate: Callable[[], Any], timeout: float,
+                           interval: float = DEFAULT_POLL_INTERVAL) -> bool:
+    """asyncio version of ``wait_until``; ``predicate`` may be a coroutine function."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            result = predicate()
+            if inspect.isawaitable(result):
+                result = await result
+            if result:
+                return True
+        except Exception:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        await asyncio.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+
+
+def is_cloudflare_title(title: Optional[str]) -> bool:
+    """True if a page title belongs to a Cloudflare interstitial."""
+    title = (title or '').lower()
+    return any(marker in title for marker in CLOUDFLARE_TITLE_MARKERS)
+
+
+# Selenium / undetected-chromedriver signals
+
+def is_cloudflare_challenge(driver) -> bool:
+    return is_cloudflare_title(driver.title)
+
+
+def has_element(driver, selector: str) -> bool:
+    return bool(driver.find_elements("css selector", selector))
+
+
+def has_clearance_cookie(driver) -> bool:
+    return driver.get_cookie(CLEARANCE_COOKIE) is not None
+
+
+def wait_for_cloudflare(driver, timeout: float = CLOUDFLARE_TIMEOUT) -> bool:
+    """
+    Wait until the Cloudflare interstitial is gone.
+
+    The challenge counts as passed when the title no longer looks like an
+    interstitial, the login form is present or ``cf_clearance`` was set.
+
+    Returns:
+        True if the page got past Cloudflare before the deadline
+    """
+    return wait_until(
+        lambda: (not is_cloudflare_challenge(driver)
+                 or has_element(driver, LOGIN_FORM_SELECTOR)
+                 or has_clearance_cookie(driver)),
+        timeout
+    )
+
+
+def wait_for_element(driver, selector: str, timeout: float = LOGIN_FORM_TIMEOUT) -> bool:
+    """Wait until at least one element matches ``selector``."""
+    return wait_until(lambda: has_element(driver, selector), timeout)
+
+
+def wait_for_login_result(driver, login_url: str, timeout: float = LOGIN_RESULT_TIMEOUT) -> bool:
+    """
+    Wait until a submitted login form has been answered.
+
+    Returns as soon as the browser left the login URL, a logout link
+    appeared or the login form disappeared.
+    """
+    return wait_until(
+        lambda: (driver.current_url.rstrip('/') != login_url.rstrip('/')
+                 or has_element(driver, LOGOUT_LINK_SELECTOR)
+                 or not has_element(driver, LOGIN_FORM_SELECTOR)),
+        timeout
+    )
+
+
+def wait_for_login_page(driver, timer: PhaseTimer = None,
+                        cloudflare_timeout: float = CLOUDFLARE_TIMEOUT,
+                        form_timeout: float = LOGIN_FORM_TIMEOUT) -> bool:
+    """
+    Wait for Cloudflare to clear and the login form to render.
+
+    Args:
+        driver: Selenium / undetected-chromedriver driver on the login URL
+        timer: Optional ``PhaseTimer`` receiving ``cloudflare`` and ``login_form``
+
+    Returns:
+        True when the login form is present
+    """
+    timer = timer or PhaseTimer()
+
+    with timer.phase('cloudflare'):
+        if not wait_for_cloudflare(driver, cloudflare_timeout):
+            logger.warning(f"⚠️ Cloudflare challenge still active after {cloudflare_timeout}s")
+
+    with timer.phase('login_form'):
+        return wait_for_element(driver, LOGIN_FORM_SELECTOR, form_timeout)
+
+
+# Zendriver (async) signals
+
+async def is_cloudflare_challenge_async(page) -> bool:
+    return is_cloudflare_title(await page.get_title())
+
+
+async def has_element_async(page, selector: str) -> bool:
+    return await page.query_selector(selector) is not None
+
+
+async def wait_for_element_async(page, selector: str, timeout: float = LOGIN_FORM_TIMEOUT) -> bool:
+    """Wait until ``selector`` matches an element of a zendriver page."""
+    return await async_wait_until(lambda: has_element_async(page, selector), timeout)
+
+
+async def wait_for_login_page_async(page, timer: PhaseTimer = None,
+                                    timeout: float = LOGIN_FORM_TIMEOUT) -> bool:
+    """
+    Wait until a zendriver page shows the login form or a Cloudflare interstitial.
+
+    Returns:
+        True when the login form is present
+    """
+    timer = timer or PhaseTimer()
+
+    async def settled():
+        return await has_element_async(page, LOGIN_FORM_SELECTOR) or await is_cloudflare_challenge_async(page)
+
+    with timer.phase('page_load'):
+        await async_wait_until(settled, timeout)
+        return await has_element_async(page, LOGIN_FORM_SELECTOR)
+
+
+async def wait_for_login_result_async(page, timeout: float = LOGIN_RESULT_TIMEOUT) -> bool:
+    """Wait until a zendriver page left the login URL or the login form disappeared."""
+    async def answered():
+        url = await page.get_url()
+        return 'login' not in (url or '').lower() or not await has_element_async(page, LOGIN_FORM_SELECTOR)
+
+    return await async_wait_until(answered, timeout)
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+In-process response cache for the YGG Torrent APIs
+TTL + LRU cache of feed results with single-flight loading per key
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generator, Hashable, Iterable, Iterator, Tuple
+
+
+# Seconds a cached feed is served before the next request refreshes it
+DEFAULT_TTL = float(os.getenv('YGG_RSS_CACHE_TTL', '60'))
+
+# Maximum number of (category, passkey) results kept in memory
+DEFAULT_MAX_ENTRIES = int(os.getenv('YGG_RSS_CACHE_SIZE', '256'))
+
+# Values of the X-Cache header
+CACHE_HIT = 'HIT'
+CACHE_MISS = 'MISS'
+CACHE_COALESCED = 'COALESCED'
+
+
+class UpstreamError(Exception):
+    """Raised by loaders to report an upstream HTTP failure to every waiter without caching it."""
+
+    def __init__(self, status_code: int, message: str = None):
+        super().__init__(message or f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class StreamAborted(Exception):
+    """Raised to requests waiting on a streamed load whose client went away."""
+
+
+class _Flight:
+    """A load in progress that other requests for the same key wait on."""
+
+    __slots__ = ('done', 'value', 'error', 'stored_at')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.stored_at = None
+
+
+class ResponseCache:
+    """
+    TTL/LRU cache whose misses are coalesced.
+
+    When several threads miss on the same key only the first one runs the
+    loader; the others block until it finishes and share its result. A
+    loader returning None or raising (e.g. ``UpstreamError``) is passed
+    through to every waiter but not cached.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._counters = {CACHE_HIT: 0, CACHE_MISS: 0, CACHE_COALESCED: 0}
+
+    def _claim(self, key: Hashable, now: float):
+        """
+        Look ``key`` up under the lock.
+
+        Returns:
+            ``(CACHE_HIT, (value, age))``, ``(CACHE_COALESCED, flight)`` to
+            wait on another load, or ``(CACHE_MISS, flight)`` when the caller
+            must load the value and ``_land`` the flight
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._counters[CACHE_HIT] += 1
+                    return CACHE_HIT, (value, now - stored_at)
+                del self._entries[key]
+
+            flight = self._flights.get(key)
+            if flight is not None:
+                return CACHE_COALESCED, flight
+            flight = self._flights[key] = _Flight()
+            return CACHE_MISS, flight
+
+    def _follow(self, flight: _Flight) -> Any:
+        """Wait for another caller's load and share its result."""
+        flight.done.wait()
+        with self._lock:
+            self._counters[CACHE_COALESCED] += 1
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _land(self, key: Hashable, flight: _Flight):
+        """Finish a load: cache its value unless it failed, then wake the waiters."""
+        with self._lock:
+            del self._flights[key]
+            self._counters[CACHE_MISS] += 1
+            flight.stored_at = time.monotonic()
+            if flight.error is None and flight.value is not None:
+                self._entries[key] = (flight.stored_at, flight.value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        flight.done.set()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Tuple[Any, str, float]:
+        """
+        Return a cached value or load it once for all concurrent callers.
+
+        Args:
+            key: Cache key, e.g. ``(category_id, passkey)``
+            loader: Called without arguments to fetch the value on a miss
+
+        Returns:
+            ``(value, status, age)`` where status is ``HIT``, ``MISS`` or
+            ``COALESCED`` and age is the value's age in seconds
+        """
+        now = time.monotonic()
+        status, claim = self._claim(key, now)
+
+        if status == CACHE_HIT:
+            value, age = claim
+            return value, CACHE_HIT, age
+
+        flight = claim
+        if status == CACHE_COALESCED:
+            value = self._follow(flight)
+            return value, CACHE_COALESCED, time.monotonic() - flight.stored_at
+
+        try:
+            flight.value = loader()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            self._land(key, flight)
+
+        return flight.value, CACHE_MISS, 0.0
+
+    def get_or_stream(self, key: Hashable, producer: Callable[[], Generator],
+                      items: Callable[[Any], Iterable] = iter) -> Tuple[Iterator, str, float]:
+        """
+        Like ``get_or_load`` for values that can be consumed while they load.
+
+        ``producer()`` returns a generator that yields items as they become
+        available and *returns* the value to cache (the same value a
+        ``get_or_load`` loader for ``key`` would return). On a miss the
+        caller iterates the producer directly, so the first item is out
+        before the load finished. Hits and coalesced callers iterate
+        ``items(value)`` of the cached or landed value.
+
+        Returns:
+            ``(iterator, status, age)``; the iterator raises whatever the
+            producer raised, and ``StreamAborted`` to waiters when the
+            loading stream was closed early
+        """
+        now = time.monotonic()
+        status, claim = self._claim(key, now)
+
+        if status == CACHE_HIT:
+            value, age = claim
+            return iter(items(value)), CACHE_HIT, age
+
+        flight = claim
+        if status == CACHE_COALESCED:
+            def follow():
+                yield from items(self._follow(flight))
+            # Still loading, the value will be as fresh as a miss once it lands
+            age = time.monotonic() - flight.stored_at if flight.done.is_set() else 0.0
+            return follow(), CACHE_COALESCED, age
+
+        return _LoadingStream(self, key, flight, producer), CACHE_MISS, 0.0
+
+    def invalidate(self, key: Hashable):
+        """Drop one cached value."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every cached value."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Entry count and hit/miss/coalesced counters for health endpoints."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'ttl': self.ttl,
+                'max_entries': self.max_entries,
+                'hits': self._counters[CACHE_HIT],
+                'misses': self._counters[CACHE_MISS],
+                'coalesced': self._counters[CACHE_COALESCED]
+            }
+
+    def apply_headers(self, response, status: str, age: float):
+        """Set ``X-Cache``, ``X-Cache-Age`` and ``Cache-Control`` on a Flask response."""
+        response.headers['X-Cache'] = status
+        response.headers['X-Cache-Age'] = str(int(age))
+        response.headers['Cache-Control'] = f"private, max-age={max(0, int(self.ttl - age))}"
+        return response
+
+
+class _LoadingStream:
+    """
+    Iterator over a producer that lands its flight when it ends.
+
+    A plain generator would never run its ``finally`` block if it is closed
+    before the first ``next()`` (e.g. the client disconnected before the
+    body was sent), leaving waiters blocked; ``close`` covers that case.
+    """
+
+    def __init__(self, cache: ResponseCache, key: Hashable, flight: _Flight, producer: Callable[[], Generator]):
+        self._cache = cache
+        self._key = key
+        self._flight = flight
+        self._producer = producer
+        self._generator = None
+        self._landed = False
+
+    def __iter__(self):
+        return self
+
+    def _run(self):
+        try:
+            self._flight.value = yield from self._producer()
+        except GeneratorExit:
+            self._flight.error = StreamAborted(f"Stream for {self._key!r} closed before it finished")
+            raise
+        except Exception as e:
+            self._flight.error = e
+            raise
+        finally:
+            self._land()
+
+    def _land(self):
+        if not self._landed:
+            self._landed = True
+            self._cache._land(self._key, self._flight)
+
+    def __next__(self):
+        if self._generator is None:
+            self._generator = self._run()
+        return next(self._generator)
+
+    def close(self):
+        if self._generator is None:
+            self._flight.error = StreamAborted(f"Stream for {self._key!r} closed before it started")
+            self._land()
+        else:
+            self._generator.close()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Persistent index of torrents already seen in YGG Torrent RSS feeds
+SQLite-backed, with an in-memory key set for O(1) lookups while polling
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from ygg_torrent_record import extract_torrent_id
+
+
+DEFAULT_INDEX_PATH = 'data/seen_torrents.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_torrents (
+    key TEXT PRIMARY KEY,
+    torrent_id INTEGER,
+    guid TEXT,
+    title TEXT,
+    category TEXT,
+    subcat_id INTEGER,
+    first_seen TEXT NOT NULL,
+    downloaded INTEGER NOT NULL DEFAULT 0,
+    download_path TEXT,
+    downloaded_at TEXT
+)
+"""
+
+
+def torrent_key(torrent) -> Optional[str]:
+    """Stable index key for a torrent record or dictionary: its ID, else its GUID/link."""
+    torrent_id = torrent.get('id')
+    if torrent_id is None:
+        torrent_id = extract_torrent_id(torrent.get('torrent_link'), torrent.get('link'), torrent.get('guid'))
+    if torrent_id is not None:
+        return str(torrent_id)
+    return torrent.get('guid') or torrent.get('link') or torrent.get('torrent_link')
+
+
+class SeenIndex:
+    """
+    Records first-seen time, category and download state per torrent.
+
+    All keys are loaded into a set on open so ``filter_new`` only touches
+    the database for torrents that have not been seen before.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+
+        self._keys = {row[0] for row in self._conn.execute('SELECT key FROM seen_torrents')}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, torrent) -> bool:
+        return torrent_key(torrent) in self._keys
+
+    def peek_new(self, torrents: Iterable) -> List:
+        """
+        Return the torrents that were never seen before, without marking them.
+
+        Args:
+            torrents: Torrent records or dictionaries, in feed order
+
+        Returns:
+            The unseen torrents, in the same order (duplicates in the feed appear once)
+        """
+        new_torrents = []
+        keys = set()
+
+        with self._lock:
+            for torrent in torrents:
+                key = torrent_key(torrent)
+                if key is None or key in self._keys or key in keys:
+                    continue
+                keys.add(key)
+                new_torrents.append(torrent)
+
+        return new_torrents
+
+    def mark_seen(self, torrents: Iterable, subcat_id: int = None):
+        """
+        Record torrents as seen so later runs skip them.
+
+        Args:
+            torrents: Torrent records or dictionaries that have been processed
+            subcat_id: Subcategory the torrents were fetched from
+        """
+        now = datetime.now().isoformat()
+        rows = []
+
+        with self._lock:
+            for torrent in torrents:
+                key = torrent_key(torrent)
+                if key is None or key in self._keys:
+                    continue
+                self._keys.add(key)
+                rows.append((
+                    key,
+                    torrent.get('id'),
+                    torrent.get('guid'),
+                    torrent.get('title'),
+                    torrent.get('category'),
+                    subcat_id,
+                    now
+                ))
+
+            if rows:
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO seen_torrents '
+                    '(key, torrent_id, guid, title, category, subcat_id, first_seen) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    rows
+                )
+                self._conn.commit()
+
+    def filter_new(self, torrents: Iterable, subcat_id: int = None) -> List:
+        """
+        Return the torrents that were never seen before and mark them as seen.
+
+        Only use this when the caller is done with the torrents once it returns;
+        otherwise ``peek_new`` and ``mark_seen`` after processing.
+
+        Args:
+            torrents: Torrent records or dictionaries, in feed order
+            subcat_id: Subcategory the torrents were fetched from
+
+        Returns:
+            The unseen torrents, in the same order
+        """
+        new_torrents = self.peek_new(torrents)
+        self.mark_seen(new_torrents, subcat_id)
+
+        return new_torrents
+
+    def mark_downloaded(self, torrent, download_path: str):
+        """Record that a torrent's .torrent file was saved to ``download_path``."""
+        key = torrent_key(torrent)
+        if key is None:
+            return
+
+        with self._lock:
+            if key not in self._keys:
+                self._keys.add(key)
+                self._conn.execute(
+                    'INSERT OR IGNORE INTO seen_torrents '
+                    '(key, torrent_id, guid, title, category, first_seen) VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, torrent.get('id'), torrent.get('guid'), torrent.get('title'),
+                     torrent.get('category'), datetime.now().isoformat())
+                )
+            self._conn.execute(
+                'UPDATE seen_torrents SET downloaded = 1, download_path = ?, downloaded_at = ? WHERE key = ?',
+                (download_path, datetime.now().isoformat(), key)
+            )
+            self._conn.commit()
+
+    def get(self, torrent) -> Optional[Dict]:
+        """Return the stored row for a torrent, or None if it was never seen."""
+        key = torrent_key(torrent)
+        if key not in self._keys:
+            return None
+
+        with self._lock:
+            cursor = self._conn.execute('SELECT * FROM seen_torrents WHERE key = ?', (key,))
+            row = cursor.fetchone()
+            columns = [description[0] for description in cursor.description]
+
+        return dict(zip(columns, row)) if row else None
+
+    def stats(self) -> Dict:
+        """Counts of seen and downloaded torrents."""
+        with self._lock:
+            downloaded = self._conn.execute(
+                'SELECT COUNT(*) FROM seen_torrents WHERE downloaded = 1'
+            ).fetchone()[0]
+        return {'seen': len(self._keys), 'downloaded': downloaded}
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
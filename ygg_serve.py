@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Production server for the YGG Torrent APIs
+Runs an API module under gunicorn worker processes and threads instead of Flask's dev server
+"""
+
+import os
+import ast
+import sys
+import atexit
+import signal
+import logging
+import argparse
+import importlib
+import importlib.util
+import subprocess
+import multiprocessing
+from typing import Dict, Tuple
+
+try:
+    from gunicorn.app.base import BaseApplication
+    GUNICORN_AVAILABLE = True
+except ImportError:
+    BaseApplication = object
+    GUNICORN_AVAILABLE = False
+
+
+# Process roles passed to an API module's ``init_service(role)``
+ROLE_ALL = 'all'          # single process: serves everything, owns the browsers
+ROLE_BROWSER = 'browser'  # the one designated worker that owns the browsers
+ROLE_WEB = 'web'          # stateless workers; browser routes are forwarded
+
+DEFAULT_BIND = '0.0.0.0:8080'
+DEFAULT_BROWSER_BIND = '127.0.0.1:8081'
+DEFAULT_THREADS = 8
+
+# Seconds a forwarded browser request may take ("wait": true logins block this long)
+BROWSER_FORWARD_TIMEOUT = 300
+
+# Hop-by-hop and length/encoding headers that must not be copied between the two servers
+HOP_BY_HOP_HEADERS = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization', 'te',
+    'trailers', 'transfer-encoding', 'upgrade', 'host', 'content-length', 'content-encoding'
+}
+
+logger = logging.getLogger(__name__)
+
+
+def default_workers() -> int:
+    """Worker processes for I/O-bound RSS traffic: two per core plus one."""
+    return multiprocessing.cpu_count() * 2 + 1
+
+
+def load_module(module_name: str):
+    """Import an API module by name or file name (``ygg_api`` or ``ygg_api.py``)."""
+    if module_name.endswith('.py'):
+        module_name = module_name[:-3]
+    return importlib.import_module(module_name)
+
+
+def module_settings(module_name: str) -> Dict:
+    """
+    Read ``SINGLE_PROCESS`` / ``BROWSER_ROUTES`` from an API module without importing it.
+
+    The launcher must not import the app itself: gunicorn workers would
+    inherit it, which defeats ``--reload`` and non-preload mode.
+    """
+    if module_name.endswith('.py'):
+        module_name = module_name[:-3]
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or not spec.origin:
+        raise SystemExit(f"❌ Module not found: {module_name}")
+
+    with open(spec.origin, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), spec.origin)
+
+    settings = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+            if name in ('SINGLE_PROCESS', 'BROWSER_ROUTES'):
+                settings[name] = ast.literal_eval(node.value)
+    return settings
+
+
+def install_browser_forwarding(app, routes: Tuple[str, ...], target: str):
+    """
+    Forward requests for ``routes`` to the browser worker at ``target``.
+
+    Registered as the first ``before_request`` hook of ``app``, so web
+    workers never start a browser or hold login job state themselves.
+    """
+    import requests
+    from flask import Response, request
+
+    session = requests.Session()
+    target = target.rstrip('/')
+
+    def forward_to_browser_worker():
+        if not request.path.startswith(routes):
+            return None
+
+        url = target + request.path
+        if request.query_string:
+            url += '?' + request.query_string.decode('latin-1')
+
+        headers = {name: value for name, value in request.headers.items()
+                   if name.lower() not in HOP_BY_HOP_HEADERS}
+        upstream = session.request(request.method, url, data=request.get_data(),
+                                   headers=headers, timeout=BROWSER_FORWARD_TIMEOUT,
+                                   allow_redirects=False)
+
+        response_headers = [(name, value) for name, value in upstream.headers.items()
+                            if name.lower() not in HOP_BY_HOP_HEADERS]
+        return Response(upstream.content, upstream.status_code, response_headers)
+
+    app.before_request_funcs.setdefault(None, []).insert(0, forward_to_browser_worker)
+
+
+def load_app(module_name: str, role: str, browser_url: str = None):
+    """Import an API module and return its Flask app prepared for ``role``."""
+    module = load_module(module_name)
+    routes = getattr(module, 'BROWSER_ROUTES', None)
+
+    if role == ROLE_WEB and routes and browser_url:
+        install_browser_forwarding(module.app, tuple(routes), browser_url)
+
+    return module.app
+
+
+def init_worker(module_name: str, role: str):
+    """Run the module's ``init_service(role)`` in a freshly started worker."""
+    module = load_module(module_name)
+    init_service = getattr(module, 'init_service', None)
+    if init_service is not None and init_service(role) is False:
+        logger.error(f"❌ {module_name}.init_service failed in worker {os.getpid()}")
+        sys.exit(1)
+    logger.info(f"✅ {module_name} worker {os.getpid()} ready (role={role})")
+
+
+class ServiceApplication(BaseApplication):
+    """
+    gunicorn application serving one API module.
+
+    With ``preload`` the module is imported once in the master and shared
+    copy-on-write by the workers; per-process background work (threads,
+    browsers, cookie refresh) is only started after the fork, in
+    ``post_worker_init``.
+    """
+
+    def __init__(self, module_name: str, role: str, options: Dict, browser_url: str = None):
+        self.module_name = module_name
+        self.role = role
+        self.options = options
+        self.browser_url = browser_url
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+        module_name, role = self.module_name, self.role
+        self.cfg.set('post_worker_init', lambda worker: init_worker(module_name, role))
+
+    def load(self):
+        return load_app(self.module_name, self.role, self.browser_url)
+
+
+def start_browser_worker(args) -> subprocess.Popen:
+    """Launch the single browser-owning server as a child process."""
+    command = [
+        sys.executable, os.path.abspath(__file__), args.module,
+        '--role', ROLE_BROWSER,
+        '--bind', args.browser_bind,
+        '--threads', str(args.threads),
+        '--timeout', str(args.timeout)
+    ]
+    process = subprocess.Popen(command)
+    launcher_pid = os.getpid()
+
+    def stop():
+        # Forked gunicorn workers inherit this handler; only the launcher stops the child
+        if os.getpid() == launcher_pid and process.poll() is None:
+            process.send_signal(signal.SIGTERM)
+            try:
+                process.wait(timeout=args.graceful_timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    atexit.register(stop)
+    logger.info(f"🌐 Browser worker started on {args.browser_bind} (pid {process.pid})")
+    return process
+
+
+def serve_dev(module_name: str, bind: str):
+    """Fallback without gunicorn: one process, one thread per request."""
+    from werkzeug.serving import run_simple
+
+    logger.warning("⚠ gunicorn is not installed - falling back to a single threaded process "
+                   "(pip install gunicorn)")
+    app = load_app(module_name, ROLE_ALL)
+    init_worker(module_name, ROLE_ALL)
+    host, port = bind.rsplit(':', 1)
+    run_simple(host, int(port), app, threaded=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a YGG Torrent API with gunicorn workers')
+    parser.add_argument('module', nargs='?', default='ygg_api',
+                        help='API module to serve (default: ygg_api)')
+    parser.add_argument('--bind', default=DEFAULT_BIND, help=f'Address to listen on (default: {DEFAULT_BIND})')
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                        help='Worker processes (default: 2 x CPU cores + 1)')
+    parser.add_argument('--threads', type=int, default=DEFAULT_THREADS,
+                        help=f'Threads per worker (default: {DEFAULT_THREADS})')
+    parser.add_argument('--preload', action='store_true',
+                        help='Import the app once in the master before forking workers')
+    parser.add_argument('--reload', action='store_true',
+                        help='Restart workers when source files change (development)')
+    parser.add_argument('--timeout', type=int, default=120, help='Worker timeout in seconds')
+    parser.add_argument('--graceful-timeout', type=int, default=30,
+                        help='Seconds workers get to finish requests on reload/shutdown')
+    parser.add_argument('--max-requests', type=int, default=0,
+                        help='Recycle a worker after this many requests (0 = never)')
+    parser.add_argument('--browser-bind', default=DEFAULT_BROWSER_BIND,
+                        help=f'Internal address of the browser worker (default: {DEFAULT_BROWSER_BIND})')
+    parser.add_argument('--role', choices=(ROLE_ALL, ROLE_BROWSER, ROLE_WEB), default=None,
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if not GUNICORN_AVAILABLE:
+        serve_dev(args.module, args.bind)
+        return
+
+    settings = module_settings(args.module)
+    single_process = settings.get('SINGLE_PROCESS', False)
+    routes = settings.get('BROWSER_ROUTES')
+
+    role, workers, browser_url = args.role, args.workers, None
+    if role == ROLE_BROWSER or single_process:
+        role = role or ROLE_ALL
+        if single_process and workers > 1:
+            logger.warning(f"⚠ {args.module} keeps its login state in-process - serving it with one worker")
+        workers = 1
+    elif role is None and routes and workers > 1:
+        role = ROLE_WEB
+        start_browser_worker(args)
+        browser_url = f"http://{args.browser_bind}"
+    else:
+        role = role or ROLE_ALL
+
+    options = {
+        'bind': args.bind,
+        'workers': workers,
+        'threads': args.threads,
+        'worker_class': 'gthread',
+        'preload_app': args.preload,
+        'reload': args.reload,
+        'timeout': args.timeout,
+        'graceful_timeout': args.graceful_timeout,
+        'max_requests': args.max_requests,
+        'max_requests_jitter': args.max_requests // 10 if args.max_requests else 0,
+        'keepalive': 5,
+        'accesslog': None,
+        'errorlog': '-',
+        'proc_name': f"{args.module}-{role}"
+    }
+
+    logger.info(f"🚀 Serving {args.module} on {args.bind}: {workers} workers x {args.threads} threads "
+                f"(role={role}, preload={args.preload})")
+    logger.info("💡 kill -HUP <master pid> reloads workers gracefully")
+    ServiceApplication(args.module, role, options, browser_url).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,813 @@
+#!/usr/bin/env python3
+"""
+YGG Torrent API service core
+One implementation of the REST endpoints; the login method is a pluggable backend (ygg_auth_backends)
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import argparse
+import threading
+from datetime import datetime
+from typing import Dict, Generator, List, Optional, Tuple, Union
+
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    from flask_cors import CORS
+    CORS_AVAILABLE = True
+except ImportError:
+    CORS_AVAILABLE = False
+
+from ygg_feed_cache import FeedValidatorCache
+from ygg_session_pool import session_pool, parse_cookie_string
+from ygg_response_cache import ResponseCache, UpstreamError
+from ygg_cookie_store import CookieStore, CookieJar
+from ygg_auth_check import auth_validator
+from ygg_login_jobs import LoginJobQueue, QueueFullError
+from ygg_auth_backends import AuthBackend, BASE_URL, create_backend
+from ygg_sweep import SweepEngine, HostRateLimiter, RateLimitedSession, DEFAULT_REQUESTS_PER_SECOND
+from ygg_serve import ROLE_ALL, ROLE_WEB
+from ygg_parser import FeedParseError, iter_parse_rss, RSS_STREAM_CHUNK_SIZE
+from ygg_torrent_record import TorrentRecord
+from ygg_seen_index import torrent_key
+import ygg_json
+
+
+# Optional service account; its cookies serve /rss and /auth/status calls made without cookies
+SERVICE_USERNAME = os.getenv('YGG_USERNAME')
+SERVICE_PASSWORD = os.getenv('YGG_PASSWORD')
+
+CATEGORIES_FILE = 'data/extracted_categories_simple.json'
+
+# Upstream feed requests per second (per host) for every /rss fetch of this process
+UPSTREAM_REQUESTS_PER_SECOND = float(os.getenv('YGG_UPSTREAM_RPS', str(DEFAULT_REQUESTS_PER_SECOND)))
+
+# Categories one /rss/batch call may ask for
+RSS_BATCH_MAX = int(os.getenv('YGG_RSS_BATCH_MAX', '50'))
+
+# Feeds of one /rss/batch call fetched at once
+RSS_BATCH_WORKERS = int(os.getenv('YGG_RSS_BATCH_WORKERS', '4'))
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+ENDPOINTS = (
+    ('GET ', '/health', 'Health check'),
+    ('POST', '/auth/login', 'Queue a login and get its job id'),
+    ('GET ', '/auth/jobs/<job_id>', 'Poll a login job for its cookies'),
+    ('GET ', '/auth/status', 'Check authentication status'),
+    ('POST', '/auth/load-cookies', 'Adopt the newest saved cookie file'),
+    ('GET ', '/categories', 'Get available categories'),
+    ('GET ', '/rss/<category_id>', 'Get RSS feed for category (?stream=1 for NDJSON)'),
+    ('GET ', '/rss/batch?ids=1,2,3', 'Get merged, deduplicated feeds of several categories')
+)
+
+logger = logging.getLogger(__name__)
+
+# Shared by every service, request and batch of this process, like the session pool
+upstream_limiter = HostRateLimiter(UPSTREAM_REQUESTS_PER_SECOND)
+
+
+def configure_logging(log_file: str = 'logs/api.log'):
+    """Log to the console and ``log_file`` (called once by the entry-point module)."""
+    os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
+    os.makedirs('data', exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+    )
+
+
+def torrent_to_json(torrent: TorrentRecord) -> Dict:
+    """A parsed torrent in its snapshot form (``to_dict``), with ``added_at`` as ISO text like the rest of the API."""
+    data = torrent.to_dict()
+    if data['added_at'] is not None:
+        data['added_at'] = data['added_at'].isoformat()
+    return data
+
+
+class ServiceJSONProvider(DefaultJSONProvider):
+    """
+    Flask's JSON provider on the ygg_json serializer (orjson/ujson when installed).
+
+    ``jsonify`` output keeps Flask's rules: sorted keys, compact unless the
+    app runs in debug mode, and Flask's ``default`` for dates, UUIDs and
+    dataclasses. Only the encoder is faster.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        return ygg_json.dumps(obj, compact='indent' not in kwargs,
+                              sort_keys=kwargs.get('sort_keys', self.sort_keys),
+                              default=kwargs.get('default', self.default)).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return ygg_json.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        compact = self.compact if self.compact is not None else not self._app.debug
+        data = ygg_json.dumps(obj, compact=compact, sort_keys=self.sort_keys, default=self.default)
+        return self._app.response_class(data + b'\n', mimetype=self.mimetype)
+
+
+class YGGService:
+    """
+    The YGG Torrent REST API around one ``AuthBackend``.
+
+    Every backend gets the same process-wide session pool and auth
+    validator, plus this service's feed/response caches, cookie store and
+    login job queue. ``app`` is the Flask application; ``init_service``
+    starts the background work once per server process (see ygg_serve).
+    """
+
+    def __init__(self, backend: Union[AuthBackend, str, None] = None,
+                 service_name: str = 'YGG Torrent Authentication API'):
+        self.backend = backend if isinstance(backend, AuthBackend) else create_backend(backend)
+        self.service_name = service_name
+
+        # Conditional GET validators and parsed torrents per (category, passkey)
+        self.feed_cache = FeedValidatorCache()
+
+        # Parsed /rss results served to clients for YGG_RSS_CACHE_TTL seconds
+        self.rss_cache = ResponseCache()
+
+        # Active cookie jar, renewed before cf_clearance expires when YGG_USERNAME/YGG_PASSWORD are set
+        can_refresh = self.backend.uses_browser and SERVICE_USERNAME and SERVICE_PASSWORD
+        self.cookie_store = CookieStore(
+            patterns=self.backend.cookie_patterns,
+            refresher=self.refresh_service_cookies if can_refresh else None
+        )
+
+        # Logins run here, one worker per browser the backend can drive (queue depth via YGG_LOGIN_QUEUE)
+        self.login_jobs = LoginJobQueue(self.login_and_save_cookies, max_workers=self.backend.max_concurrency)
+
+        self.app = self.create_app()
+
+    def create_app(self) -> Flask:
+        app = Flask(__name__)
+        app.json = ServiceJSONProvider(app)
+        if CORS_AVAILABLE:
+            CORS(app)  # Enable CORS for all routes
+
+        app.add_url_rule('/health', 'health_check', self.health_check, methods=['GET'])
+        app.add_url_rule('/auth/login', 'authenticate', self.authenticate, methods=['POST'])
+        app.add_url_rule('/auth/jobs/<job_id>', 'login_job_status', self.login_job_status, methods=['GET'])
+        app.add_url_rule('/auth/status', 'auth_status', self.auth_status, methods=['GET'])
+        app.add_url_rule('/auth/load-cookies', 'load_cookies', self.load_cookies, methods=['POST'])
+        app.add_url_rule('/categories', 'get_categories', self.get_categories, methods=['GET'])
+        app.add_url_rule('/rss/batch', 'get_rss_batch', self.get_rss_batch, methods=['GET', 'POST'])
+        app.add_url_rule('/rss/<int:category_id>', 'get_rss_feed', self.get_rss_feed, methods=['GET'])
+        app.register_error_handler(404, self.not_found)
+        app.register_error_handler(500, self.internal_error)
+        return app
+
+    def init_service(self, role: str = ROLE_ALL) -> bool:
+        """Start the background work of this process (once per server worker)."""
+        problem = self.backend.check()
+        if problem:
+            logger.warning(f"⚠ {self.backend.name} backend: {problem}")
+
+        if role == ROLE_WEB or not self.backend.uses_browser:
+            # Browsers live in the browser worker; only pick up the cookie files it saves
+            self.cookie_store.refresher = None
+        else:
+            # Launch the login browsers in the background so the first /auth/login skips the cold start
+            threading.Thread(target=self.backend.warm, name='browser-pool-warmup', daemon=True).start()
+
+        # Keep the cookie jar fresh off the request path
+        self.cookie_store.reload()
+        self.cookie_store.start()
+        logger.info(f"🔑 Auth backend: {self.backend.name} ({self.backend.description})")
+        return True
+
+    # Logins
+
+    def login_and_save_cookies(self, username: str, password: str) -> Dict:
+        """
+        Log in with the backend and save the cookies (login job runner).
+
+        Returns:
+            The ``/auth/login`` response payload; ``success`` tells whether the login worked
+        """
+        result = self.backend.login(username, password)
+
+        if not result['success']:
+            return {
+                'success': False,
+                'message': result['message']
+            }
+
+        # Saved to disk so every worker's cookie store picks the new jar up
+        os.makedirs('data', exist_ok=True)
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
+        cookie_file = f"data/api_cookies_{timestamp}.json"
+
+        cookie_data = {
+            'username': username,
+            'backend': self.backend.name,
+            'cookies': result['cookies'],
+            'expires': result['expires'],
+            'cookie_string': result['cookie_string'],
+            'generated_at': datetime.now().isoformat(),
+            'timestamp': timestamp
+        }
+
+        with open(cookie_file, 'w') as f:
+            json.dump(cookie_data, f, indent=2)
+
+        logger.info(f"Cookies saved to: {cookie_file}")
+
+        return {
+            'success': True,
+            'message': 'Authentication successful',
+            'cookies': result['cookies'],
+            'expires': result['expires'],
+            'cookie_string': result['cookie_string'],
+            'generated_at': datetime.now().isoformat(),
+            'cookie_file': cookie_file
+        }
+
+    def refresh_service_cookies(self) -> Dict:
+        """Log the service account in through the backend (background cookie refresher)."""
+        result = self.login_and_save_cookies(SERVICE_USERNAME, SERVICE_PASSWORD)
+        if not result['success']:
+            raise RuntimeError(result['message'])
+        return {'cookies': result['cookies'], 'expires': result['expires']}
+
+    @staticmethod
+    def request_value(name: str):
+        """A query parameter, or else the same key of a JSON body."""
+        value = request.args.get(name)
+        if value is None and request.is_json:
+            value = (request.get_json(silent=True) or {}).get(name)
+        return value
+
+    def request_cookies(self) -> Tuple[Optional[Dict[str, str]], Optional[CookieJar]]:
+        """
+        Cookies for the current request.
+
+        Returns:
+            ``(cookies, jar)``: the ``cookies`` parameter, or else the active
+            jar (``jar`` is then set so a 403 can be reported); both None
+            when neither exists
+        """
+        cookie_string = self.request_value('cookies')
+        if cookie_string:
+            return parse_cookie_string(cookie_string), None
+
+        jar = self.cookie_store.current()
+        if jar is None:
+            return None, None
+        return jar.cookies, jar
+
+    # Routes
+
+    def health_check(self):
+        """Health check endpoint with the auth backend status."""
+        health_data = {
+            'status': 'healthy',
+            'timestamp': datetime.now().isoformat(),
+            'service': self.service_name,
+            'auth_backend': self.backend.stats(),
+            'session_pool': session_pool.stats(),
+            'rss_cache': self.rss_cache.stats(),
+            'feed_cache': self.feed_cache.stats(),
+            'cookie_store': self.cookie_store.stats(),
+            'auth_cache': auth_validator.stats(),
+            'login_jobs': self.login_jobs.stats(),
+            'json': ygg_json.describe()
+        }
+
+        problem = self.backend.check()
+        if problem:
+            health_data['status'] = 'warning'
+            health_data['message'] = problem
+
+        return jsonify(health_data)
+
+    def authenticate(self):
+        """Queue a login and return its job id (``"wait": true`` blocks until it finished)."""
+        try:
+            data = request.get_json(silent=True)
+
+            if not data:
+                return jsonify({
+                    'success': False,
+                    'message': 'No JSON data provided'
+                }), 400
+
+            username = data.get('username')
+            password = data.get('password')
+
+            if not username or not password:
+                return jsonify({
+                    'success': False,
+                    'message': 'Username and password are required'
+                }), 400
+
+            if not self.backend.uses_browser:
+                return jsonify(self.backend.login(username, password)), 501
+
+            logger.info(f"Authentication request for user: {username}")
+
+            try:
+                job, created = self.login_jobs.submit(username, password)
+            except QueueFullError as e:
+                response = jsonify({
+                    'success': False,
+                    'message': f'Too many logins in progress: {str(e)}'
+                })
+                response.headers['Retry-After'] = '30'
+                return response, 429
+
+            if data.get('wait'):
+                # Synchronous mode for older clients - holds this request thread until the login finished
+                self.login_jobs.wait(job)
+                if job.result is None:
+                    return jsonify({
+                        'success': False,
+                        'message': f'Authentication error: {job.error}'
+                    }), 500
+                return jsonify(job.result), 200 if job.result['success'] else 401
+
+            response = jsonify({
+                'success': True,
+                'message': 'Login queued' if created else 'Login already in progress',
+                'job_id': job.id,
+                'status': job.status,
+                'status_url': f"/auth/jobs/{job.id}"
+            })
+            response.headers['Location'] = f"/auth/jobs/{job.id}"
+            return response, 202
+
+        except Exception as e:
+            logger.error(f"API error: {e}")
+            return jsonify({
+                'success': False,
+                'message': f'Internal server error: {str(e)}'
+            }), 500
+
+    def login_job_status(self, job_id):
+        """Poll a queued login; ``result`` holds the cookies once the job succeeded."""
+        job = self.login_jobs.get(job_id)
+
+        if job is None:
+            return jsonify({
+                'success': False,
+                'message': 'Unknown or expired job id'
+            }), 404
+
+        return jsonify(dict(job.to_dict(), success=True))
+
+    def auth_status(self):
+        """Check authentication status with the provided cookies (or the active jar)."""
+        try:
+            cookies, jar = self.request_cookies()
+
+            if not cookies:
+                return jsonify({
+                    'success': False,
+                    'message': 'Cookie string is required'
+                }), 400
+
+            # Probe the start of the main page with the pooled session for this cookie set;
+            # the verdict is cached per cookie set for YGG_AUTH_CACHE_TTL seconds
+            session = session_pool.get(cookies)
+            is_logged_in, status_code, cache_status, age = auth_validator.validate(session, cookies, BASE_URL)
+
+            if status_code == 403:
+                self.cookie_store.report_forbidden(jar)
+
+            if status_code not in (200, 206):
+                return jsonify({
+                    'success': False,
+                    'authenticated': False,
+                    'status_code': status_code,
+                    'message': f'HTTP {status_code}'
+                })
+
+            data = {
+                'success': True,
+                'authenticated': is_logged_in,
+                'status_code': status_code,
+                'message': 'Authenticated' if is_logged_in else 'Not authenticated'
+            }
+            if jar is not None:
+                data['cookie_jar'] = jar.to_dict()
+            return auth_validator.cache.apply_headers(jsonify(data), cache_status, age)
+
+        except Exception as e:
+            logger.error(f"Status check error: {e}")
+            return jsonify({
+                'success': False,
+                'message': f'Error checking status: {str(e)}'
+            }), 500
+
+    def load_cookies(self):
+        """Adopt the newest saved cookie file (e.g. right after ygg_manual_auth.py)."""
+        jar = self.cookie_store.reload()
+
+        if jar is None:
+            return jsonify({
+                'success': False,
+                'message': 'No cookie file found. Log in or run manual authentication first.'
+            }), 400
+
+        return jsonify({
+            'success': True,
+            'message': 'Cookies loaded successfully',
+            'cookie_jar': jar.to_dict()
+        })
+
+    def get_categories(self):
+        """Get available categories."""
+        try:
+            if not os.path.exists(CATEGORIES_FILE):
+                return jsonify({
+                    'success': False,
+                    'message': 'Categories file not found. Please run category discovery first.'
+                }), 404
+
+            with open(CATEGORIES_FILE, 'r') as f:
+                categories = json.load(f)
+
+            return jsonify({
+                'success': True,
+                'categories': categories,
+                'count': len(categories)
+            })
+
+        except Exception as e:
+            logger.error(f"Categories error: {e}")
+            return jsonify({
+                'success': False,
+                'message': f'Error loading categories: {str(e)}'
+            }), 500
+
+    def fetch_rss_torrents(self, category_id: int, passkey: str,
+                           cookies: Dict[str, str], session=None) -> Tuple[List[Dict], bool]:
+        """
+        Fetch and parse one category feed from upstream.
+
+        Args:
+            session: Rate-limited session to use (a batch worker's); defaults
+                to the pooled session for ``cookies`` behind ``upstream_limiter``
+
+        Returns:
+            ``(torrents, not_modified)``; raises ``UpstreamError`` on HTTP errors
+            and on bodies that are not RSS (a 200 challenge or error page),
+            which are then never cached
+        """
+        # Pooled keep-alive session for this cookie set
+        session = session or RateLimitedSession(session_pool.get(cookies), upstream_limiter)
+
+        rss_url = f"{BASE_URL}/rss?action=generate&type=subcat&id={category_id}&passkey={passkey}"
+
+        cache_key = (category_id, passkey)
+        response = session.get(rss_url, timeout=30, headers=self.feed_cache.conditional_headers(cache_key))
+
+        if response.status_code not in (200, 304):
+            raise UpstreamError(response.status_code)
+
+        digest = self.feed_cache.check(cache_key, response)
+
+        if digest is None:
+            # 304 or identical body - reuse the torrents parsed last time
+            return self.feed_cache.payload(cache_key) or [], True
+
+        # Parsed by the same code as the CLI parser, so the API returns the same records
+        try:
+            torrents = [torrent_to_json(torrent) for torrent in iter_parse_rss((response.content,), strict=True)]
+        except FeedParseError as e:
+            raise UpstreamError(502, f"Upstream answered without an RSS feed: {e}") from None
+        self.feed_cache.store(cache_key, response, digest, torrents)
+        return torrents, False
+
+    def load_feed(self, category_id: int, passkey: str, cookies: Dict[str, str], session=None):
+        """
+        One category feed from the response cache; concurrent misses share one upstream fetch.
+
+        Returns:
+            ``((torrents, not_modified), cache_status, age)``
+        """
+        return self.rss_cache.get_or_load(
+            (category_id, passkey),
+            lambda: self.fetch_rss_torrents(category_id, passkey, cookies, session)
+        )
+
+    def stream_rss_torrents(self, category_id: int, passkey: str,
+                            cookies: Dict[str, str]) -> Generator[Dict, None, Tuple[List[Dict], bool]]:
+        """
+        Streaming counterpart of ``fetch_rss_torrents`` (a ``get_or_stream`` producer).
+
+        Yields torrents while the upstream body is still arriving and
+        returns the same ``(torrents, not_modified)`` value for the cache.
+        """
+        session = RateLimitedSession(session_pool.get(cookies), upstream_limiter)
+        rss_url = f"{BASE_URL}/rss?action=generate&type=subcat&id={category_id}&passkey={passkey}"
+
+        cache_key = (category_id, passkey)
+        response = session.get(rss_url, timeout=30, stream=True,
+                               headers=self.feed_cache.conditional_headers(cache_key))
+
+        with response:
+            if response.status_code not in (200, 304):
+                raise UpstreamError(response.status_code)
+
+            if response.status_code == 304:
+                self.feed_cache.check(cache_key, response)
+                torrents = self.feed_cache.payload(cache_key) or []
+                yield from torrents
+                return torrents, True
+
+            digest = hashlib.sha1()
+
+            def chunks():
+                for chunk in response.iter_content(chunk_size=RSS_STREAM_CHUNK_SIZE):
+                    digest.update(chunk)
+                    yield chunk
+
+            torrents = []
+            try:
+                for record in iter_parse_rss(chunks(), strict=True):
+                    torrent = torrent_to_json(record)
+                    torrents.append(torrent)
+                    yield torrent
+            except FeedParseError as e:
+                raise UpstreamError(502, f"Upstream answered without an RSS feed: {e}") from None
+
+            self.feed_cache.store(cache_key, response, digest.hexdigest(), torrents)
+            return torrents, False
+
+    @staticmethod
+    def wants_stream() -> bool:
+        """``?stream=1`` or an Accept header preferring NDJSON over JSON."""
+        if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+            return True
+        return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+    def rss_ndjson_response(self, category_id: int, passkey: str,
+                            cookies: Dict[str, str], jar: Optional[CookieJar]):
+        """
+        ``/rss/<id>`` as NDJSON: one torrent per line, written as it is parsed.
+
+        The first item is read before the response starts, so upstream HTTP
+        errors still get their status code; a failure after that ends the
+        stream with an ``{"error": ...}`` line.
+        """
+        items, cache_status, age = self.rss_cache.get_or_stream(
+            (category_id, passkey),
+            lambda: self.stream_rss_torrents(category_id, passkey, cookies),
+            items=lambda value: value[0]
+        )
+
+        try:
+            first = next(items, None)
+        except UpstreamError as e:
+            if e.status_code == 403:
+                self.cookie_store.report_forbidden(jar)
+            return jsonify({
+                'success': False,
+                'message': f'Failed to get RSS feed: {e}'
+            }), e.status_code
+
+        def lines():
+            try:
+                if first is None:
+                    return
+                yield ygg_json.dumps(first, compact=True) + b'\n'
+                for torrent in items:
+                    yield ygg_json.dumps(torrent, compact=True) + b'\n'
+            except Exception as e:
+                logger.error(f"RSS stream error: {e}")
+                yield ygg_json.dumps({'error': str(e)}, compact=True) + b'\n'
+            finally:
+                close = getattr(items, 'close', None)
+                if close is not None:
+                    close()
+
+        response = Response(lines(), mimetype=NDJSON_MIMETYPE)
+        response.headers['X-Category-Id'] = str(category_id)
+        return self.rss_cache.apply_headers(response, cache_status, age)
+
+    def get_rss_feed(self, category_id):
+        """Get RSS feed for a specific category."""
+        try:
+            passkey = self.request_value('passkey')
+            cookies, jar = self.request_cookies()
+
+            if not cookies:
+                return jsonify({
+                    'success': False,
+                    'message': 'Cookie string is required'
+                }), 400
+
+            if not passkey:
+                return jsonify({
+                    'success': False,
+                    'message': 'Passkey is required'
+                }), 400
+
+            if self.wants_stream():
+                return self.rss_ndjson_response(category_id, passkey, cookies, jar)
+
+            # Served from the response cache; concurrent misses share one upstream fetch
+            try:
+                (torrents, not_modified), cache_status, age = self.load_feed(category_id, passkey, cookies)
+            except UpstreamError as e:
+                if e.status_code == 403:
+                    self.cookie_store.report_forbidden(jar)
+                return jsonify({
+                    'success': False,
+                    'message': f'Failed to get RSS feed: {e}'
+                }), e.status_code
+
+            response = jsonify({
+                'success': True,
+                'category_id': category_id,
+                'torrents': torrents,
+                'count': len(torrents),
+                'not_modified': not_modified
+            })
+            return self.rss_cache.apply_headers(response, cache_status, age)
+
+        except Exception as e:
+            logger.error(f"RSS feed error: {e}")
+            return jsonify({
+                'success': False,
+                'message': f'Error getting RSS feed: {str(e)}'
+            }), 500
+
+    @staticmethod
+    def parse_category_ids(value) -> List[int]:
+        """
+        Category ids from ``[1, 2]``, ``"1,2"`` or repeated ``ids`` parameters, duplicates dropped.
+
+        Raises:
+            ValueError: An id is not an integer
+        """
+        if isinstance(value, str):
+            value = value.split(',')
+        category_ids = []
+        for item in value or ():
+            if isinstance(item, str):
+                item = item.strip()
+                if not item:
+                    continue
+            category_id = int(item)
+            if category_id not in category_ids:
+                category_ids.append(category_id)
+        return category_ids
+
+    def get_rss_batch(self):
+        """
+        Feeds of several categories in one response.
+
+        ``ids`` (``?ids=2163,2145``, repeated ``ids`` or a JSON body list),
+        ``passkey`` and ``cookies`` work like ``/rss/<id>``. Feeds are
+        fetched concurrently behind the process-wide upstream rate limit;
+        torrents are streamed as each feed arrives, deduplicated by id.
+        """
+        try:
+            ids = request.args.getlist('ids')
+            ids = ','.join(ids) if ids else self.request_value('ids')
+            category_ids = self.parse_category_ids(ids)
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'message': 'ids must be a list of category ids'
+            }), 400
+
+        passkey = self.request_value('passkey')
+        cookies, jar = self.request_cookies()
+
+        if not category_ids:
+            return jsonify({
+                'success': False,
+                'message': 'At least one category id is required'
+            }), 400
+
+        if len(category_ids) > RSS_BATCH_MAX:
+            return jsonify({
+                'success': False,
+                'message': f'At most {RSS_BATCH_MAX} categories per batch'
+            }), 400
+
+        if not cookies:
+            return jsonify({
+                'success': False,
+                'message': 'Cookie string is required'
+            }), 400
+
+        if not passkey:
+            return jsonify({
+                'success': False,
+                'message': 'Passkey is required'
+            }), 400
+
+        logger.info(f"RSS batch request for {len(category_ids)} categories")
+        return Response(self.stream_rss_batch(category_ids, passkey, cookies, jar),
+                        mimetype='application/json')
+
+    def stream_rss_batch(self, category_ids: List[int], passkey: str,
+                         cookies: Dict[str, str], jar: Optional[CookieJar]):
+        """
+        Yield one JSON document in chunks, one chunk per finished category.
+
+        ``{"torrents": [...], "categories": {id: summary}, "count", "duplicates", "success"}``;
+        each torrent carries the ``category_id`` it was first seen in.
+        """
+        engine = SweepEngine(lambda: session_pool.get(cookies),
+                             max_workers=RSS_BATCH_WORKERS, limiter=upstream_limiter)
+
+        def fetch(session, category_id):
+            try:
+                (torrents, not_modified), cache_status, age = self.load_feed(category_id, passkey, cookies, session)
+            except UpstreamError as e:
+                return {'success': False, 'status_code': e.status_code, 'message': str(e)}, ()
+            return {'success': True, 'count': len(torrents), 'not_modified': not_modified,
+                    'cache': cache_status, 'age': int(age)}, torrents
+
+        seen = set()
+        categories = {}
+        count = duplicates = 0
+
+        yield b'{"torrents":['
+        for category_id, (summary, torrents) in engine.map(category_ids, fetch):
+            categories[str(category_id)] = summary
+            if summary.get('status_code') == 403:
+                self.cookie_store.report_forbidden(jar)
+
+            items = []
+            for torrent in torrents:
+                key = torrent_key(torrent)
+                if key in seen:
+                    duplicates += 1
+                    continue
+                seen.add(key)
+                items.append(ygg_json.dumps(dict(torrent, category_id=category_id), compact=True))
+
+            if items:
+                yield (b',' if count else b'') + b','.join(items)
+                count += len(items)
+
+        for category_id, error in engine.errors.items():
+            categories[str(category_id)] = {'success': False, 'message': str(error)}
+
+        trailer = {
+            'categories': categories,
+            'count': count,
+            'duplicates': duplicates,
+            'success': any(summary['success'] for summary in categories.values())
+        }
+        # Close the array, then continue the object with the trailer's members
+        yield b'],' + ygg_json.dumps(trailer, compact=True)[1:]
+
+    def not_found(self, error):
+        """Handle 404 errors."""
+        return jsonify({
+            'success': False,
+            'message': 'Endpoint not found'
+        }), 404
+
+    def internal_error(self, error):
+        """Handle 500 errors."""
+        return jsonify({
+            'success': False,
+            'message': 'Internal server error'
+        }), 500
+
+
+def run_service(service: YGGService, script: str, port: int = 8080):
+    """``python3 <script> [--headless] [--port N]``: run ``service`` on Flask's development server."""
+    parser = argparse.ArgumentParser(description=f"{service.service_name} ({service.backend.description})")
+    parser.add_argument('--headless', '--force-headless', action='store_true',
+                        help='Force headless mode (useful for servers without display)')
+    parser.add_argument('--port', type=int, default=port, help=f'Port to listen on (default: {port})')
+    args = parser.parse_args()
+
+    if args.headless:
+        os.environ['FORCE_HEADLESS'] = 'true'
+        logger.info("Forcing headless mode via command line argument")
+
+    logger.info(f"Starting {service.service_name} with the {service.backend.name} auth backend...")
+    logger.info("Available endpoints:")
+    for method, path, summary in ENDPOINTS:
+        logger.info(f"  {method} {path} - {summary}")
+    logger.info("")
+    logger.info(f"Usage: python3 {script} [--headless] [--port N]")
+    logger.info("  YGG_AUTH_BACKEND=undetected|selenium|zendriver|manual selects how logins are performed")
+
+    if not service.init_service(ROLE_ALL):
+        raise SystemExit(1)
+
+    logger.info(f"For production use: python3 ygg_serve.py {os.path.splitext(script)[0]} --workers 4")
+    service.app.run(host='0.0.0.0', port=args.port, debug=False)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Process-wide pool of HTTP sessions for YGG Torrent
+Reuses cloudscraper sessions (TLS context, connection pool, Cloudflare state) per cookie set
+"""
+
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import cloudscraper
+    CLOUDSCRAPER_AVAILABLE = True
+except ImportError:
+    CLOUDSCRAPER_AVAILABLE = False
+
+
+# Connection pools per session: distinct hosts cached / keep-alive sockets per host
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 32
+
+# Sessions unused for this long are closed on the next pool access
+DEFAULT_IDLE_TIMEOUT = 300
+
+# Distinct cookie sets kept alive at once (least recently used evicted first)
+DEFAULT_MAX_SESSIONS = 64
+
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+logger = logging.getLogger(__name__)
+
+
+def parse_cookie_string(cookie_string: str) -> Dict[str, str]:
+    """Parse a ``name=value; name2=value2`` browser cookie string."""
+    cookies = {}
+    for cookie in (cookie_string or '').split(';'):
+        if '=' in cookie:
+            name, value = cookie.strip().split('=', 1)
+            cookies[name] = value
+    return cookies
+
+
+def cookie_key(cookies: Optional[Dict[str, str]]) -> str:
+    """Stable key for a cookie set, independent of cookie order."""
+    if not cookies:
+        return ''
+    canonical = ';'.join(f"{name}={value}" for name, value in sorted(cookies.items()))
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+
+class SessionPool:
+    """
+    Hands out long-lived sessions keyed by cookie set.
+
+    The first request for a cookie set builds a cloudscraper session (plain
+    ``requests.Session`` when cloudscraper is missing) with enlarged
+    connection pools; later requests with the same cookies reuse it, so
+    keep-alive connections and the TLS session survive across API calls.
+    """
+
+    def __init__(self, pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def create_session(self, cookies: Optional[Dict[str, str]] = None, **scraper_kwargs):
+        """
+        Build a new session with browser headers and tuned connection pools.
+
+        Args:
+            cookies: Cookies to install on the session
+            **scraper_kwargs: Extra ``cloudscraper.create_scraper`` arguments
+
+        Returns:
+            A cloudscraper or requests session (not registered in the pool)
+        """
+        session = None
+        if CLOUDSCRAPER_AVAILABLE:
+            try:
+                session = cloudscraper.create_scraper(
+                    browser={
+                        'browser': 'chrome',
+                        'platform': 'linux',
+                        'mobile': False
+                    },
+                    **scraper_kwargs
+                )
+            except Exception as e:
+                logger.warning(f"⚠ Cloudscraper failed: {e}")
+        if session is None:
+            session = requests.Session()
+
+        session.headers.update(BROWSER_HEADERS)
+
+        # Resize the existing adapters in place so cloudscraper keeps its TLS cipher setup
+        for adapter in session.adapters.values():
+            if isinstance(adapter, HTTPAdapter):
+                adapter.init_poolmanager(self.pool_connections, self.pool_maxsize)
+
+        for name, value in (cookies or {}).items():
+            session.cookies.set(name, value)
+
+        return session
+
+    def get(self, cookies: Union[Dict[str, str], str, None] = None):
+        """
+        Return the shared session for a cookie set, creating it on first use.
+
+        Args:
+            cookies: Cookie dictionary or browser cookie string
+
+        Returns:
+            A session safe to use from several request threads
+        """
+        if isinstance(cookies, str):
+            cookies = parse_cookie_string(cookies)
+        key = cookie_key(cookies)
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_idle(now)
+
+            entry = self._sessions.get(key)
+            if entry is not None:
+                self._sessions.move_to_end(key)
+                entry['last_used'] = now
+                self._hits += 1
+                return entry['session']
+
+            self._misses += 1
+
+        # Build outside the lock; cloudscraper setup is not free
+        session = self.create_session(cookies)
+
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is not None:
+                # Another thread won the race - keep its session
+                session.close()
+                entry['last_used'] = now
+                return entry['session']
+
+            self._sessions[key] = {'session': session, 'last_used': now}
+            while len(self._sessions) > self.max_sessions:
+                _, evicted = self._sessions.popitem(last=False)
+                evicted['session'].close()
+
+        return session
+
+    def _evict_idle(self, now: float):
+        """Close sessions idle for longer than ``idle_timeout`` (lock held)."""
+        for key in [key for key, entry in self._sessions.items()
+                    if now - entry['last_used'] > self.idle_timeout]:
+            self._sessions.pop(key)['session'].close()
+
+    def discard(self, cookies: Union[Dict[str, str], str, None]):
+        """Close and forget the session of a cookie set (e.g. after a 403)."""
+        if isinstance(cookies, str):
+            cookies = parse_cookie_string(cookies)
+        with self._lock:
+            entry = self._sessions.pop(cookie_key(cookies), None)
+        if entry:
+            entry['session'].close()
+
+    def clear(self):
+        """Close every pooled session."""
+        with self._lock:
+            entries = list(self._sessions.values())
+            self._sessions.clear()
+        for entry in entries:
+            entry['session'].close()
+
+    def stats(self) -> Dict:
+        """Pool size and hit/miss counters for health endpoints."""
+        with self._lock:
+            return {
+                'sessions': len(self._sessions),
+                'hits': self._hits,
+                'misses': self._misses
+            }
+
+
+# Shared by the API services, parsers and scripts of this process
+session_pool = SessionPool()
+
+
+def get_session(cookies: Union[Dict[str, str], str, None] = None):
+    """Return the process-wide pooled session for ``cookies``."""
+    return session_pool.get(cookies)
+
+
+def create_session(cookies: Optional[Dict[str, str]] = None, **scraper_kwargs):
+    """Build a standalone session with the pool's headers and adapter sizes."""
+    return session_pool.create_session(cookies, **scraper_kwargs)
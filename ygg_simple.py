@@ -144,16 +144,16 @@ def simple_ygg_workflow():
         demo_torrents = downloadable_torrents[:3]
         print(f"\n🚀 Downloading {len(demo_torrents)} torrents in parallel...")
         
-        results = parser.download_torrents_batch(demo_torrents, max_workers=2)
+        results = parser.download_torrents_batch(demo_torrents)
         
         successful = sum(1 for path in results.values() if path)
         print(f"✅ Batch download completed: {successful}/{len(demo_torrents)} successful")
         
-        for title, filepath in results.items():
+        for torrent_id, filepath in results.items():
             if filepath:
-                print(f"  ✅ {title} -> {filepath}")
+                print(f"  ✅ {torrent_id} -> {filepath}")
             else:
-                print(f"  ❌ {title} -> Failed")
+                print(f"  ❌ {torrent_id} -> Failed")
     
     elif choice == "3":
         # Download with criteria
@@ -174,11 +174,11 @@ def simple_ygg_workflow():
         successful = sum(1 for path in results.values() if path)
         print(f"✅ Criteria-based download: {successful} torrents downloaded")
         
-        for title, filepath in results.items():
+        for torrent_id, filepath in results.items():
             if filepath:
-                print(f"  ✅ {title}")
+                print(f"  ✅ {filepath}")
             else:
-                print(f"  ❌ {title} (failed)")
+                print(f"  ❌ torrent {torrent_id} (failed)")
     
     elif choice == "4":
         print("⏭️ Skipping downloads, showing torrent information only")
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Concurrent multi-category sweep engine for YGG Torrent
+Fetches many category feeds in parallel under a per-host token-bucket rate limit
+"""
+
+import time
+import queue
+import logging
+import threading
+from urllib.parse import urlparse
+from typing import Any, Callable, Dict, Iterable, Iterator, Tuple
+
+
+# Defaults tuned to stay polite with the tracker
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_REQUESTS_PER_SECOND = 2.0
+DEFAULT_BURST = 2
+
+# Results a worker may get ahead of the consumer before it blocks
+RESULTS_PER_WORKER = 4
+# How often a worker blocked on a full result queue checks whether the consumer left
+PUT_POLL_INTERVAL = 0.1
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``acquire`` blocks until a token is available."""
+
+    def __init__(self, rate: float, burst: int = DEFAULT_BURST):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping just long enough for it to be refilled."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class HostRateLimiter:
+    """One token bucket per host, shared by every session and worker."""
+
+    def __init__(self, requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                 burst: int = DEFAULT_BURST):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str):
+        """Block until a request to ``url``'s host is allowed."""
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.requests_per_second, self.burst)
+        bucket.acquire()
+
+
+class RateLimitedSession:
+    """
+    Wraps a requests/cloudscraper session so every request goes through a limiter.
+
+    Attribute access (``cookies``, ``headers``...) is forwarded to the wrapped
+    session, so it can be used anywhere a session is expected.
+    """
+
+    def __init__(self, session, limiter: HostRateLimiter):
+        self._session = session
+        self._limiter = limiter
+
+    def request(self, method: str, url: str, **kwargs):
+        self._limiter.acquire(url)
+        return self._session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url: str, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+class SweepEngine:
+    """
+    Runs per-category fetches on a pool of worker threads.
+
+    Each worker gets its own session from ``session_factory`` (wrapped in the
+    shared ``HostRateLimiter``), so throughput is bounded by the configured
+    requests/second rather than by fixed sleeps between categories. Results
+    are streamed back as soon as a worker produces them; a worker that gets
+    ``RESULTS_PER_WORKER`` items ahead of the consumer waits for it.
+    """
+
+    def __init__(self, session_factory: Callable[[], Any],
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+                 burst: int = DEFAULT_BURST,
+                 limiter: HostRateLimiter = None):
+        self.session_factory = session_factory
+        self.max_workers = max(1, max_workers)
+        self.limiter = limiter or HostRateLimiter(requests_per_second, burst)
+        self.errors = {}
+
+    def rate_limited(self, session) -> RateLimitedSession:
+        """Wrap an existing session with this engine's limiter."""
+        return RateLimitedSession(session, self.limiter)
+
+    def run(self, tasks: Iterable, fetch: Callable[[Any, Any], Iterable]) -> Iterator[Tuple[Any, Any]]:
+        """
+        Call ``fetch(session, task)`` for every task and stream its items.
+
+        Args:
+            tasks: Work items, e.g. subcategory IDs
+            fetch: Callable returning an iterable of items for one task
+
+        Yields:
+            ``(task, item)`` pairs in arrival order. Tasks whose fetch raised
+            are recorded in ``self.errors``. Closing the generator early stops
+            the workers after their current item.
+        """
+        task_queue = queue.Queue()
+        for task in tasks:
+            task_queue.put(task)
+
+        worker_count = min(self.max_workers, task_queue.qsize()) or 1
+        results = queue.Queue(maxsize=worker_count * RESULTS_PER_WORKER)
+        stop = threading.Event()
+        done_marker = object()
+        self.errors = {}
+
+        def put(result) -> bool:
+            # Block while the consumer is behind, but give up once it has gone
+            while not stop.is_set():
+                try:
+                    results.put(result, timeout=PUT_POLL_INTERVAL)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def worker():
+            session = self.rate_limited(self.session_factory())
+            try:
+                while not stop.is_set():
+                    try:
+                        task = task_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    try:
+                        for item in fetch(session, task):
+                            if not put((task, item)):
+                                break
+                    except Exception as e:
+                        logger.error(f"❌ Sweep task {task} failed: {e}")
+                        self.errors[task] = e
+            finally:
+                put(done_marker)
+
+        workers = [
+            threading.Thread(target=worker, name=f"sweep-{i}", daemon=True)
+            for i in range(worker_count)
+        ]
+        for thread in workers:
+            thread.start()
+
+        remaining = len(workers)
+        try:
+            while remaining:
+                result = results.get()
+                if result is done_marker:
+                    remaining -= 1
+                    continue
+                yield result
+        finally:
+            # Consumer stopped early or finished - let workers wind down
+            stop.set()
+
+    def map(self, tasks: Iterable, fetch: Callable[[Any, Any], Any]) -> Iterator[Tuple[Any, Any]]:
+        """Like ``run`` but ``fetch`` returns exactly one result per task."""
+        return self.run(tasks, lambda session, task: (fetch(session, task),))
+
+    def collect(self, tasks: Iterable, fetch: Callable[[Any, Any], Any]) -> Dict:
+        """Run ``map`` to completion and return ``{task: result}``."""
+        return dict(self.map(tasks, fetch))
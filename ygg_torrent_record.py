@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Compact torrent record used by the parser, downloaders and APIs
+Replaces the per-item dictionaries produced by RSS parsing
+"""
+
+import re
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+# Serialized key order, matching the dictionaries the parser used to emit
+TORRENT_FIELDS = (
+    'id', 'title', 'description', 'link', 'guid', 'torrent_link', 'info_hash',
+    'size', 'seeds', 'peers', 'pub_date', 'category',
+    'size_bytes', 'seeders', 'leechers', 'added_at',
+    'parsed_at', 'downloaded', 'download_path'
+)
+
+TORRENT_ID_QUERY_RE = re.compile(r'[?&]id=(\d+)')
+TORRENT_ID_PATH_RE = re.compile(r'/(\d+)-[^/]*$')
+
+
+def extract_torrent_id(*urls: Optional[str]) -> Optional[int]:
+    """Return the numeric YGG torrent ID found in the first URL that carries one."""
+    for url in urls:
+        if not url:
+            continue
+        match = TORRENT_ID_QUERY_RE.search(url) or TORRENT_ID_PATH_RE.search(url.strip())
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def _to_int(value) -> Optional[int]:
+    """Coerce JSON/string values to int, keeping None for anything unusable."""
+    if value is None or isinstance(value, int):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_datetime(value) -> Optional[datetime]:
+    """Accept datetimes as produced by the parser or ISO strings read back from JSON."""
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TorrentRecord:
+    """
+    A single torrent entry stored in ``__slots__``.
+
+    Supports the ``get``/``[]`` access the rest of the code base used on the
+    old dictionaries, and converts losslessly with ``to_dict``/``from_dict``.
+    Keys that are not part of ``TORRENT_FIELDS`` are kept in ``extra``.
+    """
+
+    __slots__ = TORRENT_FIELDS + ('extra',)
+
+    def __init__(self, **fields):
+        for name in TORRENT_FIELDS:
+            setattr(self, name, None)
+        self.downloaded = False
+        self.extra = None
+        for name, value in fields.items():
+            self[name] = value
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TorrentRecord':
+        """Build a record from a parser/API/JSON dictionary."""
+        record = cls()
+        for name, value in data.items():
+            record[name] = value
+        if record.id is None:
+            record.id = extract_torrent_id(record.torrent_link, record.link, record.guid)
+        return record
+
+    def to_dict(self) -> Dict:
+        """Return the dictionary form used by JSON snapshots and API responses."""
+        data = {name: getattr(self, name) for name in TORRENT_FIELDS}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __setitem__(self, key: str, value):
+        if key in ('id', 'size_bytes', 'seeders', 'leechers'):
+            value = _to_int(value)
+        elif key == 'added_at':
+            value = _to_datetime(value)
+        elif key == 'category' and isinstance(value, str):
+            value = sys.intern(value)
+        elif key not in TORRENT_FIELDS:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+            return
+        setattr(self, key, value)
+
+    def __getitem__(self, key: str):
+        if key in TORRENT_FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        # Like a dictionary, only fields that carry a value count as present
+        if key in TORRENT_FIELDS:
+            return getattr(self, key) is not None
+        return bool(self.extra and key in self.extra)
+
+    def get(self, key: str, default=None):
+        """Dictionary-style lookup."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TorrentRecord):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TorrentRecord(id={self.id!r}, title={self.title!r})"
+
+
+def records_from_dicts(items: List[Dict]) -> List[TorrentRecord]:
+    """Convert a list of dictionaries (e.g. a loaded JSON snapshot) to records."""
+    return [TorrentRecord.from_dict(item) for item in items]
+
+
+def records_to_dicts(items: List) -> List[Dict]:
+    """Convert records back to dictionaries, passing plain dictionaries through."""
+    return [item.to_dict() if isinstance(item, TorrentRecord) else item for item in items]
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for .torrent files
+Each torrent is saved once under its info-hash; readable file names are links to that copy
+"""
+
+import os
+import sys
+import shutil
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple, Union
+
+from ygg_bencode import TorrentMetadata, parse_torrent, read_torrent_file, BencodeError
+from ygg_files import atomic_open, write_atomic, TEMP_SUFFIX
+from ygg_torrent_record import extract_torrent_id
+
+
+# Store directory (torrents under objects/, the SQLite index next to them)
+DEFAULT_STORE_ROOT = os.getenv('YGG_TORRENT_STORE', 'data/torrents')
+
+# How readable names point at stored torrents: hardlink (falls back to symlink) or symlink.
+# Stored files are read-only, so a name can be replaced but never rewritten in place
+LINK_MODE = os.getenv('YGG_TORRENT_STORE_LINKS', 'hardlink')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS torrent_files (
+    info_hash TEXT PRIMARY KEY,
+    name TEXT,
+    total_size INTEGER,
+    file_count INTEGER,
+    piece_length INTEGER,
+    piece_count INTEGER,
+    private INTEGER,
+    announce TEXT,
+    torrent_size INTEGER,
+    stored_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS torrent_refs (
+    key TEXT PRIMARY KEY,
+    torrent_id INTEGER,
+    title TEXT,
+    category TEXT,
+    info_hash TEXT NOT NULL,
+    added_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS torrent_refs_info_hash ON torrent_refs (info_hash);
+"""
+
+METADATA_COLUMNS = ('info_hash', 'name', 'total_size', 'file_count', 'piece_length',
+                    'piece_count', 'private', 'announce', 'torrent_size')
+
+
+def ref_key(torrent_id: Union[int, str, None] = None, url: str = None) -> Optional[str]:
+    """
+    Index key of a YGG torrent: its numeric ID, else its download URL.
+
+    RSS (``/rss/download?id=``) and engine (``/engine/download_torrent?id=``)
+    URLs of the same torrent share the ID, so they share the key.
+    """
+    if torrent_id is None:
+        torrent_id = extract_torrent_id(url)
+    if torrent_id is not None and str(torrent_id).isdigit():
+        return str(int(torrent_id))
+    return url
+
+
+class TorrentStore:
+    """
+    Saves every .torrent once, as ``objects/<aa>/<info_hash>.torrent``.
+
+    The SQLite index maps torrent IDs (with title and category) to
+    info-hashes and keeps each torrent's metadata, so a lookup answers
+    "do we already have it?" without touching the network or the file.
+    Both maps are held in memory for O(1) lookups, like ``SeenIndex``.
+
+    Stored files are made read-only: every readable name shares the stored
+    copy, so an ``open(name, 'wb')`` through one of them would otherwise
+    rewrite the torrent for all of them. Replacing a name (``write_atomic``,
+    ``os.replace``) is safe and leaves the stored copy alone.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_ROOT, link_mode: str = LINK_MODE):
+        self.root = root
+        self.link_mode = link_mode
+        self.objects_dir = os.path.join(root, 'objects')
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, 'index.db'), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+        self._refs = dict(self._conn.execute('SELECT key, info_hash FROM torrent_refs'))
+        self._metadata = {
+            row[0]: TorrentMetadata(*row)
+            for row in self._conn.execute(f"SELECT {', '.join(METADATA_COLUMNS)} FROM torrent_files")
+        }
+        for metadata in self._metadata.values():
+            metadata.private = bool(metadata.private)
+
+    def __len__(self) -> int:
+        return len(self._metadata)
+
+    def __contains__(self, info_hash: str) -> bool:
+        return info_hash in self._metadata
+
+    def blob_path(self, info_hash: str) -> str:
+        """Where the torrent with ``info_hash`` is (or would be) stored."""
+        return os.path.join(self.objects_dir, info_hash[:2], f"{info_hash}.torrent")
+
+    def lookup(self, torrent_id: Union[int, str, None] = None,
+               url: str = None) -> Optional[Tuple[str, TorrentMetadata]]:
+        """
+        Find a stored torrent by YGG ID or download URL.
+
+        Returns:
+            ``(stored path, metadata)`` or None if it must be downloaded
+        """
+        info_hash = self._refs.get(ref_key(torrent_id, url))
+        if info_hash is None or info_hash not in self._metadata:
+            return None
+        path = self.blob_path(info_hash)
+        if not os.path.exists(path):
+            return None
+        return path, self._metadata[info_hash]
+
+    def put(self, data: bytes, torrent_id: Union[int, str, None] = None, url: str = None,
+            title: str = None, category: str = None,
+            metadata: TorrentMetadata = None) -> Tuple[str, TorrentMetadata]:
+        """
+        Store a downloaded .torrent body (once per info-hash) and index it.
+
+        Raises:
+            BencodeError: If ``data`` is not a valid torrent
+        """
+        if metadata is None:
+            metadata = parse_torrent(data)
+        path = self.blob_path(metadata.info_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_atomic(path, data)
+            _seal(path)
+        self._record(metadata, ref_key(torrent_id, url), title, category)
+        return path, metadata
+
+    def adopt(self, filepath: str, metadata: TorrentMetadata = None,
+              torrent_id: Union[int, str, None] = None, url: str = None,
+              title: str = None, category: str = None) -> Tuple[str, TorrentMetadata]:
+        """
+        Store a .torrent file that is already on disk and make ``filepath`` a link to it.
+
+        The first copy of a torrent is copied into the store, never hardlinked,
+        so nothing written to ``filepath`` before it became a link can reach
+        the stored copy; ``filepath`` and later copies are then replaced by
+        links to it.
+
+        Raises:
+            BencodeError: If the file is not a valid torrent
+        """
+        if metadata is None:
+            metadata = read_torrent_file(filepath)
+        path = self.blob_path(metadata.info_hash)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(filepath, 'rb') as src, atomic_open(path) as dst:
+                shutil.copyfileobj(src, dst)
+            _seal(path)
+
+        self._record(metadata, ref_key(torrent_id, url), title, category)
+        self.link(path, filepath)
+        return path, metadata
+
+    def link(self, stored_path: str, dest: str) -> str:
+        """
+        Make ``dest`` a readable name for a stored torrent.
+
+        Uses a hardlink, else a relative symlink, else a copy. An existing
+        ``dest`` is replaced atomically unless it already is the stored file.
+        Linked names are read-only like the stored file they point at.
+        """
+        if os.path.exists(dest) and os.path.samefile(stored_path, dest):
+            return dest
+        os.makedirs(os.path.dirname(dest) or '.', exist_ok=True)
+
+        temp = f"{dest}.{os.getpid()}.{threading.get_ident()}{TEMP_SUFFIX}"
+        try:
+            if self.link_mode == 'hardlink':
+                try:
+                    os.link(stored_path, temp)
+                except OSError:
+                    os.symlink(os.path.relpath(stored_path, os.path.dirname(dest) or '.'), temp)
+            else:
+                os.symlink(os.path.relpath(stored_path, os.path.dirname(dest) or '.'), temp)
+        except OSError:
+            shutil.copyfile(stored_path, temp)
+        os.replace(temp, dest)
+        return dest
+
+    def _record(self, metadata: TorrentMetadata, key: Optional[str], title: str, category: str):
+        now = datetime.now().isoformat()
+        with self._lock:
+            if metadata.info_hash not in self._metadata:
+                self._metadata[metadata.info_hash] = metadata
+                self._conn.execute(
+                    f"INSERT OR IGNORE INTO torrent_files ({', '.join(METADATA_COLUMNS)}, stored_at) "
+                    f"VALUES ({', '.join('?' * len(METADATA_COLUMNS))}, ?)",
+                    tuple(getattr(metadata, column) for column in METADATA_COLUMNS) + (now,)
+                )
+            if key is not None and self._refs.get(key) != metadata.info_hash:
+                self._refs[key] = metadata.info_hash
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO torrent_refs (key, torrent_id, title, category, info_hash, added_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, int(key) if key.isdigit() else None, title, category, metadata.info_hash, now)
+                )
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        """Stored torrents, indexed IDs and bytes on disk."""
+        with self._lock:
+            stored_bytes = sum(metadata.torrent_size for metadata in self._metadata.values())
+            return {'torrents': len(self._metadata), 'refs': len(self._refs), 'stored_bytes': stored_bytes}
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def _seal(path: str):
+    """Drop write permission from a stored file (and every hardlink to it)."""
+    os.chmod(path, os.stat(path).st_mode & 0o444)
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_torrent_store() -> TorrentStore:
+    """The process-wide store at ``YGG_TORRENT_STORE``, opened on first use."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = TorrentStore()
+        return _default_store
+
+
+def import_files(store: TorrentStore, paths) -> Dict[str, int]:
+    """Adopt existing .torrent files; duplicates become links to a single stored copy."""
+    counts = {'files': 0, 'torrents_before': len(store), 'invalid': 0, 'bytes_freed': 0}
+    for path in paths:
+        if os.path.islink(path) or not os.path.isfile(path):
+            continue
+        try:
+            metadata = read_torrent_file(path)
+        except (OSError, BencodeError) as e:
+            print(f"⚠ Skipping {path}: {e}")
+            counts['invalid'] += 1
+            continue
+
+        existing = store.blob_path(metadata.info_hash)
+        if os.path.exists(existing) and not os.path.samefile(existing, path):
+            counts['bytes_freed'] += os.path.getsize(path)
+        store.adopt(path, metadata)
+        counts['files'] += 1
+
+    counts['torrents'] = len(store)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Content-addressed .torrent store')
+    parser.add_argument('--root', default=DEFAULT_STORE_ROOT, help=f'Store directory (default: {DEFAULT_STORE_ROOT})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_cmd = subparsers.add_parser('import', help='Store existing .torrent files and link duplicates')
+    import_cmd.add_argument('paths', nargs='+', help='.torrent files to import')
+    subparsers.add_parser('stats', help='Show store statistics')
+
+    args = parser.parse_args()
+    store = TorrentStore(args.root)
+
+    if args.command == 'import':
+        counts = import_files(store, args.paths)
+        print(f"✅ Imported {counts['files']} files as {counts['torrents'] - counts['torrents_before']} new torrents "
+              f"({counts['torrents']} stored, {counts['bytes_freed'] / 1024:.0f} KB of duplicates freed, "
+              f"{counts['invalid']} invalid)")
+    else:
+        stats = store.stats()
+        print(f"📦 {stats['torrents']} torrents, {stats['refs']} indexed IDs, "
+              f"{stats['stored_bytes'] / 1024:.0f} KB in {store.root}")
+
+    store.close()
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,8 @@ import requests
 import cloudscraper
 import xml.etree.ElementTree as ET
 from urllib.parse import urljoin, urlparse
+from ygg_bencode import read_torrent_file, verify_torrent_data, BencodeError
+from ygg_torrent_store import get_torrent_store
 
 
 def setup_session_with_cookies(cookie_string):
@@ -79,6 +81,13 @@ def download_torrent_file(session, torrent_id, torrent_title):
         download_url = f"https://www.yggtorrent.top/engine/download_torrent?id={torrent_id}"
         print(f"🔗 Download URL: {download_url}")
         
+        # Reuse a torrent fetched before (by any script) instead of downloading it again
+        torrent_store = get_torrent_store()
+        stored = torrent_store.lookup(torrent_id)
+        if stored:
+            print(f"♻️ Already in torrent store: {stored[0]}")
+            return stored[0]
+        
         # Download the torrent file
         response = session.get(download_url, timeout=30)
         
@@ -90,18 +99,16 @@ def download_torrent_file(session, torrent_id, torrent_title):
             print(f"📊 Content type: {content_type}")
             print(f"📊 Content length: {len(content)} bytes")
             
-            # Check if it's actually a torrent file
-            if (content_type == 'application/x-bittorrent' or 
-                content.startswith(b'd8:announce') or 
-                content.startswith(b'd10:created') or
-                b'announce' in content[:100]):
+            # Check if it's actually a torrent file (the content type alone is not proof)
+            metadata = verify_torrent_data(content)
+            if metadata:
                 
                 # Save the torrent file
                 safe_title = "".join(c for c in torrent_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
                 torrent_filename = f"data/{safe_title}.torrent"
                 
-                with open(torrent_filename, 'wb') as f:
-                    f.write(content)
+                stored_path, _ = torrent_store.put(content, torrent_id, download_url, torrent_title, metadata=metadata)
+                torrent_store.link(stored_path, torrent_filename)
                 
                 print(f"✅ Successfully downloaded: {torrent_filename}")
                 print(f"📊 File size: {len(content)} bytes")
@@ -135,22 +142,16 @@ def download_torrent_file(session, torrent_id, torrent_title):
 
 
 def verify_torrent_file(filename):
-    """Verify that a file is a valid torrent file."""
+    """Verify that a file is a valid torrent file (full bencode check, info-hash and sizes)."""
     try:
-        with open(filename, 'rb') as f:
-            content = f.read()
-        
-        # Check for common torrent file signatures
-        if (content.startswith(b'd8:announce') or 
-            content.startswith(b'd10:created') or
-            b'announce' in content[:200]):
-            return True
-        else:
-            return False
-            
-    except Exception as e:
+        metadata = read_torrent_file(filename)
+    except (OSError, BencodeError) as e:
         print(f"❌ Error verifying torrent file: {e}")
         return False
+    
+    print(f"🧲 Info hash: {metadata.info_hash}")
+    print(f"📊 {metadata.name}: {metadata.file_count} files, {metadata.total_size} bytes")
+    return True
 
 
 def test_working_download():